@@ -10,7 +10,7 @@ from core.database import Base
 from core.config import settings
 
 # Import all models so Alembic can detect them
-from models.db import Candidate, Resume, Education, WorkExperience, Skill, candidate_skills
+from models.db import Candidate, Resume, Education, WorkExperience, Skill, candidate_skills, Job
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
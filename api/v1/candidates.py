@@ -18,6 +18,11 @@ def search_candidates(filters: CandidateFilter, page: int = 1, page_size: int =
     """Searches and filters candidates."""
     return filter_service.search_candidates(filters, page, page_size)
 
+@router.post("/search/resumes")
+def search_resumes(filters: CandidateFilter, page: int = 1, page_size: int = 20, db: Session = Depends(get_db)) -> Dict[str, Any]:
+    """Filters processed resumes by years of experience."""
+    return filter_service.search_resumes(db, filters, page, page_size)
+
 @router.get("/filter-options")
 def get_filter_options() -> Dict[str, List]:
     """Retrieves available options for filters."""
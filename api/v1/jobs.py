@@ -0,0 +1,98 @@
+import json
+import asyncio
+import logging
+from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi.responses import StreamingResponse
+from typing import List, Optional
+from sqlalchemy.orm import Session
+
+from core.config import settings
+from core.database import get_db, SessionLocal
+from services.jd_matcher import JDMatcher
+from services.job_catalog import JobCatalog
+from services.job_service import JobService
+from services.candidate_ranker import CandidateRanker
+from models.job_models import JobCreate, JobUpdate, JobResponse, JobMatch
+
+router = APIRouter()
+jd_matcher = JDMatcher.from_settings()
+job_catalog = JobCatalog(jd_matcher)
+job_service = JobService(job_catalog)
+candidate_ranker = CandidateRanker.from_settings(jd_matcher)
+logger = logging.getLogger(__name__)
+_ranker_refresh_task = None
+
+def _refresh_ranker():
+    """Index resumes processed since the last refresh, with a session of its own"""
+    db = SessionLocal()
+    try:
+        count = candidate_ranker.load_from_db(db)
+        if count:
+            logger.info(f"Indexed {count} stored resumes for ranking")
+    except Exception as e:
+        logger.error(f"Error refreshing ranking index: {str(e)}")
+    finally:
+        db.close()
+
+@router.on_event("startup")
+async def start_ranker_refresh():
+    """Load stored resumes into the ranking index, then keep it current in the background"""
+    global _ranker_refresh_task
+
+    async def refresh():
+        while True:
+            await asyncio.to_thread(_refresh_ranker)
+            await asyncio.sleep(settings.ranker_refresh_seconds)
+
+    if _ranker_refresh_task is None:
+        _ranker_refresh_task = asyncio.get_running_loop().create_task(refresh())
+
+@router.post("/", response_model=JobResponse)
+def create_job(job_data: JobCreate, db: Session = Depends(get_db)):
+    """Creates an open job that new resumes are auto-matched against."""
+    return job_service.create_job(job_data.dict(), db)
+
+@router.get("/", response_model=List[JobResponse])
+def get_jobs(status: Optional[str] = None, skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+    """Lists jobs, optionally filtered by status."""
+    return job_service.get_jobs(db, status, skip, limit)
+
+@router.patch("/{job_id}", response_model=JobResponse)
+def update_job(job_id: int, job_data: JobUpdate, db: Session = Depends(get_db)):
+    """Updates a job. Setting status to 'closed' stops auto-matching."""
+    job = job_service.update_job(job_id, job_data.dict(exclude_unset=True), db)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+@router.get("/{job_id}/rank")
+def rank_candidates_for_job(job_id: int, limit: int = Query(20, ge=1, le=500), offset: int = Query(0, ge=0),
+                            status: Optional[str] = None, upload_status: Optional[str] = None,
+                            stream: bool = False, db: Session = Depends(get_db)):
+    """Ranks stored resumes against a job (the index is refreshed in the background, not per request)."""
+    job = job_service.get_job_by_id(job_id, db)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    compiled_jd = jd_matcher.compile_jd(job.description)
+    statuses = [s.strip() for s in status.split(',') if s.strip()] if status else None
+    upload_statuses = [s.strip() for s in upload_status.split(',') if s.strip()] if upload_status else None
+
+    if stream:
+        rows = candidate_ranker.iter_ranked(compiled_jd, limit=limit, offset=offset, statuses=statuses,
+                                            upload_statuses=upload_statuses)
+        return StreamingResponse((json.dumps(row) + "\n" for row in rows), media_type="application/x-ndjson")
+    return candidate_ranker.rank(compiled_jd, limit=limit, offset=offset, statuses=statuses,
+                                 upload_statuses=upload_statuses)
+
+@router.get("/match/{resume_id}", response_model=List[JobMatch])
+def match_resume_to_jobs(resume_id: int, top_n: int = 5, db: Session = Depends(get_db)):
+    """Finds the open jobs that best match a stored resume."""
+    from models.db import Resume
+
+    resume = db.query(Resume).filter(Resume.id == resume_id).first()
+    if not resume or not resume.raw_text:
+        raise HTTPException(status_code=404, detail="Resume not found or not processed")
+
+    job_catalog.sync(db)
+    return job_catalog.match_resume(resume.raw_text, top_n=top_n)
@@ -3,8 +3,10 @@ from typing import List
 from sqlalchemy.orm import Session
 
 from core.database import get_db
+from core.uploads import UploadTooLargeError
+from core.archives import ArchiveError
 from services.resume_service import ResumeService
-from models.resume_models import ResumeUploadResponse, JobStatusResponse
+from models.resume_models import ResumeUploadResponse, JobStatusResponse, ArchiveMemberResponse
 
 router = APIRouter()
 resume_service = ResumeService()
@@ -14,7 +16,10 @@ async def upload_resume(file: UploadFile = File(...), db: Session = Depends(get_
     """Uploads a single resume for processing."""
     if not file.content_type in ["application/pdf", "application/vnd.openxmlformats-officedocument.wordprocessingml.document", "application/msword"]:
         raise HTTPException(status_code=400, detail="Invalid file type")
-    result = resume_service.upload_resume(file, db)
+    try:
+        result = resume_service.upload_resume(file, db)
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
     return result
 
 @router.post("/upload-batch", response_model=List[ResumeUploadResponse])
@@ -26,6 +31,16 @@ async def upload_resume_batch(files: List[UploadFile] = File(...), db: Session =
     results = resume_service.upload_resume_batch(files, db)
     return results
 
+@router.post("/upload-archive", response_model=List[ArchiveMemberResponse])
+async def upload_resume_archive(file: UploadFile = File(...), db: Session = Depends(get_db)):
+    """Uploads a ZIP archive of resumes; each member is queued for processing."""
+    if not file.filename or not file.filename.lower().endswith('.zip'):
+        raise HTTPException(status_code=400, detail="Invalid file type")
+    try:
+        return resume_service.upload_archive(file, db)
+    except ArchiveError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 @router.get("/jobs/{job_id}", response_model=JobStatusResponse)
 async def get_job_status(job_id: str, db: Session = Depends(get_db)):
     """Checks the status of a resume processing job."""
@@ -0,0 +1,230 @@
+import math
+import time
+import asyncio
+import logging
+import threading
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager, nullcontext
+from typing import Any, Callable, Dict, Optional
+
+from fastapi import HTTPException
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Longest Retry-After we advertise, in seconds
+MAX_RETRY_AFTER = 300
+
+
+class AdmissionRejected(HTTPException):
+    """A scan was refused because the pipeline is saturated"""
+
+    def __init__(self, stage: str, retry_after: int, status_code: int = 503):
+        self.stage = stage
+        self.retry_after = retry_after
+        super().__init__(
+            status_code=status_code,
+            detail=f"Server is busy ({stage} queue is full). Please retry in {retry_after} seconds.",
+            headers={"Retry-After": str(retry_after)}
+        )
+
+
+class StageGate:
+    """
+    Concurrency limit for one pipeline stage
+
+    At most `limit` holders run at once and later ones wait in FIFO order.
+    Usable from the event loop (hold_async) and from pool threads (hold),
+    so stages that run inside worker threads (OCR, verification) share
+    the limit with those gated on the loop. Hold times feed a moving
+    average used to estimate how long the current queue takes to drain.
+    """
+
+    def __init__(self, name: str, limit: int, max_queue: int):
+        """
+        Initialize gate
+
+        Args:
+            name: Stage name
+            limit: Holders running at once
+            max_queue: Waiting holders beyond which the stage counts as saturated
+        """
+        self.name = name
+        self.limit = max(limit, 1)
+        self.max_queue = max_queue
+        self.running = 0
+        self.avg_seconds = 1.0
+        self.completed = 0
+        self._waiters: "deque[Callable[[], bool]]" = deque()
+        self._lock = threading.Lock()
+
+    @property
+    def waiting(self) -> int:
+        return len(self._waiters)
+
+    @property
+    def saturated(self) -> bool:
+        return self.running >= self.limit and self.waiting >= self.max_queue
+
+    def retry_after(self) -> int:
+        """Seconds until the current queue is expected to drain"""
+        seconds = math.ceil(self.avg_seconds * (self.waiting + 1) / self.limit)
+        return min(max(seconds, 1), MAX_RETRY_AFTER)
+
+    def _enter_or_queue(self, wake: Callable[[], bool]) -> bool:
+        with self._lock:
+            if self.running < self.limit and not self._waiters:
+                self.running += 1
+                return True
+            self._waiters.append(wake)
+            return False
+
+    def _leave(self, seconds: Optional[float] = None):
+        """Hand the slot to the next waiter, or free it"""
+        with self._lock:
+            if seconds is not None:
+                self.avg_seconds = 0.8 * self.avg_seconds + 0.2 * seconds
+                self.completed += 1
+            while self._waiters:
+                if self._waiters.popleft()():
+                    return
+            self.running -= 1
+
+    @contextmanager
+    def hold(self):
+        """Hold a slot from a worker thread (blocks while the stage is full)"""
+        granted = threading.Event()
+
+        def wake() -> bool:
+            granted.set()
+            return True
+
+        if not self._enter_or_queue(wake):
+            granted.wait()
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self._leave(time.monotonic() - start)
+
+    @asynccontextmanager
+    async def hold_async(self):
+        """Hold a slot from the event loop (waits without blocking the loop)"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        def grant():
+            if future.done():
+                self._leave()  # The waiter gave up; pass the slot on
+            else:
+                future.set_result(None)
+
+        def wake() -> bool:
+            try:
+                loop.call_soon_threadsafe(grant)
+                return True
+            except RuntimeError:
+                return False  # Loop is closed
+
+        if not self._enter_or_queue(wake):
+            try:
+                await future
+            except asyncio.CancelledError:
+                with self._lock:
+                    if wake in self._waiters:
+                        self._waiters.remove(wake)
+                        raise
+                if future.done() and not future.cancelled():
+                    self._leave()
+                raise
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self._leave(time.monotonic() - start)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'limit': self.limit,
+            'running': self.running,
+            'waiting': self.waiting,
+            'max_queue': self.max_queue,
+            'avg_seconds': round(self.avg_seconds, 3),
+            'completed': self.completed
+        }
+
+
+class AdmissionController:
+    """
+    Admission control and backpressure for scans
+
+    Each scan takes a slot (max_scans running, scan_queue waiting) and its
+    stages (parse, OCR, verification, matching) run under per-stage
+    concurrency limits. New scans are refused up front instead of piling
+    up: with 503 when a stage's wait queue is full, or 429 when the scan
+    queue itself is full, each with a Retry-After estimated from the
+    queue depth and recent stage times.
+    """
+
+    def __init__(self, max_scans: int, scan_queue: int, stage_limits: Dict[str, int],
+                 stage_queues: Dict[str, int]):
+        """
+        Initialize controller
+
+        Args:
+            max_scans: Scans running at once
+            scan_queue: Scans waiting for a slot before new ones get 429
+            stage_limits: Stage name to concurrent holders
+            stage_queues: Stage name to waiting holders before new scans get 503
+        """
+        self.scans = StageGate('scan', max_scans, scan_queue)
+        self.stages = {
+            name: StageGate(name, limit, stage_queues.get(name, scan_queue))
+            for name, limit in stage_limits.items()
+        }
+        self.rejected = 0
+
+    @classmethod
+    def from_settings(cls, config=settings) -> "AdmissionController":
+        return cls(config.admission_max_scans, config.admission_scan_queue,
+                   config.admission_stage_limits, config.admission_stage_queues)
+
+    def check(self):
+        """
+        Refuse a new scan if the pipeline is saturated
+
+        Raises:
+            AdmissionRejected: 503 if a stage queue is full, 429 if the scan queue is full
+        """
+        for gate in self.stages.values():
+            if gate.saturated:
+                self.rejected += 1
+                logger.warning(f"Refusing scan: {gate.name} stage saturated ({gate.waiting} waiting)")
+                raise AdmissionRejected(gate.name, gate.retry_after(), 503)
+        if self.scans.saturated:
+            self.rejected += 1
+            logger.warning(f"Refusing scan: {self.scans.waiting} scans already waiting")
+            raise AdmissionRejected('scan', self.scans.retry_after(), 429)
+
+    def stage(self, name: str):
+        """Async context manager holding a slot of a stage (no limit for unknown stages)"""
+        gate = self.stages.get(name)
+        return gate.hold_async() if gate is not None else nullcontext()
+
+    def stage_sync(self, name: str):
+        """Context manager holding a slot of a stage from a worker thread"""
+        gate = self.stages.get(name)
+        return gate.hold() if gate is not None else nullcontext()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Gate counters"""
+        return {
+            'rejected': self.rejected,
+            'scans': self.scans.get_stats(),
+            'stages': {name: gate.get_stats() for name, gate in self.stages.items()}
+        }
+
+
+# Shared by the scan endpoints and the pipeline stages they run
+admission = AdmissionController.from_settings()
@@ -0,0 +1,122 @@
+import os
+import zipfile
+import logging
+import threading
+from typing import BinaryIO, List, Optional
+
+from core.uploads import IngestedUpload, ingest_stream
+
+logger = logging.getLogger(__name__)
+
+
+class ArchiveError(ValueError):
+    """Archive is unreadable or exceeds the archive limits"""
+
+
+class ArchiveMember:
+    """A file inside an archive, with the reason it is skipped (if any)"""
+
+    __slots__ = ('index', 'name', 'filename', 'size', 'compressed_size', 'skip_reason', 'info')
+
+    def __init__(self, index: int, info: zipfile.ZipInfo, skip_reason: Optional[str] = None):
+        self.index = index
+        self.info = info
+        self.name = info.filename
+        self.filename = os.path.basename(info.filename.rstrip('/'))
+        self.size = info.file_size
+        self.compressed_size = info.compress_size
+        self.skip_reason = skip_reason
+
+
+class ZipArchiveReader:
+    """
+    Streams resumes out of a ZIP archive one member at a time
+
+    Nothing is extracted up front: each member is decompressed straight
+    into the upload spool (hashed on the way) when it is ingested, and
+    members may be ingested concurrently from pipeline threads. Zip bombs
+    are refused by member count, declared total size and per-member
+    compression ratio before any decompression, and by counting the bytes
+    actually decompressed while ingesting.
+    """
+
+    def __init__(self, fileobj: BinaryIO, allowed_extensions: List[str], max_member_bytes: int,
+                 max_total_bytes: int, max_ratio: float = 100, max_members: int = 1000):
+        """
+        Open an archive
+
+        Args:
+            fileobj: Seekable archive file
+            allowed_extensions: Member extensions that are scanned; others are skipped
+            max_member_bytes: Largest member (uncompressed)
+            max_total_bytes: Largest total of all members (uncompressed)
+            max_ratio: Highest uncompressed/compressed size ratio of a member
+            max_members: Most entries in the archive
+
+        Raises:
+            ArchiveError: If the file is not a ZIP archive or exceeds the archive limits
+        """
+        try:
+            self._zip = zipfile.ZipFile(fileobj)
+        except (zipfile.BadZipFile, OSError) as e:
+            raise ArchiveError(f"Not a valid ZIP archive: {str(e)}")
+
+        infos = self._zip.infolist()
+        if len(infos) > max_members:
+            self._zip.close()
+            raise ArchiveError(f"Archive has {len(infos)} entries; at most {max_members} are allowed.")
+        if sum(info.file_size for info in infos) > max_total_bytes:
+            self._zip.close()
+            raise ArchiveError(
+                f"Archive expands beyond the maximum allowed size ({max_total_bytes / (1024 * 1024):.0f}MB)."
+            )
+
+        self.max_member_bytes = max_member_bytes
+        self.max_total_bytes = max_total_bytes
+        self._extensions = tuple(ext.lower() for ext in allowed_extensions)
+        self._max_ratio = max_ratio
+        self._lock = threading.Lock()
+        self.bytes_read = 0
+        self.members = [ArchiveMember(i, info, self._skip_reason(info)) for i, info in enumerate(infos)]
+
+    def _skip_reason(self, info: zipfile.ZipInfo) -> Optional[str]:
+        filename = os.path.basename(info.filename.rstrip('/'))
+        if info.is_dir():
+            return "directory"
+        if info.filename.startswith('__MACOSX/') or filename.startswith('.'):
+            return "hidden or metadata file"
+        if not filename.lower().endswith(self._extensions):
+            return f"file type '{os.path.splitext(filename)[1]}' not allowed"
+        if info.flag_bits & 0x1:
+            return "encrypted"
+        if info.file_size > self.max_member_bytes:
+            return f"exceeds maximum allowed size ({self.max_member_bytes / (1024 * 1024):.0f}MB)"
+        if info.file_size > self._max_ratio * max(info.compress_size, 1):
+            return "suspicious compression ratio"
+        return None
+
+    def ingest(self, member: ArchiveMember, spool_dir: str, name: Optional[str] = None) -> IngestedUpload:
+        """
+        Decompress one member into the spool, hashing as it goes (blocking)
+
+        Raises:
+            UploadTooLargeError: If the member decompresses beyond max_member_bytes
+            ArchiveError: If the member is unreadable or the archive total is exceeded
+        """
+        try:
+            with self._zip.open(member.info) as stream:
+                upload = ingest_stream(stream, spool_dir, self.max_member_bytes, name=name,
+                                       filename=member.filename)
+        except (zipfile.BadZipFile, zipfile.LargeZipFile, RuntimeError, EOFError, OSError) as e:
+            raise ArchiveError(f"Unreadable archive member: {str(e)}")
+
+        with self._lock:
+            self.bytes_read += upload.size
+            over = self.bytes_read > self.max_total_bytes
+        if over:
+            upload.discard()
+            raise ArchiveError("Archive expands beyond the maximum allowed size.")
+        return upload
+
+    def close(self):
+        self._zip.close()
@@ -1,116 +1,474 @@
 import hashlib
 import json
+import time
+import zlib
+import asyncio
 import logging
-from typing import Any, Optional
-from datetime import datetime, timedelta
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, List, Optional, Tuple
+
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
+# Seconds the shared tier is bypassed after a Redis error
+REDIS_RETRY_INTERVAL = 30
+
 
 class SimpleCache:
-    """Simple in-memory cache for analysis results"""
+    """
+    In-memory LRU cache for analysis results
+
+    Entries expire after a TTL and the cache is bounded by a byte budget,
+    measured from the serialized size of each cached analysis. Lookups,
+    inserts and evictions are O(1): entries are kept in an OrderedDict in
+    least-recently-used order and evicted from the front.
+    """
 
-    def __init__(self, ttl_minutes: int = 60):
+    def __init__(self, ttl_minutes: int = 60, max_bytes: int = 64 * 1024 * 1024):
         """
         Initialize cache
-        
+
         Args:
             ttl_minutes: Time to live for cache entries in minutes
+            max_bytes: Budget for the serialized size of all entries
         """
-        self._cache = {}
-        self._ttl = timedelta(minutes=ttl_minutes)
+        self._cache: "OrderedDict[str, Tuple[Any, float, int]]" = OrderedDict()  # key -> (data, expires, size)
+        self._ttl = ttl_minutes * 60
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self._snapshot: Optional[Callable[[str], Optional[Tuple[Any, float, int]]]] = None
+        self.hits = 0
+        self.misses = 0
+        self.snapshot_hits = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def make_key(self, file_content: bytes, jd_text: Optional[str] = None) -> str:
+        """Cache key for file content and JD"""
+        return self._generate_key(file_content, jd_text)
+
+    @staticmethod
+    def key_for_digest(content_sha256: str, jd_text: Optional[str] = None,
+                       matcher_version: Optional[str] = None) -> str:
+        """
+        Cache key from the SHA-256 of the file content (computed once at ingestion) and the JD
+
+        Args:
+            content_sha256: Hex SHA-256 digest of the file content
+            jd_text: Optional job description text
+            matcher_version: JDMatcher.version the match was scored with (includes the
+                skill taxonomy version, so a taxonomy reload misses earlier matches)
+
+        Returns:
+            Cache key
+        """
+        if not jd_text:
+            return content_sha256
+        if matcher_version:
+            jd_text = f"{matcher_version}:{jd_text}"
+        return hashlib.sha256(f"{content_sha256}:{jd_text}".encode('utf-8')).hexdigest()
 
     def _generate_key(self, file_content: bytes, jd_text: Optional[str] = None) -> str:
         """Generate cache key from file content and JD"""
-        hasher = hashlib.md5()
-        hasher.update(file_content)
-        if jd_text:
-            hasher.update(jd_text.encode('utf-8'))
-        return hasher.hexdigest()
+        return self.key_for_digest(hashlib.sha256(file_content).hexdigest(), jd_text)
+
+    @staticmethod
+    def _size(data: Any) -> int:
+        """Serialized size of an entry in bytes"""
+        return len(json.dumps(data, default=str).encode('utf-8'))
+
+    def _remove(self, key: str):
+        _, _, size = self._cache.pop(key)
+        self._bytes -= size
 
     def get(self, file_content: bytes, jd_text: Optional[str] = None) -> Optional[Any]:
         """
         Get cached result
-        
+
         Args:
             file_content: File content bytes
             jd_text: Optional job description text
-            
+
         Returns:
             Cached result or None if not found/expired
         """
+        return self.get_key(self._generate_key(file_content, jd_text))
+
+    def get_key(self, key: str) -> Optional[Any]:
+        """Get a cached result by cache key"""
         try:
-            key = self._generate_key(file_content, jd_text)
-            
-            if key in self._cache:
-                entry = self._cache[key]
-                
-                # Check if entry is expired
-                if datetime.utcnow() - entry['timestamp'] < self._ttl:
-                    logger.info(f"Cache hit for key: {key[:8]}...")
-                    return entry['data']
-                else:
-                    # Remove expired entry
-                    del self._cache[key]
+            with self._lock:
+                entry = self._cache.get(key)
+                if entry is not None and entry[1] <= time.monotonic():
+                    self._remove(key)
+                    self.expirations += 1
+                    entry = None
                     logger.info(f"Cache expired for key: {key[:8]}...")
-            
-            return None
-            
+
+                if entry is not None:
+                    self._cache.move_to_end(key)
+                    self.hits += 1
+                elif self._snapshot is None:
+                    self.misses += 1
+                    return None
+
+            if entry is None:
+                return self._get_from_snapshot(key)
+
+            logger.info(f"Cache hit for key: {key[:8]}...")
+            return entry[0]
+
         except Exception as e:
             logger.error(f"Error getting from cache: {str(e)}")
             return None
 
+    def _get_from_snapshot(self, key: str) -> Optional[Any]:
+        """Load an entry from the attached snapshot on a miss"""
+        loaded = self._snapshot(key) if self._snapshot is not None else None
+        with self._lock:
+            if loaded is None:
+                self.misses += 1
+                return None
+            data, seconds_left, size = loaded
+            if size <= self.max_bytes and key not in self._cache:
+                self._insert(key, data, time.monotonic() + seconds_left, size)
+            self.hits += 1
+            self.snapshot_hits += 1
+        logger.info(f"Cache hit from snapshot for key: {key[:8]}...")
+        return data
+
+    def attach_snapshot(self, loader: Optional[Callable[[str], Optional[Tuple[Any, float, int]]]]):
+        """
+        Fall back to a persisted snapshot on misses
+
+        Args:
+            loader: Returns (data, seconds_left, size) for a key, or None; None detaches
+        """
+        self._snapshot = loader
+
+    def entries(self) -> List[Tuple[str, Any, float, int]]:
+        """Live entries, most recently used first, as (key, data, seconds_left, size)"""
+        now = time.monotonic()
+        with self._lock:
+            return [
+                (key, data, expires - now, size)
+                for key, (data, expires, size) in reversed(self._cache.items())
+                if expires > now
+            ]
+
     def set(self, file_content: bytes, data: Any, jd_text: Optional[str] = None):
         """
         Set cache entry
-        
+
         Args:
             file_content: File content bytes
             data: Data to cache
             jd_text: Optional job description text
         """
+        self.set_key(self._generate_key(file_content, jd_text), data)
+
+    def set_key(self, key: str, data: Any, size: Optional[int] = None):
+        """
+        Set a cache entry by cache key
+
+        Args:
+            key: Cache key
+            data: Data to cache
+            size: Serialized size of data, if already known
+        """
         try:
-            key = self._generate_key(file_content, jd_text)
-            
-            self._cache[key] = {
-                'data': data,
-                'timestamp': datetime.utcnow()
-            }
-            
+            size = size if size is not None else self._size(data)
+            if size > self.max_bytes:
+                logger.info(f"Not caching {size} byte entry (budget {self.max_bytes} bytes)")
+                return
+
+            with self._lock:
+                self._insert(key, data, time.monotonic() + self._ttl, size)
+
             logger.info(f"Cached result for key: {key[:8]}...")
-            
-            # Clean up old entries if cache is getting large
-            if len(self._cache) > 100:
-                self._cleanup()
-                
+
         except Exception as e:
             logger.error(f"Error setting cache: {str(e)}")
 
-    def _cleanup(self):
-        """Remove expired entries from cache"""
-        try:
-            current_time = datetime.utcnow()
-            expired_keys = [
-                key for key, entry in self._cache.items()
-                if current_time - entry['timestamp'] >= self._ttl
-            ]
-            
-            for key in expired_keys:
-                del self._cache[key]
-            
-            logger.info(f"Cleaned up {len(expired_keys)} expired cache entries")
-            
-        except Exception as e:
-            logger.error(f"Error cleaning up cache: {str(e)}")
+    def _insert(self, key: str, data: Any, expires: float, size: int):
+        if key in self._cache:
+            self._remove(key)
+        self._cache[key] = (data, expires, size)
+        self._bytes += size
+        self._evict()
+
+    def _evict(self):
+        """Drop expired entries at the LRU end, then least recently used ones until within budget"""
+        now = time.monotonic()
+        while self._cache:
+            key, (_, expires, _) = next(iter(self._cache.items()))
+            if expires <= now:
+                self._remove(key)
+                self.expirations += 1
+            elif self._bytes > self.max_bytes:
+                self._remove(key)
+                self.evictions += 1
+            else:
+                break
 
     def clear(self):
         """Clear all cache entries"""
-        self._cache.clear()
+        with self._lock:
+            self._cache.clear()
+            self._bytes = 0
         logger.info("Cache cleared")
 
     def get_stats(self) -> dict:
         """Get cache statistics"""
+        lookups = self.hits + self.misses
         return {
             'total_entries': len(self._cache),
-            'ttl_minutes': self._ttl.total_seconds() / 60
+            'ttl_minutes': self._ttl / 60,
+            'bytes': self._bytes,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 3) if lookups else 0,
+            'snapshot_hits': self.snapshot_hits,
+            'evictions': self.evictions,
+            'expirations': self.expirations
         }
+
+
+class TieredCache:
+    """
+    Two-tier analysis cache: the in-process LRU in front of a shared Redis tier
+
+    Every uvicorn worker and replica shares the Redis tier, so a re-upload
+    is a hit wherever the first analysis ran. Values are stored in Redis as
+    zlib-compressed JSON under keys namespaced by analyzer version, so a
+    deploy with a new version never reads old entries (they age out by
+    TTL). Redis errors never fail a request: the shared tier is skipped for
+    a while and the in-process tier keeps working.
+    """
+
+    def __init__(self, local: SimpleCache, client=None, namespace: str = "analysis",
+                 ttl_minutes: Optional[int] = None):
+        """
+        Initialize cache
+
+        Args:
+            local: In-process tier
+            client: Redis client (or compatible object with get/set); None disables the shared tier
+            namespace: Key prefix, including the analyzer version
+            ttl_minutes: Shared tier TTL; defaults to the local TTL
+        """
+        self.local = local
+        self.client = client
+        self.namespace = namespace
+        self.ttl_seconds = int(ttl_minutes * 60 if ttl_minutes is not None else local._ttl)
+        self._retry_at = 0.0
+        self.remote_hits = 0
+        self.remote_misses = 0
+        self.remote_errors = 0
+
+    @classmethod
+    def from_url(cls, local: SimpleCache, redis_url: Optional[str], namespace: str = "analysis"):
+        """
+        Create a cache with a Redis tier at redis_url (local only if unset or unavailable)
+        """
+        client = None
+        if redis_url:
+            if REDIS_AVAILABLE:
+                client = redis.Redis.from_url(redis_url, socket_timeout=0.5, socket_connect_timeout=0.5)
+            else:
+                logger.warning("redis package not installed - analysis cache is per-process only")
+        return cls(local, client, namespace)
+
+    def make_key(self, file_content: bytes, jd_text: Optional[str] = None) -> str:
+        """Cache key for file content and JD"""
+        return self.local.make_key(file_content, jd_text)
+
+    def key_for_digest(self, content_sha256: str, jd_text: Optional[str] = None,
+                       matcher_version: Optional[str] = None) -> str:
+        """Cache key from a content digest, the JD and the matcher version"""
+        return self.local.key_for_digest(content_sha256, jd_text, matcher_version)
+
+    def _generate_key(self, file_content: bytes, jd_text: Optional[str] = None) -> str:
+        return self.local._generate_key(file_content, jd_text)
+
+    def _remote_key(self, key: str) -> str:
+        return f"{self.namespace}:{key}"
+
+    def _remote_available(self) -> bool:
+        return self.client is not None and time.monotonic() >= self._retry_at
+
+    def _remote_failed(self, action: str, error: Exception):
+        self.remote_errors += 1
+        self._retry_at = time.monotonic() + REDIS_RETRY_INTERVAL
+        logger.warning(f"Shared cache {action} failed, using local cache only for {REDIS_RETRY_INTERVAL}s: {error}")
+
+    @staticmethod
+    def _encode(data: Any) -> Tuple[bytes, int]:
+        """Compressed payload and uncompressed size"""
+        raw = json.dumps(data, default=str).encode('utf-8')
+        return zlib.compress(raw), len(raw)
+
+    @staticmethod
+    def _decode(payload: bytes) -> Any:
+        return json.loads(zlib.decompress(payload))
+
+    def get(self, file_content: bytes, jd_text: Optional[str] = None) -> Optional[Any]:
+        """
+        Get cached result from the local tier, then the shared tier
+
+        Args:
+            file_content: File content bytes
+            jd_text: Optional job description text
+
+        Returns:
+            Cached result or None if not found/expired
+        """
+        return self.get_key(self._generate_key(file_content, jd_text))
+
+    def get_key(self, key: str) -> Optional[Any]:
+        """Get a cached result by cache key (blocking; use aget_key on the event loop)"""
+        data = self.local.get_key(key)
+        if data is not None or not self._remote_available():
+            return data
+        return self._get_remote(key)
+
+    async def aget_key(self, key: str) -> Optional[Any]:
+        """
+        Get a cached result by cache key from a coroutine
+
+        Local hits return immediately; the Redis round trip and decompression
+        run on a worker thread so they never block the event loop.
+        """
+        data = self.local.get_key(key)
+        if data is not None or not self._remote_available():
+            return data
+        return await asyncio.to_thread(self._get_remote, key)
+
+    def _get_remote(self, key: str) -> Optional[Any]:
+        """Read, decode and promote an entry of the shared tier (blocking)"""
+        try:
+            payload = self.client.get(self._remote_key(key))
+        except Exception as e:
+            self._remote_failed("read", e)
+            return None
+        if payload is None:
+            self.remote_misses += 1
+            return None
+
+        try:
+            data = self._decode(payload)
+        except Exception as e:
+            logger.warning(f"Dropping undecodable shared cache entry {key[:8]}...: {e}")
+            return None
+        self.remote_hits += 1
+        self.local.set_key(key, data)
+        return data
+
+    def set(self, file_content: bytes, data: Any, jd_text: Optional[str] = None):
+        """
+        Set cache entry in both tiers
+
+        Args:
+            file_content: File content bytes
+            data: Data to cache
+            jd_text: Optional job description text
+        """
+        self.set_key(self._generate_key(file_content, jd_text), data)
+
+    def set_key(self, key: str, data: Any):
+        """Set a cache entry in both tiers by cache key (blocking; use aset_key on the event loop)"""
+        try:
+            payload, size = self._encode(data)
+        except Exception as e:
+            logger.error(f"Error setting cache: {str(e)}")
+            return
+        self.local.set_key(key, data, size=size)
+        if not self._remote_available():
+            return
+        try:
+            self.client.set(self._remote_key(key), payload, ex=self.ttl_seconds)
+        except Exception as e:
+            self._remote_failed("write", e)
+
+    async def aset_key(self, key: str, data: Any):
+        """Set a cache entry from a coroutine; compression and the Redis write run on a worker thread"""
+        await asyncio.to_thread(self.set_key, key, data)
+
+    def clear(self):
+        """Clear the local tier (shared entries expire by TTL or a namespace change)"""
+        self.local.clear()
+
+    def get_stats(self) -> dict:
+        """Get cache statistics for both tiers"""
+        return {
+            **self.local.get_stats(),
+            'shared': {
+                'enabled': self.client is not None,
+                'namespace': self.namespace,
+                'hits': self.remote_hits,
+                'misses': self.remote_misses,
+                'errors': self.remote_errors
+            }
+        }
+
+
+class DocumentMemo:
+    """
+    Bounded LRU of values computed from a document's text, keyed by its SHA-256
+
+    Lets per-document stages (segmentation, annotation, timelines, compiled
+    JDs) compute once per text and share the result between callers. The
+    value is computed outside the lock, so two threads may compute the same
+    text at once; the later result replaces the earlier one.
+    """
+
+    def __init__(self, max_entries: int):
+        """
+        Initialize memo
+
+        Args:
+            max_entries: Number of documents kept (least recently used dropped first)
+        """
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_or_compute(self, text: str, compute: Callable[[str], Any],
+                       valid: Optional[Callable[[Any], bool]] = None) -> Any:
+        """
+        Return the value for text, computing and storing it on a miss
+
+        Args:
+            text: Document text
+            compute: Called with the text on a miss
+            valid: Optional check that a stored value is still usable (e.g. same taxonomy)
+
+        Returns:
+            Stored or newly computed value
+        """
+        key = hashlib.sha256(text.encode('utf-8')).hexdigest()
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None and (valid is None or valid(value)):
+                self._entries.move_to_end(key)
+                return value
+
+        value = compute(text)
+
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
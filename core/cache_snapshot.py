@@ -0,0 +1,234 @@
+import os
+import json
+import mmap
+import time
+import zlib
+import struct
+import tempfile
+import asyncio
+import logging
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Trailer: header JSON length (8 bytes, big endian) followed by the magic
+MAGIC = b'RCSNAP01'
+TRAILER = struct.Struct('>Q8s')
+
+
+class CacheSnapshot:
+    """
+    Read side of a persisted cache snapshot
+
+    The file is a run of zlib-compressed JSON entries followed by a JSON
+    header indexing them by section and key. Opening it maps the file and
+    parses only the header; entries are decompressed when first looked up.
+    """
+
+    def __init__(self, path: str, version: Dict[str, str]):
+        """
+        Open a snapshot
+
+        Args:
+            path: Snapshot file
+            version: Versions the entries must have been produced with
+
+        Raises:
+            ValueError: If the file is not a snapshot or its versions differ
+        """
+        self.path = path
+        with open(path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            if len(self._map) < TRAILER.size:
+                raise ValueError("truncated snapshot")
+            header_len, magic = TRAILER.unpack_from(self._map, len(self._map) - TRAILER.size)
+            header_start = len(self._map) - TRAILER.size - header_len
+            if magic != MAGIC or header_start < 0:
+                raise ValueError("not a cache snapshot")
+            header = json.loads(self._map[header_start:header_start + header_len])
+            if header.get('version') != version:
+                raise ValueError(f"snapshot versions {header.get('version')} do not match {version}")
+        except Exception:
+            self._map.close()
+            raise
+        self.saved_at = header.get('saved_at', 0)
+        # section -> key -> (offset, length, expires_at, size)
+        self._sections: Dict[str, Dict[str, Tuple[int, int, float, int]]] = {
+            name: {key: (offset, length, expires_at, size) for key, offset, length, expires_at, size in entries}
+            for name, entries in header.get('sections', {}).items()
+        }
+
+    @classmethod
+    def open(cls, path: str, version: Dict[str, str]) -> Optional["CacheSnapshot"]:
+        """Open a snapshot, or None if it is missing, unreadable or from other versions"""
+        if not os.path.exists(path):
+            return None
+        try:
+            snapshot = cls(path, version)
+            logger.info(f"Loaded cache snapshot {path}: "
+                        + ", ".join(f"{name} {len(index)}" for name, index in snapshot._sections.items()))
+            return snapshot
+        except Exception as e:
+            logger.warning(f"Ignoring cache snapshot {path}: {str(e)}")
+            return None
+
+    def loader(self, section: str):
+        """Lookup function for SimpleCache.attach_snapshot"""
+        return lambda key: self.get(section, key)
+
+    def get(self, section: str, key: str) -> Optional[Tuple[Any, float, int]]:
+        """
+        Decode one entry
+
+        Returns:
+            (data, seconds_left, size), or None if absent or expired
+        """
+        entry = self._sections.get(section, {}).get(key)
+        if entry is None:
+            return None
+        offset, length, expires_at, size = entry
+        seconds_left = expires_at - time.time()
+        if seconds_left <= 0:
+            return None
+        try:
+            data = json.loads(zlib.decompress(self._map[offset:offset + length]))
+        except Exception as e:
+            logger.warning(f"Dropping unreadable snapshot entry {key[:8]}...: {str(e)}")
+            return None
+        return data, seconds_left, size
+
+    def raw_entries(self, section: str):
+        """Yield unexpired (key, payload, expires_at, size) without decoding payloads"""
+        now = time.time()
+        for key, (offset, length, expires_at, size) in self._sections.get(section, {}).items():
+            if expires_at > now:
+                yield key, self._map[offset:offset + length], expires_at, size
+
+
+def write_snapshot(path: str, caches: Dict[str, Any], version: Dict[str, str],
+                   previous: Optional[CacheSnapshot] = None) -> int:
+    """
+    Write the live entries of caches to a snapshot file
+
+    Entries still only in the previous snapshot (never looked up since it
+    was loaded) are carried over without being decoded, as long as the
+    section stays within its cache's byte budget.
+
+    Args:
+        path: Snapshot file (replaced atomically; each writer uses its own temp file,
+            so workers saving at the same time never interleave)
+        caches: Section name to SimpleCache
+        version: Versions the entries were produced with
+        previous: Snapshot the caches were loaded from
+
+    Returns:
+        Number of entries written
+    """
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(path)}.", suffix=".tmp")
+    now = time.time()
+    sections: Dict[str, list] = {}
+    offset = 0
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            for name, cache in caches.items():
+                index = sections[name] = []
+                budget = cache.max_bytes
+                for key, data, seconds_left, size in cache.entries():
+                    if size > budget:
+                        continue
+                    payload = zlib.compress(json.dumps(data, default=str).encode('utf-8'))
+                    f.write(payload)
+                    index.append([key, offset, len(payload), now + seconds_left, size])
+                    offset += len(payload)
+                    budget -= size
+                if previous is not None:
+                    seen = {entry[0] for entry in index}
+                    for key, payload, expires_at, size in previous.raw_entries(name):
+                        if key in seen or size > budget:
+                            continue
+                        f.write(payload)
+                        index.append([key, offset, len(payload), expires_at, size])
+                        offset += len(payload)
+                        budget -= size
+            header = json.dumps({'version': version, 'saved_at': now, 'sections': sections}).encode('utf-8')
+            f.write(header)
+            f.write(TRAILER.pack(len(header), MAGIC))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return sum(len(index) for index in sections.values())
+
+
+class CacheSnapshotter:
+    """
+    Persists in-process caches across restarts
+
+    On startup the snapshot is mapped and attached to each cache, so
+    entries are decoded only when a lookup misses in memory. Snapshots are
+    written periodically and on shutdown; a snapshot from another analyzer
+    or matcher version is ignored.
+    """
+
+    def __init__(self, path: str, caches: Dict[str, Any], version: Dict[str, str],
+                 interval_seconds: float = 300):
+        """
+        Initialize snapshotter
+
+        Args:
+            path: Snapshot file
+            caches: Section name to SimpleCache
+            version: Versions cached entries depend on (e.g. analyzer and matcher)
+            interval_seconds: Seconds between periodic snapshots
+        """
+        self.path = path
+        self.caches = caches
+        self.version = version
+        self.interval_seconds = interval_seconds
+        self._snapshot: Optional[CacheSnapshot] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def load(self) -> bool:
+        """Attach the snapshot on disk to the caches; True if one was usable"""
+        self._snapshot = CacheSnapshot.open(self.path, self.version)
+        if self._snapshot is None:
+            return False
+        for name, cache in self.caches.items():
+            cache.attach_snapshot(self._snapshot.loader(name))
+        return True
+
+    def save(self) -> bool:
+        """Write a snapshot of the caches"""
+        try:
+            count = write_snapshot(self.path, self.caches, self.version, self._snapshot)
+        except Exception as e:
+            logger.error(f"Error writing cache snapshot: {str(e)}")
+            return False
+        logger.info(f"Wrote cache snapshot with {count} entries to {self.path}")
+        # The caches stay attached to the snapshot they were loaded from (its
+        # mapping outlives the replaced file), so entries only on disk are
+        # still carried over by the next save without reopening the file
+        return True
+
+    def start(self):
+        """Start periodic snapshots on the running loop"""
+        if self.interval_seconds > 0 and self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            await asyncio.to_thread(self.save)
+
+    async def close(self):
+        """Stop periodic snapshots and write a final one"""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        await asyncio.to_thread(self.save)
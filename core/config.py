@@ -29,6 +29,12 @@ class Settings(BaseSettings):
     # Processing Settings
     max_pages_ocr: int = 5
     ocr_confidence_threshold: float = 0.7
+    phone_default_region: str = "US"  # Region for phone numbers written without a country code
+
+    # Matching Settings
+    semantic_match_weight: float = 0.0  # Share of overall JD match taken by TF-IDF similarity (0 disables)
+    skill_taxonomy_path: Optional[str] = None  # Skill synonyms/hierarchy JSON; None uses data/skill_taxonomy.json
+    ranker_refresh_seconds: int = 60  # Seconds between background loads of newly processed resumes into the job ranking index
 
     # AI/Gemini Settings (if using)
     gemini_api_key: Optional[str] = None
@@ -37,6 +43,39 @@ class Settings(BaseSettings):
     # Storage Settings
     results_dir: str = "results"
     temp_dir: str = "temp"
+    result_storage_backend: str = "jsonl"  # "jsonl" (append-only log) or "sqlite" (WAL-mode database)
+    result_retention_days: int = 90  # Analysis results older than this are dropped (0 keeps everything)
+    result_segment_max_bytes: int = 16 * 1024 * 1024  # Result log segment rotation size
+    result_write_batch_size: int = 64  # Most results committed together by the background writer
+    result_write_max_delay_ms: int = 50  # How long a result waits to share a commit
+    result_write_ack: bool = False  # Respond only after the result is committed
+
+    # Analysis Cache Settings
+    analysis_cache_ttl_minutes: int = 30
+    analysis_cache_max_bytes: int = 64 * 1024 * 1024  # Budget for the serialized size of cached analyses
+    analysis_cache_redis_url: Optional[str] = None  # Shared cache tier for all workers/replicas; None is per-process only
+    scan_coalesce_across_workers: bool = True  # Identical scans on other workers wait for one analysis (needs the Redis tier)
+    scan_flight_lock_seconds: int = 120  # Longest other workers wait for an identical in-flight scan
+    scan_flight_lease_seconds: int = 10  # Flight lock lease renewed by the scanning worker; a dead worker's lapses after this
+    extraction_cache_max_bytes: int = 32 * 1024 * 1024  # Extracted text and structure by file hash, reused across JDs
+    verification_cache_ttl_minutes: int = 24 * 60  # LinkedIn/search verification results by candidate
+    verification_cache_max_bytes: int = 8 * 1024 * 1024
+    cache_snapshot_path: Optional[str] = "temp/cache_snapshot.bin"  # Caches persisted across restarts; None disables
+    cache_snapshot_interval_seconds: int = 300  # Periodic snapshots (one is also written on shutdown)
+    scan_worker_threads: int = 8  # Threads running parsing, OCR, verification and matching off the event loop
+    scan_process_workers: int = 0  # Processes for document parsing (0 parses on the threads)
+    scan_max_pending: int = 64  # Pipeline stages submitted at once; further scans wait their turn
+    batch_max_files: int = 500  # Files accepted by one /api/batch-scan request
+    batch_scan_concurrency: int = 8  # Files of one batch scanned at the same time
+    archive_max_bytes: int = 200 * 1024 * 1024  # Largest ZIP accepted by /api/scan-archive
+    archive_max_total_bytes: int = 1024 * 1024 * 1024  # Largest total of its members once decompressed
+    archive_max_members: int = 1000  # Most entries in one archive
+    archive_max_ratio: int = 100  # Members compressed more than this are refused as possible zip bombs
+    admission_max_scans: int = 16  # Scans running at once; later ones wait for a slot
+    admission_scan_queue: int = 64  # Scans waiting for a slot before new ones get 429
+    admission_stage_limits: dict = {"parse": 8, "ocr": 2, "verification": 2, "matching": 8}  # Concurrent work per stage
+    admission_stage_queues: dict = {"parse": 32, "ocr": 8, "verification": 8, "matching": 32}  # Waiting work per stage before new scans get 503
+    job_store_redis_url: Optional[str] = None  # Shares scan job status between API and Celery workers; None is per-process only
     
     # Google Search API Settings (for LinkedIn verification)
     google_search_api_key: Optional[str] = None
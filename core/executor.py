@@ -0,0 +1,109 @@
+import asyncio
+import logging
+import functools
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class PipelineExecutor:
+    """
+    Runs blocking scan stages off the event loop
+
+    Stages run on a thread pool (document parsing with fitz and OCR with
+    tesseract release the GIL, as do network verification calls) or, for
+    pure CPU-bound work, on an optional process pool. Submission is
+    bounded: at most max_pending stages are handed to the pools at once and
+    further callers wait on the event loop instead of piling into the
+    pools' unbounded queues, so the loop only coordinates and small
+    requests are served while heavy scans run.
+    """
+
+    def __init__(self, max_workers: int = 8, max_pending: int = 64, process_workers: int = 0):
+        """
+        Initialize executor
+
+        Args:
+            max_workers: Threads running blocking stages
+            max_pending: Stages submitted to the pools (running or queued) at once
+            process_workers: Processes for CPU-bound stages (0 runs them on threads)
+        """
+        self.max_workers = max_workers
+        self.max_pending = max(max_pending, 1)
+        self.process_workers = process_workers
+        self._threads: Optional[ThreadPoolExecutor] = None
+        self._processes: Optional[ProcessPoolExecutor] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self.submitted = 0
+        self.waiting = 0
+        self.failed = 0
+
+    def _pool(self, cpu_bound: bool):
+        if cpu_bound and self.process_workers > 0:
+            if self._processes is None:
+                # Spawned workers do not inherit the server's threads and locks
+                self._processes = ProcessPoolExecutor(
+                    self.process_workers, mp_context=multiprocessing.get_context('spawn')
+                )
+            return self._processes
+        if self._threads is None:
+            self._threads = ThreadPoolExecutor(self.max_workers, thread_name_prefix='scan')
+        return self._threads
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._slots = asyncio.Semaphore(self.max_pending)
+        return self._slots
+
+    async def run(self, func: Callable[..., Any], *args, cpu_bound: bool = False, **kwargs) -> Any:
+        """
+        Run func(*args, **kwargs) on a pool and await its result
+
+        Args:
+            func: Blocking callable (picklable when cpu_bound and a process pool is configured)
+            cpu_bound: Prefer the process pool
+        """
+        slots = self._semaphore()
+        if slots.locked():
+            self.waiting += 1
+            try:
+                await slots.acquire()
+            finally:
+                self.waiting -= 1
+        else:
+            await slots.acquire()
+        try:
+            self.submitted += 1
+            call = functools.partial(func, *args, **kwargs) if args or kwargs else func
+            return await asyncio.get_running_loop().run_in_executor(self._pool(cpu_bound), call)
+        except Exception:
+            self.failed += 1
+            raise
+        finally:
+            slots.release()
+
+    def shutdown(self, wait: bool = True):
+        """Stop the pools"""
+        for pool in (self._threads, self._processes):
+            if pool is not None:
+                pool.shutdown(wait=wait)
+        self._threads = None
+        self._processes = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Executor counters"""
+        in_flight = self.max_pending - self._slots._value if self._slots is not None else 0
+        return {
+            'max_workers': self.max_workers,
+            'process_workers': self.process_workers,
+            'max_pending': self.max_pending,
+            'in_flight': in_flight,
+            'waiting': self.waiting,
+            'submitted': self.submitted,
+            'failed': self.failed
+        }
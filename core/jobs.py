@@ -0,0 +1,188 @@
+import json
+import time
+import uuid
+import asyncio
+import logging
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from core.config import settings
+
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Jobs in these states no longer change
+TERMINAL_STATUSES = ('completed', 'failed')
+
+
+class JobStore:
+    """
+    Status of background scan jobs
+
+    Jobs are kept in process (bounded, oldest dropped first) and, with a
+    Redis client, in Redis as JSON under namespaced keys so API workers and
+    Celery workers see the same jobs. Every update bumps a version number
+    that watchers use to send only changes. Coroutines use the a-prefixed
+    methods, which make the Redis round trips on a worker thread.
+    """
+
+    def __init__(self, client=None, namespace: str = "jobs", ttl_seconds: int = 24 * 3600,
+                 max_jobs: int = 10000):
+        """
+        Initialize store
+
+        Args:
+            client: Redis client (or compatible object with get/set); None keeps jobs in process only
+            namespace: Key prefix
+            ttl_seconds: How long jobs are kept in Redis
+            max_jobs: Jobs kept in process
+        """
+        self.client = client
+        self.namespace = namespace
+        self.ttl_seconds = ttl_seconds
+        self.max_jobs = max_jobs
+        self._jobs: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.remote_errors = 0
+
+    @classmethod
+    def from_url(cls, redis_url: Optional[str], namespace: str = "jobs"):
+        """Create a store backed by Redis at redis_url (in process only if unset or unavailable)"""
+        client = None
+        if redis_url:
+            if REDIS_AVAILABLE:
+                client = redis.Redis.from_url(redis_url, socket_timeout=0.5, socket_connect_timeout=0.5)
+            else:
+                logger.warning("redis package not installed - job status is per-process only")
+        return cls(client, namespace)
+
+    def _key(self, job_id: str) -> str:
+        return f"{self.namespace}:{job_id}"
+
+    def _save(self, job: Dict[str, Any]):
+        with self._lock:
+            self._jobs[job['job_id']] = job
+            self._jobs.move_to_end(job['job_id'])
+            while len(self._jobs) > self.max_jobs:
+                self._jobs.popitem(last=False)
+        if self.client is not None:
+            try:
+                self.client.set(self._key(job['job_id']), json.dumps(job, default=str), ex=self.ttl_seconds)
+            except Exception as e:
+                self.remote_errors += 1
+                logger.warning(f"Failed to share job {job['job_id']}: {e}")
+
+    def create(self, job_id: Optional[str] = None, **fields) -> Dict[str, Any]:
+        """
+        Register a new job
+
+        Args:
+            job_id: Job ID (a new UUID if not given)
+            **fields: Initial fields (e.g. kind, file_name)
+
+        Returns:
+            The job
+        """
+        now = datetime.utcnow().isoformat()
+        job = {
+            'job_id': job_id or str(uuid.uuid4()),
+            'status': 'queued',
+            'created_at': now,
+            'updated_at': now,
+            'version': 0,
+            'result': None,
+            'error': None,
+            **fields
+        }
+        self._save(job)
+        return job
+
+    def update(self, job_id: str, **fields) -> Optional[Dict[str, Any]]:
+        """
+        Change fields of a job (e.g. status, progress, result)
+
+        Returns:
+            The updated job, or None if it is unknown
+        """
+        job = self.get(job_id)
+        if job is None:
+            return None
+        job = {**job, **fields, 'updated_at': datetime.utcnow().isoformat(), 'version': job['version'] + 1}
+        self._save(job)
+        return job
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Get a job (from Redis when shared, so updates from other processes are seen)"""
+        if self.client is not None:
+            try:
+                payload = self.client.get(self._key(job_id))
+                if payload is not None:
+                    return json.loads(payload)
+            except Exception as e:
+                self.remote_errors += 1
+                logger.warning(f"Failed to read shared job {job_id}: {e}")
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job is not None else None
+
+    async def _offload(self, func, *args, **kwargs):
+        """Run a store call from a coroutine; calls that reach Redis run on a worker thread"""
+        if self.client is None:
+            return func(*args, **kwargs)
+        return await asyncio.to_thread(func, *args, **kwargs)
+
+    async def acreate(self, job_id: Optional[str] = None, **fields) -> Dict[str, Any]:
+        """create() for coroutines"""
+        return await self._offload(self.create, job_id, **fields)
+
+    async def aupdate(self, job_id: str, **fields) -> Optional[Dict[str, Any]]:
+        """update() for coroutines"""
+        return await self._offload(self.update, job_id, **fields)
+
+    async def aget(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """get() for coroutines"""
+        return await self._offload(self.get, job_id)
+
+    async def watch(self, job_id: str, poll_interval: float = 0.5, timeout: Optional[float] = None):
+        """
+        Yield the job each time it changes, until it completes or fails
+
+        Args:
+            job_id: Job to follow
+            poll_interval: Seconds between checks
+            timeout: Stop after this many seconds (None follows the job to the end)
+        """
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        version = None
+        while True:
+            job = await self.aget(job_id)
+            if job is None:
+                return
+            if job['version'] != version:
+                version = job['version']
+                yield job
+            if job['status'] in TERMINAL_STATUSES:
+                return
+            if deadline is not None and time.monotonic() >= deadline:
+                return
+            await asyncio.sleep(poll_interval)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Job counts by status (jobs in this process)"""
+        with self._lock:
+            counts: Dict[str, int] = {}
+            for job in self._jobs.values():
+                counts[job['status']] = counts.get(job['status'], 0) + 1
+        return {'jobs': len(self._jobs), 'by_status': counts, 'shared': self.client is not None,
+                'remote_errors': self.remote_errors}
+
+
+# Shared by the scan endpoints in main.py and the v1 resume API / Celery tasks
+job_store = JobStore.from_url(settings.job_store_redis_url)
@@ -0,0 +1,149 @@
+import time
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent identical work
+
+    The first caller for a key runs the work; callers arriving while it is
+    in flight await the same future and get the same result (or the same
+    exception). With a shared cache whose tier has a Redis client, the
+    leader also takes a short-lived lock in Redis, and other workers that
+    find the lock held wait for the leader's result to appear in the shared
+    cache instead of repeating the work. The lock is a lease the leader
+    keeps renewing, so if the leader dies the lock lapses within
+    lease_seconds and a waiting worker takes over the work. Redis calls
+    run on worker threads, never on the event loop.
+    """
+
+    def __init__(self, cache=None, lock_seconds: int = 120, poll_interval: float = 0.25,
+                 namespace: str = "flight", lease_seconds: int = 10):
+        """
+        Initialize single-flight group
+
+        Args:
+            cache: TieredCache holding results by key; its Redis client is used for
+                cross-worker locks (None coalesces within this process only)
+            lock_seconds: Longest other workers wait for a leader that is alive but stuck
+            poll_interval: Seconds between checks for another worker's result
+            namespace: Lock key prefix
+            lease_seconds: Lock expiry, renewed by a live leader; bounds the wait for a dead one
+        """
+        self.cache = cache
+        self.lock_seconds = lock_seconds
+        self.lease_seconds = max(1, min(lease_seconds, lock_seconds))
+        self.poll_interval = poll_interval
+        self.namespace = namespace
+        self._flights: Dict[str, asyncio.Future] = {}
+        self.leaders = 0
+        self.coalesced = 0
+        self.remote_waits = 0
+
+    @property
+    def _client(self):
+        return getattr(self.cache, 'client', None)
+
+    async def run(self, key: str, func: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run func once per key among concurrent callers
+
+        Args:
+            key: Identity of the work (e.g. content hash plus JD hash)
+            func: Coroutine function doing the work
+
+        Returns:
+            The result of func, shared by all callers in flight
+        """
+        existing = self._flights.get(key)
+        if existing is not None:
+            self.coalesced += 1
+            logger.info(f"Joining in-flight analysis for key: {key[:8]}...")
+            return await asyncio.shield(existing)
+
+        future = asyncio.get_running_loop().create_future()
+        # Followers may all be gone by the time the leader fails
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._flights[key] = future
+        self.leaders += 1
+        try:
+            result = await self._run_leader(key, func)
+            future.set_result(result)
+            return result
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        except BaseException:
+            future.cancel()
+            raise
+        finally:
+            self._flights.pop(key, None)
+
+    async def _run_leader(self, key: str, func: Callable[[], Awaitable[Any]]) -> Any:
+        client = self._client
+        if client is None:
+            return await func()
+
+        lock_key = f"{self.namespace}:{key}"
+        deadline = time.monotonic() + self.lock_seconds
+        while True:
+            try:
+                acquired = await asyncio.to_thread(client.set, lock_key, b'1', nx=True, ex=self.lease_seconds)
+            except Exception as e:
+                logger.warning(f"Shared flight lock unavailable, running locally: {e}")
+                return await func()
+
+            if acquired:
+                heartbeat = asyncio.ensure_future(self._renew(client, lock_key))
+                try:
+                    # Another worker may have finished just before we got the lock
+                    cached = await self.cache.aget_key(key)
+                    if cached is not None:
+                        return cached
+                    return await func()
+                finally:
+                    heartbeat.cancel()
+                    try:
+                        await asyncio.to_thread(client.delete, lock_key)
+                    except Exception as e:
+                        logger.warning(f"Failed to release flight lock: {e}")
+
+            # Another worker is computing this key; wait for its result
+            self.remote_waits += 1
+            while True:
+                await asyncio.sleep(self.poll_interval)
+                cached = await self.cache.aget_key(key)
+                if cached is not None:
+                    return cached
+                try:
+                    held = await asyncio.to_thread(client.exists, lock_key)
+                except Exception:
+                    held = False
+                if not held or time.monotonic() >= deadline:
+                    break
+            if time.monotonic() >= deadline:
+                logger.warning(f"Gave up waiting for another worker on key {key[:8]}..., running locally")
+                return await func()
+            # The lease lapsed without a result (the other worker failed or died); try to take over
+
+    async def _renew(self, client, lock_key: str):
+        """Keep the flight lock alive while this worker computes"""
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            try:
+                await asyncio.to_thread(client.expire, lock_key, self.lease_seconds)
+            except Exception as e:
+                logger.warning(f"Failed to renew flight lock: {e}")
+
+    def get_stats(self) -> Dict[str, int]:
+        """Coalescing counters"""
+        return {
+            'in_flight': len(self._flights),
+            'leaders': self.leaders,
+            'coalesced': self.coalesced,
+            'remote_waits': self.remote_waits
+        }
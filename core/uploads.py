@@ -0,0 +1,121 @@
+import os
+import uuid
+import hashlib
+import logging
+from typing import BinaryIO, Optional
+
+import aiofiles
+from fastapi import UploadFile
+
+logger = logging.getLogger(__name__)
+
+# Bytes read, hashed and written per step
+CHUNK_SIZE = 1024 * 1024
+
+
+class UploadTooLargeError(ValueError):
+    """Upload crossed the size limit while being read"""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        super().__init__(f"File exceeds maximum allowed size ({max_bytes / (1024 * 1024):.0f}MB).")
+
+
+class IngestedUpload:
+    """An upload spooled to disk, with its size and SHA-256 digest"""
+
+    __slots__ = ('path', 'size', 'sha256', 'filename')
+
+    def __init__(self, path: str, size: int, sha256: str, filename: Optional[str] = None):
+        self.path = path
+        self.size = size
+        self.sha256 = sha256
+        self.filename = filename
+
+    def read_bytes(self) -> bytes:
+        with open(self.path, 'rb') as f:
+            return f.read()
+
+    def move_to(self, path: str):
+        """Move the spooled file to its final location"""
+        os.replace(self.path, path)
+        self.path = path
+
+    def discard(self):
+        """Delete the spooled file"""
+        try:
+            if os.path.exists(self.path):
+                os.remove(self.path)
+        except OSError as e:
+            logger.warning(f"Failed to remove spooled upload {self.path}: {str(e)}")
+
+
+def _spool_path(spool_dir: str, name: Optional[str]) -> str:
+    os.makedirs(spool_dir, exist_ok=True)
+    return os.path.join(spool_dir, name or f"{uuid.uuid4()}.part")
+
+
+async def ingest_upload(file: UploadFile, spool_dir: str, max_bytes: int, name: Optional[str] = None,
+                        chunk_size: int = CHUNK_SIZE) -> IngestedUpload:
+    """
+    Stream an upload to disk in chunks, hashing as it goes
+
+    Args:
+        file: Uploaded file
+        spool_dir: Directory to write the file to
+        max_bytes: Size limit; reading stops as soon as it is crossed
+        name: File name in spool_dir (random if not given)
+        chunk_size: Bytes per read
+
+    Returns:
+        IngestedUpload with path, size and SHA-256 hex digest
+
+    Raises:
+        UploadTooLargeError: If the upload is larger than max_bytes (nothing is kept)
+    """
+    path = _spool_path(spool_dir, name)
+    hasher = hashlib.sha256()
+    size = 0
+    try:
+        async with aiofiles.open(path, 'wb') as out:
+            while True:
+                chunk = await file.read(chunk_size)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadTooLargeError(max_bytes)
+                hasher.update(chunk)
+                await out.write(chunk)
+    except BaseException:
+        IngestedUpload(path, size, '').discard()
+        raise
+    return IngestedUpload(path, size, hasher.hexdigest(), file.filename)
+
+
+def ingest_stream(stream: BinaryIO, spool_dir: str, max_bytes: int, name: Optional[str] = None,
+                  filename: Optional[str] = None, chunk_size: int = CHUNK_SIZE) -> IngestedUpload:
+    """
+    Blocking version of ingest_upload for file objects (e.g. UploadFile.file)
+
+    Raises:
+        UploadTooLargeError: If the stream is larger than max_bytes (nothing is kept)
+    """
+    path = _spool_path(spool_dir, name)
+    hasher = hashlib.sha256()
+    size = 0
+    try:
+        with open(path, 'wb') as out:
+            while True:
+                chunk = stream.read(chunk_size)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadTooLargeError(max_bytes)
+                hasher.update(chunk)
+                out.write(chunk)
+    except BaseException:
+        IngestedUpload(path, size, '').discard()
+        raise
+    return IngestedUpload(path, size, hasher.hexdigest(), filename)
@@ -44,6 +44,7 @@ def main():
         logger.info("  - work_experience")
         logger.info("  - skills")
         logger.info("  - candidate_skills")
+        logger.info("  - jobs")
         logger.info("")
         logger.info("Next steps:")
         logger.info("  1. Start Redis: redis-server")
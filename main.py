@@ -1,21 +1,35 @@
-from fastapi import FastAPI, File, UploadFile, Form, HTTPException, Request
-from fastapi.responses import HTMLResponse, FileResponse
+from fastapi import FastAPI, File, UploadFile, Form, HTTPException, Request, Query
+from fastapi.responses import HTMLResponse, StreamingResponse, JSONResponse
+from starlette.background import BackgroundTask
+from fastapi.encoders import jsonable_encoder
 from datetime import datetime
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 import os
 import uuid
-from typing import List
+from typing import List, Optional, Tuple
 import logging
-import aiofiles
+import json
+import asyncio
+import itertools
 
 from core.config import settings
-from core.cache import SimpleCache
+from core.cache import SimpleCache, TieredCache
+from core.single_flight import SingleFlight
+from core.cache_snapshot import CacheSnapshotter
+from core.executor import PipelineExecutor
+from core.uploads import ingest_upload, IngestedUpload, UploadTooLargeError
+from core.archives import ZipArchiveReader, ArchiveMember, ArchiveError
+from core.jobs import job_store
+from core.admission import admission
 from models.schemas import ResumeAnalysis, JobDescription, AuthenticityScore, MatchingScore
 from services.document_processor import DocumentProcessor
-from services.resume_analyzer import ResumeAuthenticityAnalyzer
+from services.resume_analyzer import ResumeAuthenticityAnalyzer, ANALYZER_VERSION
 from services.jd_matcher import JDMatcher
-from services.result_storage import ResultStorage
+from services.candidate_ranker import CandidateRanker
+from services.vector_index import ResumeVectorIndex
+from services.result_writer import AsyncResultWriter
+from services.result_storage import create_result_storage, iter_csv, parse_fields, CSV_FIELDNAMES
 from services.google_search_verifier import GoogleSearchVerifier
 
 # Configure logging
@@ -48,19 +62,84 @@ else:
 
 # Initialize services
 document_processor = DocumentProcessor()
+# Extracted text and structure by file hash, so a resume re-scanned against another JD is not re-parsed
+extraction_cache = SimpleCache(
+    ttl_minutes=settings.analysis_cache_ttl_minutes,
+    max_bytes=settings.extraction_cache_max_bytes
+)
+verification_cache = SimpleCache(
+    ttl_minutes=settings.verification_cache_ttl_minutes,
+    max_bytes=settings.verification_cache_max_bytes
+)
 resume_analyzer = ResumeAuthenticityAnalyzer(
     google_search_verifier=google_search_verifier,
-    use_selenium=settings.use_selenium_verification
+    use_selenium=settings.use_selenium_verification,
+    verification_cache=verification_cache
+)
+jd_matcher = JDMatcher.from_settings()
+result_storage = create_result_storage(
+    settings.result_storage_backend,
+    settings.results_dir,
+    retention_days=settings.result_retention_days,
+    segment_max_bytes=settings.result_segment_max_bytes
+)
+result_writer = AsyncResultWriter(
+    result_storage,
+    max_batch=settings.result_write_batch_size,
+    max_delay=settings.result_write_max_delay_ms / 1000,
+    wait_for_commit=settings.result_write_ack
+)
+candidate_ranker = CandidateRanker.from_settings(jd_matcher)
+vector_index = ResumeVectorIndex(os.path.join(settings.results_dir, "vector_index"))
+analysis_cache = TieredCache.from_url(
+    SimpleCache(
+        ttl_minutes=settings.analysis_cache_ttl_minutes,
+        max_bytes=settings.analysis_cache_max_bytes
+    ),
+    settings.analysis_cache_redis_url,
+    namespace=f"analysis:{ANALYZER_VERSION}"
+)
+scan_flights = SingleFlight(
+    analysis_cache if settings.scan_coalesce_across_workers else None,
+    lock_seconds=settings.scan_flight_lock_seconds,
+    lease_seconds=settings.scan_flight_lease_seconds,
+    namespace=f"flight:{ANALYZER_VERSION}"
 )
-jd_matcher = JDMatcher()
-result_storage = ResultStorage(settings.results_dir)
-analysis_cache = SimpleCache(ttl_minutes=30)  # Cache results for 30 minutes
+scan_executor = PipelineExecutor(
+    max_workers=settings.scan_worker_threads,
+    max_pending=settings.scan_max_pending,
+    process_workers=settings.scan_process_workers
+)
+cache_snapshotter = None
+if settings.cache_snapshot_path:
+    cache_snapshotter = CacheSnapshotter(
+        settings.cache_snapshot_path,
+        {'analysis': analysis_cache.local, 'extraction': extraction_cache, 'verification': verification_cache},
+        version={'analyzer': ANALYZER_VERSION, 'matcher': jd_matcher.version},
+        interval_seconds=settings.cache_snapshot_interval_seconds
+    )
+    cache_snapshotter.load()
 
 # Create necessary directories
 os.makedirs(settings.upload_dir, exist_ok=True)
 os.makedirs(settings.results_dir, exist_ok=True)
 os.makedirs(settings.temp_dir, exist_ok=True)
 
+@app.on_event("startup")
+async def startup():
+    """Start periodic cache snapshots"""
+    if cache_snapshotter:
+        cache_snapshotter.start()
+
+@app.on_event("shutdown")
+async def shutdown():
+    """Flush queued results and persist storage and cache state before exit"""
+    await result_writer.close()
+    result_storage.close()
+    if cache_snapshotter:
+        await cache_snapshotter.close()
+    scan_executor.shutdown(wait=False)
+
 @app.get("/", response_class=HTMLResponse)
 async def home(request: Request):
     """Main dashboard"""
@@ -71,88 +150,66 @@ async def upload_form(request: Request):
     """Resume upload form"""
     return templates.TemplateResponse("upload.html", {"request": request})
 
-@app.post("/api/scan-resume")
-async def scan_resume(
-    request: Request,
-    file: UploadFile = File(...),
-    job_description: str = Form(None)
-):
-    """Scan resume for authenticity and match with JD"""
+def _match_resume(text_content: str, job_description: Optional[str]):
+    """Extract matching features and match them against the JD, if any (runs on the pipeline pool)"""
+    # Matching features are extracted once and shared by JD matching and the ranking index
+    resume_features = jd_matcher.extract_resume_features(text_content)
+    if not (job_description and isinstance(job_description, str) and job_description.strip()):
+        return resume_features, None
+
+    # Compiled JDs are cached by hash, so repeated scans against the same JD skip re-extraction
+    compiled_jd = jd_matcher.compile_jd(job_description)
+    semantic_score = None
+    if jd_matcher.semantic_weight > 0:
+        semantic_score = vector_index.similarity(text_content, job_description)
+    return resume_features, jd_matcher.match_compiled(resume_features, compiled_jd, semantic_score)
+
+def _index_resume(file_id: str, filename: str, status: str, resume_features, text_content: str):
+    """Add a scanned resume to the ranking and search indexes (runs on the pipeline pool)"""
+    # Make the resume available to /api/rank
     try:
-        # Validate file exists and has content
-        if not file or not file.filename:
-            raise HTTPException(
-                status_code=400,
-                detail="No file provided. Please select a file to upload."
-            )
-
-        # Validate file extension
-        if not file.filename.lower().endswith(tuple(settings.allowed_extensions)):
-            raise HTTPException(
-                status_code=400,
-                detail=f"File type '{os.path.splitext(file.filename)[1]}' not allowed. Supported formats: {', '.join(settings.allowed_extensions)}"
-            )
-
-        # Read file content and validate size
-        content = await file.read()
-        file_size = len(content)
-        
-        if file_size == 0:
-            raise HTTPException(
-                status_code=400,
-                detail="File is empty. Please upload a valid document."
-            )
-        
-        if file_size > settings.max_file_size:
-            max_size_mb = settings.max_file_size / (1024 * 1024)
-            actual_size_mb = file_size / (1024 * 1024)
-            raise HTTPException(
-                status_code=400,
-                detail=f"File size ({actual_size_mb:.1f}MB) exceeds maximum allowed size ({max_size_mb:.0f}MB)."
-            )
-
-        # Check cache for existing analysis
-        jd_text = job_description if job_description and isinstance(job_description, str) else None
-        cached_result = analysis_cache.get(content, jd_text)
-        if cached_result:
-            logger.info(f"Returning cached result for {file.filename}")
-            return ResumeAnalysis(**cached_result)
-
-        # Generate unique filename
-        file_id = str(uuid.uuid4())
-        file_extension = os.path.splitext(file.filename)[1]
-        safe_filename = f"{file_id}{file_extension}"
-        file_path = os.path.join(settings.upload_dir, safe_filename)
+        candidate_ranker.add_candidate(file_id, features=resume_features, filename=filename, status=status)
+    except Exception as e:
+        logger.warning(f"Failed to index resume for ranking: {str(e)}")
 
-        # Save uploaded file
-        try:
-            async with aiofiles.open(file_path, 'wb') as f:
-                await f.write(content)
-        except Exception as e:
-            logger.error(f"Error saving file: {str(e)}")
-            raise HTTPException(
-                status_code=500,
-                detail="Failed to save uploaded file. Please try again."
-            )
+    try:
+        vector_index.add(file_id, text_content)
+    except Exception as e:
+        logger.warning(f"Failed to add resume to vector index: {str(e)}")
 
-        # Process document
+async def _analyze_upload(upload: IngestedUpload, file_id: str, job_description: Optional[str],
+                          cache_key: str) -> dict:
+    """Run the full analysis pipeline for an ingested resume and return the analysis as a dict"""
+    filename = upload.filename
+    file_path = upload.path
+    try:
+        # Process document (or reuse an earlier extraction of the same file)
+        extraction_key = f"{upload.sha256}{os.path.splitext(filename)[1].lower()}"
+        extracted = extraction_cache.get_key(extraction_key)
         try:
-            text_content = document_processor.extract_text(file_path)
-            
-            # Check if text extraction was successful
-            if not text_content or "Error processing document" in text_content:
-                raise HTTPException(
-                    status_code=400,
-                    detail="Unable to extract text from document. The file may be corrupted or password-protected."
-                )
-            
-            if "not available" in text_content.lower():
-                raise HTTPException(
-                    status_code=500,
-                    detail="Document processing libraries not available. Please contact support."
-                )
+            if extracted is not None:
+                text_content, structure_info = extracted['text'], extracted['structure']
+            else:
+                # Parsing (and OCR) runs on the pipeline pools, never on the event loop
+                async with admission.stage('parse'):
+                    text_content, structure_info = await scan_executor.run(
+                        document_processor.extract, file_path, cpu_bound=True
+                    )
                 
-            structure_info = document_processor.analyze_document_structure(file_path)
+                # Check if text extraction was successful
+                if not text_content or "Error processing document" in text_content:
+                    raise HTTPException(
+                        status_code=400,
+                        detail="Unable to extract text from document. The file may be corrupted or password-protected."
+                    )
+                
+                if "not available" in text_content.lower():
+                    raise HTTPException(
+                        status_code=500,
+                        detail="Document processing libraries not available. Please contact support."
+                    )
+                    
+                extraction_cache.set_key(extraction_key, {'text': text_content, 'structure': structure_info})
             
         except HTTPException:
             # Re-raise HTTP exceptions
@@ -165,7 +222,9 @@ async def scan_resume(
             )
 
         # Analyze resume authenticity using real criteria
-        authenticity_analysis = resume_analyzer.analyze_authenticity(text_content, structure_info)
+        authenticity_analysis = await scan_executor.run(
+            resume_analyzer.analyze_authenticity, text_content, structure_info
+        )
 
         authenticity_score = AuthenticityScore(
             overall_score=authenticity_analysis['overall_score'],
@@ -180,10 +239,12 @@ async def scan_resume(
             diagnostics=authenticity_analysis.get('diagnostics', {})
         )
 
+        async with admission.stage('matching'):
+            resume_features, match_result = await scan_executor.run(_match_resume, text_content, job_description)
+
         # Implement JD matching if provided
         matching_score = None
-        if job_description and isinstance(job_description, str) and job_description.strip():
-            match_result = jd_matcher.match_resume_with_jd(text_content, job_description)
+        if match_result is not None:
             matching_score = MatchingScore(
                 overall_match=match_result['overall_match'],
                 skills_match=match_result['skills_match'],
@@ -197,26 +258,176 @@ async def scan_resume(
         # Create analysis result
         analysis = ResumeAnalysis(
             id=file_id,
-            filename=file.filename,
-            file_size=len(content),
+            filename=filename,
+            file_size=upload.size,
+            content_hash=upload.sha256,
             authenticity_score=authenticity_score,
             matching_score=matching_score
         )
 
-        # Save result to storage
+        # Queue the result for the background writer
         try:
-            result_storage.save_result(analysis.dict())
+            if not await result_writer.submit(analysis.dict()):
+                logger.warning(f"Result for {filename} was not saved")
         except Exception as e:
             logger.warning(f"Failed to save result to storage: {str(e)}")
             # Don't fail the request if storage fails
 
+        await scan_executor.run(
+            _index_resume, file_id, filename, analysis.status.value, resume_features, text_content
+        )
+
         # Cache the result for future requests
         try:
-            analysis_cache.set(content, analysis.dict(), jd_text)
+            await analysis_cache.aset_key(cache_key, analysis.dict())
         except Exception as e:
             logger.warning(f"Failed to cache result: {str(e)}")
 
-        return analysis
+        return analysis.dict()
+
+    finally:
+        # Clean up uploaded file if processing failed
+        if os.path.exists(file_path):
+            try:
+                # Keep successful uploads, only delete on error
+                if 'analysis' not in locals():
+                    os.remove(file_path)
+                    logger.info(f"Cleaned up failed upload: {file_path}")
+            except Exception as cleanup_error:
+                logger.warning(f"Failed to clean up file {file_path}: {str(cleanup_error)}")
+
+async def _analyze_admitted(upload: IngestedUpload, file_id: str, job_description: Optional[str],
+                            cache_key: str) -> dict:
+    """Analyze an upload while holding a scan slot, so every scan path counts against admission_max_scans"""
+    async with admission.scans.hold_async():
+        return await _analyze_upload(upload, file_id, job_description, cache_key)
+
+async def _scan_ingested(upload: IngestedUpload, file_id: str, job_description: Optional[str]) -> ResumeAnalysis:
+    """Scan an upload already spooled to disk, reusing cached or in-flight analyses of the same content"""
+    # Check cache for existing analysis
+    jd_text = job_description if job_description and isinstance(job_description, str) else None
+    # Matches are keyed by the matcher version too, so a taxonomy reload is not answered from stale entries
+    cache_key = analysis_cache.key_for_digest(upload.sha256, jd_text, jd_matcher.version)
+    cached_result = await analysis_cache.aget_key(cache_key)
+    if cached_result:
+        logger.info(f"Returning cached result for {upload.filename}")
+        upload.discard()
+        return ResumeAnalysis(**cached_result)
+
+    # Identical uploads (same content and JD) in flight at once share one analysis
+    result = None
+    try:
+        result = await scan_flights.run(
+            cache_key,
+            lambda: _analyze_admitted(upload, file_id, job_description, cache_key)
+        )
+    finally:
+        # Only the copy belonging to the stored result is kept
+        if result is None or result.get('id') != file_id:
+            upload.discard()
+    return ResumeAnalysis(**result)
+
+async def _receive_upload(file: UploadFile) -> Tuple[IngestedUpload, str]:
+    """Validate an uploaded resume and spool it to disk; returns the upload and its file ID"""
+    # Validate file exists and has content
+    if not file or not file.filename:
+        raise HTTPException(
+            status_code=400,
+            detail="No file provided. Please select a file to upload."
+        )
+
+    # Validate file extension
+    if not file.filename.lower().endswith(tuple(settings.allowed_extensions)):
+        raise HTTPException(
+            status_code=400,
+            detail=f"File type '{os.path.splitext(file.filename)[1]}' not allowed. Supported formats: {', '.join(settings.allowed_extensions)}"
+        )
+
+    # Stream the upload to its final location, hashing as it goes; reading
+    # stops as soon as the size limit is crossed
+    file_id = str(uuid.uuid4())
+    try:
+        upload = await ingest_upload(
+            file, settings.upload_dir, settings.max_file_size,
+            name=f"{file_id}{os.path.splitext(file.filename)[1]}"
+        )
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error saving file: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail="Failed to save uploaded file. Please try again."
+        )
+
+    if upload.size == 0:
+        upload.discard()
+        raise HTTPException(
+            status_code=400,
+            detail="File is empty. Please upload a valid document."
+        )
+    return upload, file_id
+
+def _job_accepted(job: dict, task: BackgroundTask) -> JSONResponse:
+    """202 response pointing at the job's status and event stream; task runs after it is sent"""
+    job_id = job['job_id']
+    return JSONResponse(
+        status_code=202,
+        content={
+            "job_id": job_id,
+            "status": job['status'],
+            "status_url": f"/api/jobs/{job_id}",
+            "events_url": f"/api/jobs/{job_id}/events"
+        },
+        headers={"Location": f"/api/jobs/{job_id}"},
+        background=task
+    )
+
+async def _run_scan_job(job_id: str, upload: IngestedUpload, file_id: str, job_description: Optional[str]):
+    """Scan a resume for a background job, recording the outcome in the job store"""
+    await job_store.aupdate(job_id, status='processing')
+    try:
+        result = await _scan_ingested(upload, file_id, job_description)
+        await job_store.aupdate(job_id, status='completed', result=jsonable_encoder(result))
+    except HTTPException as e:
+        await job_store.aupdate(job_id, status='failed', error=e.detail)
+    except Exception as e:
+        logger.error(f"Scan job {job_id} failed: {str(e)}")
+        await job_store.aupdate(job_id, status='failed', error="An unexpected error occurred while processing the resume.")
+
+@app.post("/api/scan-resume")
+async def scan_resume(
+    request: Request,
+    file: UploadFile = File(...),
+    job_description: str = Form(None),
+    background: bool = Form(False)
+):
+    """
+    Scan resume for authenticity and match with JD
+
+    With background=true the upload is validated and stored, and the
+    response is 202 with a job ID; the scan runs after the response and
+    its result is read from /api/jobs/{job_id} (or its event stream).
+
+    When the pipeline is saturated the scan is refused with 429 (too many
+    scans waiting) or 503 (a pipeline stage is backed up) and a
+    Retry-After header.
+    """
+    try:
+        # Refuse before hashing and analysing the upload when the pipeline is saturated
+        # (FastAPI has already spooled the multipart body by this point)
+        admission.check()
+        upload, file_id = await _receive_upload(file)
+
+        if background:
+            job = await job_store.acreate(kind='scan', file_name=file.filename)
+            return _job_accepted(job, BackgroundTask(_run_scan_job, job['job_id'], upload, file_id, job_description))
+
+        try:
+            return await _scan_ingested(upload, file_id, job_description)
+        except HTTPException:
+            upload.discard()
+            raise
 
     except HTTPException:
         # Re-raise HTTP exceptions with their original status codes
@@ -227,23 +438,101 @@ async def scan_resume(
             status_code=500,
             detail="An unexpected error occurred while processing your resume. Please try again or contact support."
         )
+
+async def _scan_batch_file(index: int, file: UploadFile, job_description: Optional[str],
+                           slots: asyncio.Semaphore) -> dict:
+    """Scan one file of a batch once a concurrency slot is free; errors become part of the item"""
+    async with slots:
+        try:
+            upload, file_id = await _receive_upload(file)
+            result = await _scan_ingested(upload, file_id, job_description)
+            return {"index": index, "filename": file.filename, "success": True, "result": jsonable_encoder(result)}
+        except HTTPException as e:
+            return {"index": index, "filename": file.filename, "success": False, "error": f"{file.filename}: {e.detail}"}
+        except Exception as e:
+            return {"index": index, "filename": file.filename, "success": False,
+                    "error": f"{file.filename}: Unexpected error - {str(e)}"}
+
+async def _iter_completed(coroutines):
+    """Run coroutines concurrently and yield their results in completion order"""
+    tasks = [asyncio.ensure_future(coroutine) for coroutine in coroutines]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
     finally:
-        # Clean up uploaded file if processing failed
-        if 'file_path' in locals() and os.path.exists(file_path):
+        # Client went away: stop work that has not finished
+        for task in tasks:
+            task.cancel()
+
+def _progress_response(request: Request, items, summarize) -> StreamingResponse:
+    """
+    Stream items as NDJSON (or server-sent events when the client accepts
+    text/event-stream) as they arrive, followed by summarize(items)
+    """
+    sse = "text/event-stream" in request.headers.get("accept", "")
+
+    async def generate():
+        seen = []
+        async for item in items:
+            seen.append(item)
+            line = json.dumps(item)
+            yield f"event: result\ndata: {line}\n\n" if sse else line + "\n"
+        summary = json.dumps({"done": True, **summarize(seen)})
+        yield f"event: done\ndata: {summary}\n\n" if sse else summary + "\n"
+
+    return StreamingResponse(generate(), media_type="text/event-stream" if sse else "application/x-ndjson")
+
+async def _run_batch_job(job_id: str, received: List[Tuple[IngestedUpload, str]], errors: List[str],
+                         job_description: Optional[str]):
+    """Scan the files of a background batch job, recording progress and the outcome in the job store"""
+    await job_store.aupdate(job_id, status='processing')
+    slots = asyncio.Semaphore(max(settings.batch_scan_concurrency, 1))
+    errors = list(errors)
+    results = []
+
+    async def scan(index: int, upload: IngestedUpload, file_id: str):
+        async with slots:
             try:
-                # Keep successful uploads, only delete on error
-                if 'analysis' not in locals():
-                    os.remove(file_path)
-                    logger.info(f"Cleaned up failed upload: {file_path}")
-            except Exception as cleanup_error:
-                logger.warning(f"Failed to clean up file {file_path}: {str(cleanup_error)}")
+                return index, jsonable_encoder(await _scan_ingested(upload, file_id, job_description)), None
+            except HTTPException as e:
+                return index, None, f"{upload.filename}: {e.detail}"
+            except Exception as e:
+                return index, None, f"{upload.filename}: Unexpected error - {str(e)}"
+
+    async for index, result, error in _iter_completed(
+        scan(i, upload, file_id) for i, (upload, file_id) in enumerate(received)
+    ):
+        if error:
+            errors.append(error)
+        else:
+            results.append((index, result))
+        await job_store.aupdate(job_id, completed=len(results) + len(errors), successful=len(results), failed=len(errors))
+
+    await job_store.aupdate(job_id, status='completed', result={
+        "total_processed": len(results) + len(errors),
+        "successful": len(results),
+        "failed": len(errors),
+        "results": [result for _, result in sorted(results, key=lambda pair: pair[0])],
+        "errors": errors
+    })
 
 @app.post("/api/batch-scan")
 async def batch_scan_resumes(
     request: Request,
-    files: List[UploadFile] = File(...)
+    files: List[UploadFile] = File(...),
+    job_description: str = Form(None),
+    stream: bool = Form(False),
+    background: bool = Form(False)
 ):
-    """Batch scan multiple resumes with async processing"""
+    """
+    Batch scan resumes with bounded concurrency
+
+    With stream=true each file's result is sent as soon as it completes, as
+    NDJSON (or as server-sent events when the client accepts
+    text/event-stream), followed by a summary line. With background=true
+    the files are validated and stored, and the response is 202 with a job
+    ID whose progress and results are read from /api/jobs/{job_id}.
+    """
     try:
         # Validate batch upload
         if not files or len(files) == 0:
@@ -253,40 +542,49 @@ async def batch_scan_resumes(
             )
         
         # Limit batch size
-        max_batch_size = 10
+        max_batch_size = settings.batch_max_files
         if len(files) > max_batch_size:
             raise HTTPException(
                 status_code=400,
                 detail=f"Too many files. Maximum {max_batch_size} files allowed per batch."
             )
 
-        results = []
-        errors = []
+        # Compile the JD once up front; every file in the batch reuses it
+        if job_description and isinstance(job_description, str) and job_description.strip():
+            await scan_executor.run(jd_matcher.compile_jd, job_description)
+        else:
+            job_description = None
+
+        # The batch as a whole is refused when the pipeline is saturated; each
+        # of its files then takes a scan slot and shares the stage limits
+        admission.check()
+
+        if background:
+            received, errors = [], []
+            for file in files:
+                try:
+                    received.append(await _receive_upload(file))
+                except HTTPException as e:
+                    errors.append(f"{file.filename}: {e.detail}")
+            job = await job_store.acreate(kind='batch', total=len(files), completed=len(errors),
+                                   successful=0, failed=len(errors))
+            return _job_accepted(job, BackgroundTask(_run_batch_job, job['job_id'], received, errors, job_description))
+
+        slots = asyncio.Semaphore(max(settings.batch_scan_concurrency, 1))
+        items = _iter_completed(
+            _scan_batch_file(i, file, job_description, slots) for i, file in enumerate(files)
+        )
+
+        if stream:
+            def summarize(done):
+                successful = sum(1 for item in done if item["success"])
+                return {"total_processed": len(files), "successful": successful, "failed": len(files) - successful}
 
-        # Process files concurrently for better performance
-        import asyncio
-        
-        async def process_single_file(file: UploadFile):
-            try:
-                result = await scan_resume(request, file, job_description=None)
-                return {"success": True, "result": result}
-            except HTTPException as e:
-                return {"success": False, "error": f"{file.filename}: {e.detail}"}
-            except Exception as e:
-                return {"success": False, "error": f"{file.filename}: Unexpected error - {str(e)}"}
-
-        # Process all files concurrently
-        tasks = [process_single_file(file) for file in files]
-        processed_results = await asyncio.gather(*tasks, return_exceptions=True)
-
-        # Separate successful results from errors
-        for result in processed_results:
-            if isinstance(result, Exception):
-                errors.append(f"Processing error: {str(result)}")
-            elif result.get("success"):
-                results.append(result["result"])
-            else:
-                errors.append(result.get("error", "Unknown error"))
+            return _progress_response(request, items, summarize)
+
+        items = sorted([item async for item in items], key=lambda item: item["index"])
+        results = [item["result"] for item in items if item["success"]]
+        errors = [item["error"] for item in items if not item["success"]]
 
         return {
             "total_processed": len(files),
@@ -305,6 +603,194 @@ async def batch_scan_resumes(
             detail="An error occurred during batch processing. Please try again."
         )
 
+@app.get("/api/jobs/{job_id}")
+async def get_job(job_id: str):
+    """Status (and, once completed, result) of a background scan job"""
+    job = await job_store.aget(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+@app.get("/api/jobs/{job_id}/events")
+async def job_events(job_id: str):
+    """Server-sent events with the job each time it changes, ending when it completes or fails"""
+    if await job_store.aget(job_id) is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    async def generate():
+        async for job in job_store.watch(job_id):
+            yield f"event: {job['status']}\ndata: {json.dumps(job, default=str)}\n\n"
+
+    return StreamingResponse(generate(), media_type="text/event-stream")
+
+async def _scan_archive_member(reader: ZipArchiveReader, member: ArchiveMember, job_description: Optional[str],
+                              seen: dict, slots: asyncio.Semaphore) -> dict:
+    """Ingest and scan one archive member; skips, duplicates and errors become part of the item"""
+    item = {"index": member.index, "member": member.name}
+    if member.skip_reason:
+        return {**item, "status": "skipped", "reason": member.skip_reason}
+
+    async with slots:
+        file_id = str(uuid.uuid4())
+        try:
+            upload = await scan_executor.run(
+                reader.ingest, member, settings.upload_dir, f"{file_id}{os.path.splitext(member.filename)[1]}"
+            )
+        except (UploadTooLargeError, ArchiveError) as e:
+            return {**item, "status": "failed", "error": str(e)}
+        if upload.size == 0:
+            upload.discard()
+            return {**item, "status": "skipped", "reason": "empty file"}
+
+        # The first member with given content is scanned; identical ones are reported against it
+        first = seen.setdefault(upload.sha256, member.index)
+        if first != member.index:
+            upload.discard()
+            return {**item, "status": "duplicate", "duplicate_of": first}
+
+        try:
+            result = await _scan_ingested(upload, file_id, job_description)
+            return {**item, "status": "scanned", "result": jsonable_encoder(result)}
+        except HTTPException as e:
+            return {**item, "status": "failed", "error": e.detail}
+        except Exception as e:
+            logger.error(f"Error scanning archive member {member.name}: {str(e)}")
+            return {**item, "status": "failed", "error": f"Unexpected error - {str(e)}"}
+
+@app.post("/api/scan-archive")
+async def scan_archive(
+    request: Request,
+    file: UploadFile = File(...),
+    job_description: str = Form(None),
+    stream: bool = Form(True)
+):
+    """
+    Scan every resume in a ZIP archive
+
+    Members are decompressed one at a time straight into the scan pipeline
+    (BATCH_SCAN_CONCURRENCY at once). Progress is streamed per member as
+    NDJSON or server-sent events: scanned, duplicate (same content as an
+    earlier member), skipped (not a resume, or refused by the zip-bomb
+    limits) or failed.
+    """
+    try:
+        if not file or not file.filename or not file.filename.lower().endswith('.zip'):
+            raise HTTPException(status_code=400, detail="Please upload a .zip archive.")
+
+        # The multipart parser has already spooled the archive; check its size before opening it
+        file.file.seek(0, os.SEEK_END)
+        if file.file.tell() > settings.archive_max_bytes:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Archive exceeds maximum allowed size ({settings.archive_max_bytes / (1024 * 1024):.0f}MB)."
+            )
+        file.file.seek(0)
+
+        if job_description and isinstance(job_description, str) and job_description.strip():
+            await scan_executor.run(jd_matcher.compile_jd, job_description)
+        else:
+            job_description = None
+
+        admission.check()
+
+        try:
+            reader = ZipArchiveReader(
+                file.file, settings.allowed_extensions,
+                max_member_bytes=settings.max_file_size,
+                max_total_bytes=settings.archive_max_total_bytes,
+                max_ratio=settings.archive_max_ratio,
+                max_members=settings.archive_max_members
+            )
+        except ArchiveError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+        seen = {}
+        slots = asyncio.Semaphore(max(settings.batch_scan_concurrency, 1))
+
+        async def items():
+            try:
+                async for item in _iter_completed(
+                    _scan_archive_member(reader, member, job_description, seen, slots) for member in reader.members
+                ):
+                    yield item
+            finally:
+                reader.close()
+
+        def summarize(done):
+            counts = {"members": len(reader.members), "scanned": 0, "duplicate": 0, "skipped": 0, "failed": 0}
+            for item in done:
+                counts[item["status"]] += 1
+            return counts
+
+        if stream:
+            return _progress_response(request, items(), summarize)
+
+        done = sorted([item async for item in items()], key=lambda item: item["index"])
+        return {**summarize(done), "items": done}
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error scanning archive: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail="An error occurred while scanning the archive. Please try again."
+        )
+
+@app.post("/api/rank")
+async def rank_candidates(
+    job_description: str = Form(...),
+    limit: int = Form(20, ge=1, le=500),
+    offset: int = Form(0, ge=0),
+    status: str = Form(None),
+    stream: bool = Form(False)
+):
+    """Rank every indexed resume against a job description"""
+    try:
+        if not job_description.strip():
+            raise HTTPException(status_code=400, detail="Job description is required")
+
+        statuses = [s.strip() for s in status.split(',') if s.strip()] if status else None
+        # Compiling and scoring the whole pool is CPU work; keep it off the event loop
+        compiled_jd = await scan_executor.run(jd_matcher.compile_jd, job_description)
+
+        if stream:
+            def generate():
+                for row in candidate_ranker.iter_ranked(compiled_jd, limit=limit, offset=offset, statuses=statuses):
+                    yield json.dumps(row) + "\n"
+
+            return StreamingResponse(generate(), media_type="application/x-ndjson")
+
+        return await scan_executor.run(
+            candidate_ranker.rank, compiled_jd, limit=limit, offset=offset, statuses=statuses
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error ranking candidates: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to rank candidates")
+
+@app.post("/api/search")
+async def search_resumes(
+    query: str = Form(...),
+    top_k: int = Form(10)
+):
+    """Free-text relevance search over scanned resumes (TF-IDF cosine)"""
+    try:
+        if not query.strip():
+            raise HTTPException(status_code=400, detail="Query is required")
+        # The index takes file locks and reads its memmaps; keep that off the event loop
+        results = await scan_executor.run(vector_index.search, query, top_k=max(1, min(top_k, 500)))
+        return {
+            "total": len(results),
+            "results": results
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error searching resumes: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to search resumes")
+
 @app.get("/api/health")
 async def health_check():
     """Health check endpoint"""
@@ -315,14 +801,27 @@ async def health_check():
     }
 
 @app.get("/api/results")
-async def get_all_results(limit: int = 50):
-    """Get all stored analysis results"""
+async def get_all_results(limit: int = Query(50, ge=1, le=1000), cursor: Optional[str] = None,
+                          fields: Optional[str] = None):
+    """
+    Get stored analysis results, most recent first
+
+    Pass `next_cursor` from a response as `cursor` to get the next page.
+    `fields` is a comma-separated list of (dotted) fields to return, or
+    `summary` for list rows without the diagnostic payloads.
+    """
     try:
-        results = result_storage.get_all_results(limit=limit)
+        await result_writer.flush()  # Read this process's queued writes
+        results, next_cursor = result_storage.get_results_page(
+            limit=limit, cursor=cursor, fields=parse_fields(fields)
+        )
         return {
             "total": len(results),
-            "results": results
+            "results": results,
+            "next_cursor": next_cursor
         }
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error retrieving results: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to retrieve results")
@@ -331,6 +830,7 @@ async def get_all_results(limit: int = 50):
 async def get_result_by_id(result_id: str):
     """Get a specific analysis result by ID"""
     try:
+        await result_writer.flush()  # Read this process's queued writes
         result = result_storage.get_result_by_id(result_id)
         if not result:
             raise HTTPException(status_code=404, detail="Result not found")
@@ -345,6 +845,7 @@ async def get_result_by_id(result_id: str):
 async def delete_result(result_id: str):
     """Delete a specific analysis result"""
     try:
+        await result_writer.flush()  # Read this process's queued writes
         success = result_storage.delete_result(result_id)
         if not success:
             raise HTTPException(status_code=404, detail="Result not found")
@@ -359,38 +860,68 @@ async def delete_result(result_id: str):
 async def get_statistics():
     """Get statistics about stored results and cache"""
     try:
+        await result_writer.flush()  # Read this process's queued writes
         storage_stats = result_storage.get_statistics()
         cache_stats = analysis_cache.get_stats()
         
         return {
             **storage_stats,
-            'cache': cache_stats
+            'cache': cache_stats,
+            'extraction_cache': extraction_cache.get_stats(),
+            'verification_cache': verification_cache.get_stats(),
+            'coalescing': scan_flights.get_stats(),
+            'pipeline': scan_executor.get_stats(),
+            'admission': admission.get_stats(),
+            'jobs': job_store.get_stats(),
+            'writer': result_writer.get_stats()
         }
     except Exception as e:
         logger.error(f"Error calculating statistics: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to calculate statistics")
 
 @app.get("/api/export/csv")
-async def export_results_csv():
-    """Export results to CSV file"""
+async def export_results_csv(
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    min_score: Optional[float] = None,
+    max_score: Optional[float] = None,
+    min_match: Optional[float] = None,
+    has_jd: Optional[bool] = None,
+    columns: Optional[str] = None,
+    gzip: bool = False
+):
+    """
+    Stream results as CSV
+
+    Filters on upload date (ISO date or timestamp, inclusive), authenticity
+    score, JD match score and whether a JD was matched. `columns` is a
+    comma-separated subset of the CSV columns; `gzip=true` compresses the stream.
+    """
     try:
-        import tempfile
-        from fastapi.responses import FileResponse
-        
-        # Create temporary file
-        temp_file = tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.csv')
-        temp_path = temp_file.name
-        temp_file.close()
-        
-        # Export to CSV
-        success = result_storage.export_to_csv(temp_path)
-        if not success:
+        selected = [c.strip() for c in columns.split(',') if c.strip()] if columns else CSV_FIELDNAMES
+        unknown = [c for c in selected if c not in CSV_FIELDNAMES]
+        if unknown:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown columns: {', '.join(unknown)}. Available: {', '.join(CSV_FIELDNAMES)}"
+            )
+
+        await result_writer.flush()  # Read this process's queued writes
+        results = result_storage.iter_results(
+            start_date=start_date, end_date=end_date, min_score=min_score,
+            max_score=max_score, min_match=min_match, has_jd=has_jd
+        )
+        first = next(results, None)
+        if first is None:
             raise HTTPException(status_code=404, detail="No results to export")
-        
-        return FileResponse(
-            temp_path,
-            media_type='text/csv',
-            filename=f'resume_analysis_results_{datetime.utcnow().strftime("%Y%m%d_%H%M%S")}.csv'
+
+        filename = f'resume_analysis_results_{datetime.utcnow().strftime("%Y%m%d_%H%M%S")}.csv'
+        if gzip:
+            filename += '.gz'
+        return StreamingResponse(
+            iter_csv(itertools.chain([first], results), selected, compress=gzip),
+            media_type='application/gzip' if gzip else 'text/csv',
+            headers={'Content-Disposition': f'attachment; filename="{filename}"'}
         )
     except HTTPException:
         raise
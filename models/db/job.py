@@ -0,0 +1,18 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, func
+from core.database import Base
+
+class Job(Base):
+    """
+    Job model - stores job descriptions that resumes are auto-matched against
+    """
+    __tablename__ = "jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    title = Column(String(255), nullable=False)
+    description = Column(Text, nullable=False)
+    status = Column(String(20), nullable=False, default="open", index=True)  # open, closed
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), index=True)
+
+    def __repr__(self):
+        return f"<Job(id={self.id}, title='{self.title}', status='{self.status}')>"
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, JSON, func
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, JSON, Float, func
 from sqlalchemy.orm import relationship
 from core.database import Base
 
@@ -16,6 +16,7 @@ class Resume(Base):
     upload_status = Column(String(20), nullable=False, default="pending", index=True)  # pending, processing, completed, failed
     raw_text = Column(Text, nullable=True)
     extracted_data = Column(JSON, nullable=True)  # Store extracted structured data as JSON
+    experience_years = Column(Float, nullable=True, index=True)  # Materialized from the experience timeline
     
     # Authenticity Analysis Results
     authenticity_score = Column(Integer, nullable=True)  # Overall score 0-100
@@ -0,0 +1,31 @@
+from pydantic import BaseModel
+from typing import List, Optional
+from datetime import datetime
+
+class JobCreate(BaseModel):
+    title: str
+    description: str
+
+class JobUpdate(BaseModel):
+    title: Optional[str] = None
+    description: Optional[str] = None
+    status: Optional[str] = None
+
+class JobResponse(JobCreate):
+    id: int
+    status: str
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+class JobMatch(BaseModel):
+    job_id: int
+    title: str
+    overall_match: float
+    skills_match: float
+    experience_match: float
+    education_match: float
+    matched_skills: List[str] = []
+    missing_skills: List[str] = []
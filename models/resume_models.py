@@ -6,6 +6,12 @@ class ResumeUploadResponse(BaseModel):
     file_name: str
     status: str
 
+class ArchiveMemberResponse(BaseModel):
+    job_id: Optional[str] = None
+    file_name: str
+    status: str
+    error: Optional[str] = None
+
 class CandidateCreate(BaseModel):
     full_name: str
     email: str
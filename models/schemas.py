@@ -41,6 +41,7 @@ class ResumeAnalysis(BaseModel):
     id: Optional[str] = None
     filename: str
     file_size: int
+    content_hash: Optional[str] = None  # SHA-256 of the uploaded file
     upload_date: datetime = Field(default_factory=datetime.utcnow)
 
     # Extracted information
@@ -0,0 +1,520 @@
+import os
+import json
+import logging
+import tempfile
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, List, Any, Optional, Iterable, Iterator
+
+import numpy as np
+
+from core.config import settings
+from services.jd_matcher import JDMatcher, CompiledJD, ResumeFeatures, _iter_bits
+
+logger = logging.getLogger(__name__)
+
+try:
+    import fcntl
+except ImportError:  # Windows: single-process locking only
+    fcntl = None
+
+# The index file is compacted once it holds at least this many entries ...
+INDEX_COMPACT_MIN_ENTRIES = 1000
+# ... and this share of them are superseded by later entries for the same candidate
+INDEX_COMPACT_RATIO = 0.5
+
+
+class CandidateRanker:
+    """
+    Ranks every indexed resume against a compiled job description.
+
+    Resume features (skill and education bitmaps, years of experience) are kept
+    in dense numpy arrays so a JD is scored against the whole pool in a few
+    vectorized operations. Only the top-K rows are re-scored with
+    JDMatcher.match_compiled to produce the detailed result.
+
+    Candidates carry two independent statuses: the hiring status (new,
+    screened, ...) and, for resumes loaded from the database, the upload
+    processing status (pending, completed, ...); each has its own filter.
+    The index file is append-only and compacted to the latest entry per
+    candidate once enough of it is superseded. Workers sharing the file
+    read its new tail before each ranking, so candidates indexed by other
+    processes are ranked too.
+    """
+
+    def __init__(self, jd_matcher: JDMatcher, index_path: Optional[str] = None, initial_capacity: int = 1024):
+        """
+        Initialize ranker
+
+        Args:
+            jd_matcher: Matcher whose vocabulary and scoring rules are used
+            index_path: Optional JSONL file the indexed features are persisted to
+            initial_capacity: Initial number of rows allocated
+        """
+        self.jd_matcher = jd_matcher
+        self.index_path = index_path
+        self._lock = threading.RLock()
+
+        self._ids: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._meta: List[Dict[str, Any]] = []
+        self._features: List[ResumeFeatures] = []
+        self._db_watermark = None  # (processed_at, id) of the last database row indexed
+        self._file_entries = 0
+        self._file_inode = None  # Identity of the index file read so far (compaction replaces it)
+        self._file_offset = 0  # Bytes of the index file already applied
+        self._vocabulary = jd_matcher.vocabulary
+        self._allocate(max(initial_capacity, 1))
+
+        if index_path:
+            self._load_index()
+
+    @classmethod
+    def from_settings(cls, jd_matcher: JDMatcher, config=settings) -> "CandidateRanker":
+        """Ranker on the shared index file in the results directory"""
+        return cls(jd_matcher, index_path=os.path.join(config.results_dir, "candidate_index.jsonl"))
+
+    def _allocate(self, capacity: int):
+        """Allocate empty feature arrays"""
+        self._skills = np.zeros((capacity, len(self.jd_matcher.skill_vocabulary)), dtype=bool)
+        self._education = np.zeros((capacity, len(self.jd_matcher.education_keywords)), dtype=bool)
+        self._skill_counts = np.zeros(capacity, dtype=np.int32)
+        self._education_counts = np.zeros(capacity, dtype=np.int32)
+        self._degree_levels = np.zeros(capacity, dtype=np.int8)
+        self._years = np.full(capacity, np.nan, dtype=np.float32)
+        self._statuses = np.empty(capacity, dtype=object)
+        self._upload_statuses = np.empty(capacity, dtype=object)
+
+    def _sync_vocabulary(self):
+        """Rebuild the feature arrays if the skill taxonomy was reloaded"""
+        vocabulary = self.jd_matcher.vocabulary
+        if vocabulary is self._vocabulary:
+            return
+        self._vocabulary = vocabulary
+        self._allocate(max(self._skills.shape[0], 1))
+        for row, features in enumerate(self._features):
+            self._fill_row(row, self.jd_matcher.remap_features(features), self._meta[row].get('status'),
+                           self._meta[row].get('upload_status'))
+        logger.info(f"Ranking index rebuilt for skill taxonomy {vocabulary.version}")
+
+    def _grow(self):
+        """Double the capacity of the feature arrays"""
+        size = len(self._ids)
+        old = (self._skills, self._education, self._skill_counts, self._education_counts,
+               self._degree_levels, self._years, self._statuses, self._upload_statuses)
+        self._allocate(self._skills.shape[0] * 2)
+        new = (self._skills, self._education, self._skill_counts, self._education_counts,
+               self._degree_levels, self._years, self._statuses, self._upload_statuses)
+        for old_array, new_array in zip(old, new):
+            new_array[:size] = old_array[:size]
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def add_candidate(self, candidate_id: str, text: Optional[str] = None,
+                      features: Optional[ResumeFeatures] = None,
+                      filename: Optional[str] = None, status: str = "new",
+                      upload_status: Optional[str] = None, persist: bool = True):
+        """
+        Add or replace a resume in the index
+
+        Args:
+            candidate_id: Stable identifier (analysis ID or resume ID)
+            text: Resume text, used when features are not supplied
+            features: Previously extracted ResumeFeatures
+            filename: Original file name, returned with ranking results
+            status: Hiring status (ResumeStatus value) used for filtering
+            upload_status: Upload processing status of a stored resume (pending, completed, ...)
+            persist: Append the entry to the index file
+        """
+        if features is None:
+            if text is None:
+                raise ValueError("Either text or features must be provided")
+            features = self.jd_matcher.extract_resume_features(text)
+
+        candidate_id = str(candidate_id)
+        with self._lock:
+            self._sync_vocabulary()
+            features = self.jd_matcher.remap_features(features)
+            row = self._rows.get(candidate_id)
+            meta = {'filename': filename, 'status': status, 'upload_status': upload_status}
+            if row is not None and self._meta[row] == meta and self._same_features(self._features[row], features):
+                return  # Unchanged (e.g. a stored resume indexed again after a restart)
+            if row is None:
+                if len(self._ids) == self._skills.shape[0]:
+                    self._grow()
+                row = len(self._ids)
+                self._ids.append(candidate_id)
+                self._meta.append({})
+                self._features.append(features)
+                self._rows[candidate_id] = row
+
+            self._fill_row(row, features, status, upload_status)
+            self._meta[row] = meta
+
+            if persist and self.index_path:
+                self._append_entry(candidate_id, features, filename, status, upload_status)
+
+    @staticmethod
+    def _same_features(a: ResumeFeatures, b: ResumeFeatures) -> bool:
+        return (a.skill_bits, a.years, a.education_bits) == (b.skill_bits, b.years, b.education_bits)
+
+    def _fill_row(self, row: int, features: ResumeFeatures, status: str, upload_status: Optional[str] = None):
+        """Write one candidate's features into the arrays"""
+        self._skills[row] = False
+        self._skills[row, list(_iter_bits(features.skill_bits))] = True
+        self._education[row] = False
+        self._education[row, list(_iter_bits(features.education_bits))] = True
+        self._skill_counts[row] = features.skill_count
+        self._education_counts[row] = features.education_bits.bit_count()
+        self._degree_levels[row] = features.degree_level
+        self._years[row] = np.nan if features.years is None else features.years
+        self._statuses[row] = status
+        self._upload_statuses[row] = upload_status
+        self._features[row] = features
+
+    def index_resumes(self, rows: Iterable[Dict[str, Any]]) -> int:
+        """
+        Index resumes in bulk
+
+        Args:
+            rows: Dicts with id, text and optionally filename, status and upload_status
+
+        Returns:
+            Number of resumes indexed
+        """
+        count = 0
+        for row in rows:
+            if not row.get('text'):
+                continue
+            self.add_candidate(
+                row['id'], text=row['text'], filename=row.get('filename'),
+                status=row.get('status') or 'new', upload_status=row.get('upload_status')
+            )
+            count += 1
+        return count
+
+    def load_from_db(self, db) -> int:
+        """
+        Index stored resumes processed since the previous call
+
+        The first call indexes every resume with extracted text; later calls
+        only read rows after the last one seen, by keyset on (processed_at, id),
+        so rows at the boundary are not indexed again. The row's upload_status
+        is kept as the upload status; the hiring status starts as new.
+
+        Args:
+            db: Database session
+
+        Returns:
+            Number of resumes indexed
+        """
+        from sqlalchemy import and_, or_
+        from models.db import Resume
+
+        query = db.query(
+            Resume.id, Resume.file_name, Resume.raw_text, Resume.upload_status, Resume.processed_at
+        ).filter(Resume.raw_text.isnot(None))
+        if self._db_watermark is not None:
+            processed_at, resume_id = self._db_watermark
+            query = query.filter(or_(
+                Resume.processed_at > processed_at,
+                and_(Resume.processed_at == processed_at, Resume.id > resume_id)
+            ))
+        query = query.order_by(Resume.processed_at, Resume.id)
+
+        rows = []
+        latest = self._db_watermark
+        for resume_id, file_name, raw_text, upload_status, processed_at in query.yield_per(500):
+            rows.append({'id': resume_id, 'text': raw_text, 'filename': file_name, 'upload_status': upload_status})
+            if processed_at is not None:
+                latest = (processed_at, resume_id)
+
+        count = self.index_resumes(rows)
+        self._db_watermark = latest
+        return count
+
+    def _score_all(self, compiled_jd: CompiledJD, size: int) -> np.ndarray:
+        """Vectorized overall match score for the first `size` rows"""
+        weights = compiled_jd.weights
+
+        # Skills
+        jd_skill_ids = list(_iter_bits(compiled_jd.skill_bits))
+        if jd_skill_ids:
+            matched = self._skills[:size, jd_skill_ids].sum(axis=1)
+            extra = self._skill_counts[:size] - matched
+            skills = np.minimum(matched / len(jd_skill_ids) * 100 + np.minimum(extra * 2, 10), 100.0)
+        else:
+            skills = np.full(size, 75.0)
+
+        # Experience
+        years = self._years[:size]
+        known = ~np.isnan(years)
+        if compiled_jd.required_years is None:
+            experience = np.where(known & (years != 0), 80.0, 60.0)
+        else:
+            diff = np.nan_to_num(years) - compiled_jd.required_years
+            experience = np.select(
+                [~known, diff > 5, diff > 2, diff >= 0, diff >= -1, diff >= -2],
+                [50.0, 85.0, 95.0, 100.0, 80.0, 60.0],
+                default=40.0
+            )
+
+        # Education
+        jd_education_ids = list(_iter_bits(compiled_jd.education_bits))
+        if jd_education_ids:
+            percentage = self._education[:size, jd_education_ids].sum(axis=1) / len(jd_education_ids) * 100
+            education = np.where(
+                self._degree_levels[:size] >= compiled_jd.degree_level,
+                np.minimum(percentage + 20, 100.0),
+                np.maximum(percentage - 20, 30.0)
+            )
+        else:
+            education = np.where(self._education_counts[:size] > 0, 85.0, 70.0)
+
+        return (
+            skills * weights['skills'] +
+            experience * weights['experience'] +
+            education * weights['education']
+        )
+
+    def _ranked_rows(self, compiled_jd: CompiledJD, count: Optional[int],
+                     statuses: Optional[List[str]], upload_statuses: Optional[List[str]] = None) -> tuple:
+        """Return (eligible_total, rows of the best `count` candidates in rank order)"""
+        self.sync()
+        with self._lock:
+            self._sync_vocabulary()
+            size = len(self._ids)
+            if size == 0:
+                return 0, []
+
+            # Scores must be computed over the same skill bit positions as the arrays
+            if compiled_jd.vocabulary is not self._vocabulary and compiled_jd.jd_text is not None:
+                compiled_jd = self.jd_matcher.compile_jd(compiled_jd.jd_text)
+
+            scores = self._score_all(compiled_jd, size)
+            mask = np.ones(size, dtype=bool)
+            if statuses:
+                mask &= np.isin(self._statuses[:size], list(statuses))
+            if upload_statuses:
+                mask &= np.isin(self._upload_statuses[:size], list(upload_statuses))
+            eligible = np.flatnonzero(mask)
+
+            total = len(eligible)
+            if count is not None and count < total:
+                # Partial selection keeps top-K at O(N) instead of sorting the whole pool
+                top = np.argpartition(-scores[eligible], count - 1)[:count]
+                eligible = eligible[top]
+
+            # Highest score first; ties keep index order
+            order = np.lexsort((eligible, -scores[eligible]))
+            return total, eligible[order].tolist()
+
+    def _row_result(self, row: int, rank: int, compiled_jd: CompiledJD) -> Dict[str, Any]:
+        """Detailed result for one ranked row"""
+        match = self.jd_matcher.match_compiled(self._features[row], compiled_jd)
+        return {
+            'rank': rank,
+            'id': self._ids[row],
+            'filename': self._meta[row].get('filename'),
+            'status': self._meta[row].get('status'),
+            'upload_status': self._meta[row].get('upload_status'),
+            **match
+        }
+
+    def rank(self, compiled_jd: CompiledJD, limit: int = 20, offset: int = 0,
+             statuses: Optional[List[str]] = None,
+             upload_statuses: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Rank indexed resumes against a compiled JD
+
+        Args:
+            compiled_jd: Result of JDMatcher.compile_jd
+            limit: Page size
+            offset: Number of ranked results to skip
+            statuses: Only rank candidates with one of these hiring statuses
+            upload_statuses: Only rank stored resumes with one of these upload statuses
+
+        Returns:
+            Dictionary with the eligible total and the requested page of results
+        """
+        total, rows = self._ranked_rows(compiled_jd, offset + limit, statuses, upload_statuses)
+        page = rows[offset:offset + limit]
+        return {
+            'total': total,
+            'offset': offset,
+            'limit': limit,
+            'results': [self._row_result(row, offset + i + 1, compiled_jd) for i, row in enumerate(page)]
+        }
+
+    def iter_ranked(self, compiled_jd: CompiledJD, limit: Optional[int] = None, offset: int = 0,
+                    statuses: Optional[List[str]] = None,
+                    upload_statuses: Optional[List[str]] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Yield ranked results one at a time, best first
+
+        The pool is scored up front; detailed results are produced lazily so
+        a streaming response can send the first rows immediately.
+        """
+        count = offset + limit if limit is not None else None
+        _, rows = self._ranked_rows(compiled_jd, count, statuses, upload_statuses)
+        end = offset + limit if limit is not None else None
+        for i, row in enumerate(rows[offset:end]):
+            yield self._row_result(row, offset + i + 1, compiled_jd)
+
+    @contextmanager
+    def _file_lock(self, exclusive: bool = False):
+        """Inter-process lock on the index file: appends share it, compaction holds it exclusively"""
+        if fcntl is None:
+            yield
+            return
+        with open(f"{self.index_path}.lock", 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _append_entry(self, candidate_id: str, features: ResumeFeatures,
+                      filename: Optional[str], status: str, upload_status: Optional[str] = None):
+        """Append one index entry to the index file, compacting it when mostly superseded"""
+        entry = {
+            'id': candidate_id,
+            'filename': filename,
+            'status': status,
+            'upload_status': upload_status,
+            'skills': (features.vocabulary or self.jd_matcher.vocabulary).names(features.skill_bits),
+            'education': [self.jd_matcher.education_keywords[i] for i in _iter_bits(features.education_bits)],
+            'years': features.years
+        }
+        try:
+            os.makedirs(os.path.dirname(self.index_path) or '.', exist_ok=True)
+            with self._file_lock():
+                with open(self.index_path, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(entry) + '\n')
+        except Exception as e:
+            logger.warning(f"Failed to persist ranking index entry: {str(e)}")
+            return
+        # Reading the tail counts this entry (and any appended by other processes)
+        self.sync()
+        self._maybe_compact()
+
+    def _maybe_compact(self):
+        """Compact the index file once enough of it is superseded"""
+        dead = self._file_entries - len(self._ids)
+        if self._file_entries >= INDEX_COMPACT_MIN_ENTRIES and dead >= self._file_entries * INDEX_COMPACT_RATIO:
+            self.compact()
+
+    def compact(self) -> int:
+        """
+        Rewrite the index file with only the latest entry per candidate
+
+        The file is re-read under the exclusive lock, so entries appended by
+        other processes sharing it are kept.
+
+        Returns:
+            Number of entries dropped
+        """
+        if not self.index_path or not os.path.exists(self.index_path):
+            return 0
+        with self._lock, self._file_lock(exclusive=True):
+            try:
+                latest: "OrderedDict[str, str]" = OrderedDict()
+                total = 0
+                with open(self.index_path, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        try:
+                            candidate_id = str(json.loads(line)['id'])
+                        except (ValueError, KeyError):
+                            continue  # Torn or corrupt line
+                        total += 1
+                        latest.pop(candidate_id, None)
+                        latest[candidate_id] = line if line.endswith('\n') else line + '\n'
+
+                fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(self.index_path) or '.',
+                                                prefix=f".{os.path.basename(self.index_path)}.", suffix=".tmp")
+                try:
+                    with os.fdopen(fd, 'w', encoding='utf-8') as out:
+                        out.writelines(latest.values())
+                        out.flush()
+                        os.fsync(out.fileno())
+                    os.replace(tmp_path, self.index_path)
+                except BaseException:
+                    if os.path.exists(tmp_path):
+                        os.remove(tmp_path)
+                    raise
+
+                # The replaced file is re-read whole on the next sync
+                self._file_inode = None
+                dropped = total - len(latest)
+                logger.info(f"Compacted ranking index: {len(latest)} candidates, {dropped} entries dropped")
+                return dropped
+            except Exception as e:
+                logger.error(f"Error compacting ranking index: {str(e)}")
+                return 0
+
+    def sync(self):
+        """Apply entries appended to the index file (by this or other processes) since the last read"""
+        if not self.index_path:
+            return
+        with self._lock:
+            try:
+                with self._file_lock():
+                    if not os.path.exists(self.index_path):
+                        return
+                    with open(self.index_path, 'rb') as f:
+                        inode = os.fstat(f.fileno()).st_ino
+                        if inode != self._file_inode:
+                            # New or compacted file: read it from the start
+                            self._file_inode, self._file_offset, self._file_entries = inode, 0, 0
+                        f.seek(self._file_offset)
+                        data = f.read()
+            except OSError as e:
+                logger.warning(f"Failed to read ranking index: {str(e)}")
+                return
+
+            # A torn trailing line is left for a later read
+            end = data.rfind(b'\n') + 1
+            self._file_offset += end
+            self._file_entries += self._apply_entries(data[:end].decode('utf-8', errors='replace').splitlines())
+
+    def _apply_entries(self, lines: List[str]) -> int:
+        """Add index file entries to the in-memory index; returns the number applied"""
+        vocabulary = self.jd_matcher.vocabulary
+        education_ids = {kw: i for i, kw in enumerate(self.jd_matcher.education_keywords)}
+        applied = 0
+        for line in lines:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue  # Corrupt line
+            skill_bits = vocabulary.expand(vocabulary.bits_for(entry.get('skills', [])))
+            education_bits = 0
+            for keyword in entry.get('education', []):
+                if keyword in education_ids:
+                    education_bits |= 1 << education_ids[keyword]
+            features = ResumeFeatures(
+                skill_bits=skill_bits,
+                years=entry.get('years'),
+                education_bits=education_bits,
+                degree_level=self.jd_matcher._degree_level(education_bits),
+                vocabulary=vocabulary
+            )
+            self.add_candidate(entry['id'], features=features, filename=entry.get('filename'),
+                               status=entry.get('status') or 'new',
+                               upload_status=entry.get('upload_status'), persist=False)
+            applied += 1
+        return applied
+
+    def _load_index(self):
+        """Rebuild the in-memory index from the index file"""
+        if not os.path.exists(self.index_path):
+            return
+        try:
+            self.sync()
+            logger.info(f"Loaded {len(self)} candidates into ranking index ({self._file_entries} entries)")
+        except Exception as e:
+            logger.error(f"Error loading ranking index: {str(e)}")
+            return
+        self._maybe_compact()
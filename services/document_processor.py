@@ -1,6 +1,8 @@
 import os
 import logging
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
+
+from core.admission import admission
 
 logger = logging.getLogger(__name__)
 
@@ -12,6 +14,10 @@ class DocumentProcessor:
         # pytesseract.pytesseract.tesseract_cmd = r'/usr/bin/tesseract'
         pass
 
+    def extract(self, file_path: str) -> Tuple[str, Dict[str, Any]]:
+        """Extract text and analyze structure in one call (one pool task per document)"""
+        return self.extract_text(file_path), self.analyze_document_structure(file_path)
+
     def extract_text(self, file_path: str) -> str:
         """Extract text from document based on file extension"""
         file_extension = os.path.splitext(file_path)[1].lower()
@@ -70,7 +76,9 @@ class DocumentProcessor:
 
             # If text extraction failed or returned minimal text, try OCR
             logger.info("Attempting OCR extraction as fallback")
-            ocr_text = self._extract_with_ocr(file_path)
+            # OCR is the slowest stage; only a few documents are OCR'd at once
+            with admission.stage_sync('ocr'):
+                ocr_text = self._extract_with_ocr(file_path)
             if ocr_text and len(ocr_text.strip()) > 50:
                 return ocr_text
 
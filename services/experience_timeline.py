@@ -0,0 +1,302 @@
+import re
+import logging
+import threading
+from datetime import date
+from typing import Dict, List, Any, Optional, Tuple
+
+from core.cache import DocumentMemo
+from services.skill_taxonomy import _iter_bits
+from services.section_segmenter import section_segmenter
+
+logger = logging.getLogger(__name__)
+
+MONTHS = {
+    'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'may': 5, 'jun': 6,
+    'jul': 7, 'aug': 8, 'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12
+}
+
+# "Jan 2020", "January, 2020", "Sept. 2020", "01/2020", "2020-01", "2020"
+_DATE = (
+    r'(?:(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?,?\s*\d{4}'
+    r'|\d{1,2}[/.]\d{4}'
+    r'|\d{4}[/.-]\d{1,2}(?!\d)'
+    r'|\d{4})'
+)
+_OPEN_END = r'(?:present|current|currently|now|ongoing|today|till date|to date|date)'
+DATE_RANGE_PATTERN = re.compile(
+    rf'\b({_DATE})\s*(?:-|–|—|to|until|till)\s*({_DATE}|{_OPEN_END})\b',
+    re.IGNORECASE
+)
+
+# Date ranges on these lines are study periods, not work experience
+EDUCATION_LINE_PATTERN = re.compile(
+    r'\b(?:university|college|school|institute|bachelor|master|degree|b\.tech|m\.tech|phd|diploma|gpa|cgpa)\b',
+    re.IGNORECASE
+)
+
+MIN_YEAR = 1950
+
+# Explicit statements such as "5+ years of experience"
+STATED_YEARS_PATTERNS = [
+    r'(\d+)\+?\s*(?:years?|yrs?)\s+(?:of\s+)?experience',
+    r'experience\s+(?:of\s+)?(\d+)\+?\s*(?:years?|yrs?)',
+    r'(\d+)\+?\s*(?:years?|yrs?)\s+(?:in|with)',
+]
+
+
+def extract_stated_years(text: str) -> Optional[int]:
+    """Largest number of years stated in phrases like "5+ years of experience" """
+    years = []
+    text_lower = text.lower()
+    for pattern in STATED_YEARS_PATTERNS:
+        years.extend(int(match) for match in re.findall(pattern, text_lower))
+    return max(years) if years else None
+
+
+def _month_index(year: int, month: int) -> int:
+    """Months since year 0, so month arithmetic is plain integer arithmetic"""
+    return year * 12 + (month - 1)
+
+
+def _format_month(index: int) -> str:
+    return f"{index // 12:04d}-{index % 12 + 1:02d}"
+
+
+def merge_intervals(intervals: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """
+    Merge overlapping or adjacent half-open month intervals
+
+    Args:
+        intervals: (start, end) pairs with end exclusive
+
+    Returns:
+        Sorted, non-overlapping intervals
+    """
+    merged: List[Tuple[int, int]] = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+class ExperienceTimeline:
+    """
+    Work history of one document as month intervals.
+
+    Each position keeps the text block it was found in (the date line plus
+    the lines up to the next position), so per-skill experience is the
+    merged duration of the positions mentioning that skill.
+    """
+
+    def __init__(self, positions: List[Dict[str, Any]]):
+        self.positions = positions
+        self.intervals = merge_intervals([(p['start'], p['end']) for p in positions])
+        self.total_months = sum(end - start for start, end in self.intervals)
+        self._skill_months: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def total_years(self) -> float:
+        """Total non-overlapping experience in years (one decimal)"""
+        return round(self.total_months / 12, 1)
+
+    def skill_months(self, vocabulary) -> Dict[str, int]:
+        """
+        Months of experience per skill
+
+        Args:
+            vocabulary: CompiledTaxonomy used to find skills in each position
+
+        Returns:
+            Dictionary of canonical skill name to merged months
+        """
+        cached = self._skill_months.get(vocabulary.version)
+        if cached is not None:
+            return cached
+
+        intervals: Dict[int, List[Tuple[int, int]]] = {}
+        for position in self.positions:
+            bits = vocabulary.expand(vocabulary.extract_direct_bits(position['text']))
+            for skill_id in _iter_bits(bits):
+                intervals.setdefault(skill_id, []).append((position['start'], position['end']))
+
+        months = {
+            vocabulary.skills[skill_id]: sum(end - start for start, end in merge_intervals(spans))
+            for skill_id, spans in intervals.items()
+        }
+        with self._lock:
+            self._skill_months[vocabulary.version] = months
+        return months
+
+    def skill_years(self, vocabulary) -> Dict[str, float]:
+        """Years of experience per skill (one decimal)"""
+        return {skill: round(months / 12, 1) for skill, months in self.skill_months(vocabulary).items()}
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable summary"""
+        return {
+            'total_years': self.total_years,
+            'total_months': self.total_months,
+            'intervals': [
+                {'start': _format_month(start), 'end': _format_month(end - 1), 'months': end - start}
+                for start, end in self.intervals
+            ]
+        }
+
+
+class ExperienceTimelineEngine:
+    """
+    Parses date ranges from resume text into merged experience timelines.
+
+    Results are cached by a hash of the text, so the extractor, the matcher
+    and the ranking index share one parse per document.
+    """
+
+    def __init__(self, cache_size: int = 1024, today: Optional[date] = None):
+        """
+        Initialize engine
+
+        Args:
+            cache_size: Number of timelines kept (LRU)
+            today: Date used for open-ended ranges such as "Present"; defaults to the current date
+        """
+        self.today = today
+        self._cache = DocumentMemo(cache_size)
+
+    def timeline(self, text: str) -> ExperienceTimeline:
+        """
+        Get the experience timeline of a document
+
+        Args:
+            text: Resume text (or its experience section)
+
+        Returns:
+            ExperienceTimeline, possibly empty
+        """
+        return self._cache.get_or_compute(text, self._build_timeline)
+
+    def _build_timeline(self, text: str) -> ExperienceTimeline:
+        """Parse the positions of a document into a timeline (uncached)"""
+        try:
+            return ExperienceTimeline(self._parse_positions(text))
+        except Exception as e:
+            logger.error(f"Error building experience timeline: {str(e)}")
+            return ExperienceTimeline([])
+
+    def total_years(self, text: str) -> Optional[float]:
+        """Total experience in years, or None if the text has no date ranges"""
+        result = self.timeline(text)
+        return result.total_years if result.total_months else None
+
+    def experience_years(self, text: str) -> Optional[float]:
+        """
+        Years of experience of a resume
+
+        The larger of the stated years ("8 years of experience") and the
+        merged date-range timeline, or None if neither is present.
+        """
+        values = [v for v in (extract_stated_years(text), self.total_years(text)) if v is not None]
+        return max(values) if values else None
+
+    def parse_range(self, start_text: str, end_text: str) -> Optional[Tuple[int, int]]:
+        """
+        Parse one date range to a half-open month interval
+
+        Year-only dates span whole years ("2018 - 2020" is two years);
+        month dates include the end month ("Jan 2020 - Mar 2020" is three months).
+
+        Returns:
+            (start, end) month indexes, or None if the range is not plausible
+        """
+        current = self._current_month()
+        start = self._parse_date(start_text, is_end=False)
+        if start is None:
+            return None
+
+        if re.fullmatch(_OPEN_END, end_text.strip(), re.IGNORECASE):
+            end = current + 1
+        else:
+            end = self._parse_date(end_text, is_end=True)
+            if end is None:
+                return None
+            if re.fullmatch(r'\d{4}', end_text.strip()) and re.fullmatch(r'\d{4}', start_text.strip()):
+                # "2018 - 2020": end at the start of the final year, but a same-year range is one year
+                end -= 12
+                if end == start:
+                    end = start + 12
+
+        end = min(end, current + 1)
+        if start < _month_index(MIN_YEAR, 1) or end <= start or end - start > 50 * 12:
+            return None
+        return start, end
+
+    def _current_month(self) -> int:
+        today = self.today or date.today()
+        return _month_index(today.year, today.month)
+
+    @staticmethod
+    def _parse_date(text: str, is_end: bool) -> Optional[int]:
+        """Parse a single date; end dates return the exclusive month index"""
+        text = text.strip().lower()
+
+        match = re.fullmatch(r'([a-z]{3})[a-z]*\.?,?\s*(\d{4})', text)
+        if match:
+            month = MONTHS.get(match.group(1))
+            year = int(match.group(2))
+        else:
+            match = re.fullmatch(r'(\d{1,2})[/.](\d{4})', text)
+            if match:
+                month, year = int(match.group(1)), int(match.group(2))
+            else:
+                match = re.fullmatch(r'(\d{4})[/.-](\d{1,2})', text)
+                if match:
+                    year, month = int(match.group(1)), int(match.group(2))
+                elif re.fullmatch(r'\d{4}', text):
+                    year, month = int(text), 12 if is_end else 1
+                else:
+                    return None
+
+        if not month or not 1 <= month <= 12:
+            return None
+        index = _month_index(year, month)
+        return index + 1 if is_end else index
+
+    def _parse_positions(self, text: str) -> List[Dict[str, Any]]:
+        """Find date ranges line by line and attach each position's text block"""
+        sections = section_segmenter.segment(text)
+        lines = sections.lines
+        # Only the Experience section is scanned when the resume has one
+        ranges = sections.line_ranges('experience') or [(0, len(lines))]
+
+        found = []
+        for range_start, range_end in ranges:
+            for i in range(range_start, range_end):
+                line = lines[i]
+                # Study periods: the institution or degree is on the date line or just above it
+                if EDUCATION_LINE_PATTERN.search(line) or (i > 0 and EDUCATION_LINE_PATTERN.search(lines[i - 1])):
+                    continue
+                for match in DATE_RANGE_PATTERN.finditer(line):
+                    interval = self.parse_range(match.group(1), match.group(2))
+                    if interval:
+                        found.append((i, interval, range_start, range_end))
+
+        positions = []
+        for n, (line_no, (start, end), range_start, range_end) in enumerate(found):
+            # The title usually sits on the line before the dates; the description runs to the next position
+            block_start = max(line_no - 1, range_start)
+            block_end = min(found[n + 1][0], range_end) if n + 1 < len(found) else range_end
+            block_end = max(block_end, line_no + 1)
+            positions.append({
+                'start': start,
+                'end': end,
+                'line': line_no,
+                'text': '\n'.join(lines[block_start:block_end]).lower()
+            })
+        return positions
+
+
+# Shared engine so every consumer reuses the same per-document cache
+timeline_engine = ExperienceTimelineEngine()
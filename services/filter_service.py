@@ -51,6 +51,47 @@ class FilterService:
             }
         }
 
+    def search_resumes(self, db, filters: CandidateFilter, page: int = 1, page_size: int = 20) -> Dict[str, Any]:
+        """
+        Filter processed resumes by experience range using the materialized experience_years column.
+
+        Range filtering is an indexed column comparison; resume text is never reparsed.
+        """
+        from models.db import Resume
+
+        query = db.query(Resume).filter(Resume.upload_status == 'completed')
+        if filters.min_experience is not None:
+            query = query.filter(Resume.experience_years >= filters.min_experience)
+        if filters.max_experience is not None:
+            query = query.filter(Resume.experience_years <= filters.max_experience)
+
+        total = query.count()
+        resumes = (
+            query.order_by(Resume.experience_years.desc(), Resume.id)
+            .offset((page - 1) * page_size)
+            .limit(page_size)
+            .all()
+        )
+
+        return {
+            "results": [
+                {
+                    "id": resume.id,
+                    "candidate_id": resume.candidate_id,
+                    "file_name": resume.file_name,
+                    "experience_years": resume.experience_years,
+                    "jd_match_score": resume.jd_match_score,
+                }
+                for resume in resumes
+            ],
+            "pagination": {
+                "total": total,
+                "page": page,
+                "page_size": page_size,
+                "total_pages": max(1, (total + page_size - 1) // page_size)
+            }
+        }
+
     def get_filter_options(self) -> Dict[str, List]:
         """Retrieves distinct values for filter options."""
         # In a real app, this would query the database for distinct skills, locations, etc.
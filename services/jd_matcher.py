@@ -1,15 +1,102 @@
-import re
+import os
+import hashlib
 import logging
-from typing import Dict, List, Set, Any
-from collections import Counter
+from typing import Dict, List, Any, Optional, Union
+
+from core.cache import DocumentMemo
+from core.config import settings
+from services.skill_taxonomy import SkillTaxonomy, CompiledTaxonomy, _iter_bits
+from services.experience_timeline import extract_stated_years, timeline_engine
+from services.section_segmenter import section_segmenter
+from services.resume_annotator import resume_annotator
 
 logger = logging.getLogger(__name__)
 
+# Synonyms, parents and related skills compiled into the matcher vocabulary
+DEFAULT_TAXONOMY_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'skill_taxonomy.json'
+)
+
+# Degree levels used to compare JD requirements with resume qualifications
+DEGREE_HIERARCHY = {
+    'phd': 4, 'doctorate': 4,
+    'master': 3, 'm.tech': 3, 'm.e': 3, 'mba': 3, 'mca': 3,
+    'bachelor': 2, 'b.tech': 2, 'b.e': 2, 'bca': 2,
+    'diploma': 1
+}
+
+# Bump when match scoring changes; persisted match results from other versions are ignored
+MATCHER_VERSION = "2026.10.1"
+
+# Weights for the overall match score
+MATCH_WEIGHTS = {
+    'skills': 0.50,      # 50% weight on skills
+    'experience': 0.30,  # 30% weight on experience
+    'education': 0.20    # 20% weight on education
+}
+
+
+class CompiledJD:
+    """
+    Job description requirements extracted once and reused for every resume.
+
+    Skills and education keywords are stored as integer bitmaps over the
+    matcher's vocabulary so that scoring a resume is a handful of bit
+    operations instead of a rescan of the JD text. The JD text is kept so the
+    JD can be recompiled if the skill taxonomy is reloaded.
+    """
+
+    def __init__(self, jd_hash: str, skill_bits: int, required_years: Optional[int],
+                 education_bits: int, degree_level: int, weights: Dict[str, float],
+                 vocabulary: Optional[CompiledTaxonomy] = None, jd_text: Optional[str] = None):
+        self.jd_hash = jd_hash
+        self.jd_text = jd_text
+        self.vocabulary = vocabulary
+        self.skill_bits = skill_bits
+        self.skill_count = skill_bits.bit_count()
+        self.required_years = required_years
+        self.education_bits = education_bits
+        self.education_count = education_bits.bit_count()
+        self.degree_level = degree_level
+        self.weights = weights
+
+    def __repr__(self):
+        return f"<CompiledJD(hash='{self.jd_hash[:8]}', skills={self.skill_count}, years={self.required_years})>"
+
+
+class ResumeFeatures:
+    """
+    Resume features needed for JD matching, extracted once per resume text
+
+    skill_bits includes the taxonomy ancestors of every skill found, so a
+    resume listing "pytorch" also satisfies a JD asking for "deep learning".
+    """
+
+    def __init__(self, skill_bits: int, years: Optional[int], education_bits: int, degree_level: int,
+                 vocabulary: Optional[CompiledTaxonomy] = None):
+        self.vocabulary = vocabulary
+        self.skill_bits = skill_bits
+        self.skill_count = skill_bits.bit_count()
+        self.years = years
+        self.education_bits = education_bits
+        self.degree_level = degree_level
+
 
 class JDMatcher:
     """Matches resumes with job descriptions using NLP and keyword analysis"""
 
-    def __init__(self):
+    def __init__(self, semantic_weight: float = 0.0, taxonomy_path: Optional[str] = DEFAULT_TAXONOMY_PATH):
+        """
+        Initialize JD matcher
+        
+        Args:
+            semantic_weight: Share (0-1) of the overall match taken by the
+                text-similarity score when one is passed to match_compiled
+            taxonomy_path: Skill taxonomy JSON file (synonyms, parents, related);
+                None matches the built-in skill list exactly
+        """
+        self.semantic_weight = min(max(semantic_weight, 0.0), 1.0)
+
         try:
             import nltk
             # Download required NLTK data if not available
@@ -67,6 +154,38 @@ class JDMatcher:
             'designed', 'implemented', 'created', 'built', 'maintained'
         ]
 
+        self._compile_vocabulary(taxonomy_path)
+        self.timeline_engine = timeline_engine
+
+        # Compiled JDs keyed by JD hash (LRU)
+        self._jd_cache = DocumentMemo(256)
+
+    @classmethod
+    def from_settings(cls, config=settings) -> "JDMatcher":
+        """Matcher configured like the scan app, so every entry point scores the same way"""
+        return cls(semantic_weight=config.semantic_match_weight,
+                   taxonomy_path=config.skill_taxonomy_path or DEFAULT_TAXONOMY_PATH)
+
+    def _compile_vocabulary(self, taxonomy_path: Optional[str] = None):
+        """Compile the skill taxonomy into bit positions and assign education keyword bits"""
+        self.taxonomy = SkillTaxonomy(taxonomy_path, self.skill_categories)
+        self._education_levels = [DEGREE_HIERARCHY.get(kw, 0) for kw in self.education_keywords]
+
+    @property
+    def vocabulary(self) -> CompiledTaxonomy:
+        """Current compiled skill vocabulary (hot-reloaded with the taxonomy file)"""
+        return self.taxonomy.compiled
+
+    @property
+    def version(self) -> str:
+        """Matcher version plus the taxonomy's own version and size (not its file mtime, which every deploy changes)"""
+        return f"{MATCHER_VERSION}:{self.vocabulary.version.rsplit(':', 1)[0]}"
+
+    @property
+    def skill_vocabulary(self) -> List[str]:
+        """Canonical skill names indexed by bit position"""
+        return self.vocabulary.skills
+
     def match_resume_with_jd(self, resume_text: str, jd_text: str) -> Dict[str, Any]:
         """
         Match resume with job description and calculate relevance scores
@@ -78,94 +197,188 @@ class JDMatcher:
         Returns:
             Dictionary with matching scores and details
         """
-        # Extract keywords from both texts
-        jd_keywords = self._extract_keywords(jd_text)
-        resume_keywords = self._extract_keywords(resume_text)
+        return self.match_compiled(resume_text, self.compile_jd(jd_text))
+
+    def compile_jd(self, jd_text: str) -> CompiledJD:
+        """
+        Compile a job description once so it can be matched against many resumes
+        
+        Args:
+            jd_text: Job description text
+            
+        Returns:
+            CompiledJD, shared between callers that pass the same JD text
+        """
+        vocabulary = self.vocabulary
+        return self._jd_cache.get_or_compute(
+            jd_text, lambda text: self._compile(text, vocabulary),
+            valid=lambda compiled: compiled.vocabulary is vocabulary
+        )
+
+    def _compile(self, jd_text: str, vocabulary: CompiledTaxonomy) -> CompiledJD:
+        """Compile a job description against a skill vocabulary (uncached)"""
+        education_bits = self._extract_education_bits(jd_text)
+        return CompiledJD(
+            jd_hash=hashlib.sha256(jd_text.encode('utf-8')).hexdigest(),
+            # JD skills are not expanded: asking for "postgresql" is not satisfied by "sql"
+            skill_bits=vocabulary.extract_direct_bits(jd_text.lower()),
+            required_years=self._extract_years_experience(jd_text),
+            education_bits=education_bits,
+            degree_level=self._degree_level(education_bits),
+            weights=dict(MATCH_WEIGHTS),
+            vocabulary=vocabulary,
+            jd_text=jd_text
+        )
+
+    def extract_resume_features(self, resume_text: str) -> ResumeFeatures:
+        """Extract the resume features used by match_compiled"""
+        vocabulary = self.vocabulary
+        # Degree keywords only count in the Education/Certifications sections when the resume has them,
+        # so "engineering" in a job title is not mistaken for a qualification
+        sections = section_segmenter.segment(resume_text)
+        education_text = '\n'.join(
+            sections.text(name, fallback=False) for name in ('education', 'certifications')
+        ) if 'education' in sections else resume_text
+        education_bits = self._extract_education_bits(education_text)
+        return ResumeFeatures(
+            skill_bits=vocabulary.expand(resume_annotator.annotate(resume_text).skill_bits(vocabulary)),
+            years=self.timeline_engine.experience_years(resume_text),
+            education_bits=education_bits,
+            degree_level=self._degree_level(education_bits),
+            vocabulary=vocabulary
+        )
+
+    def remap_features(self, features: ResumeFeatures) -> ResumeFeatures:
+        """
+        Translate features extracted under an older taxonomy to the current one
+
+        Skills are carried over by canonical name and re-expanded with the
+        current parent closure.
+        """
+        vocabulary = self.vocabulary
+        if features.vocabulary is vocabulary or features.vocabulary is None:
+            return features
+        names = features.vocabulary.names(features.skill_bits)
+        return ResumeFeatures(
+            skill_bits=vocabulary.expand(vocabulary.bits_for(names)),
+            years=features.years,
+            education_bits=features.education_bits,
+            degree_level=features.degree_level,
+            vocabulary=vocabulary
+        )
+
+    def match_compiled(self, resume: Union[str, ResumeFeatures], compiled_jd: CompiledJD,
+                       semantic_score: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Match a resume against a compiled job description
+        
+        Args:
+            resume: Resume text or previously extracted ResumeFeatures
+            compiled_jd: Result of compile_jd
+            semantic_score: Optional 0-1 text similarity (e.g. from ResumeVectorIndex),
+                blended into the overall match using semantic_weight
+            
+        Returns:
+            Dictionary with matching scores and details
+        """
+        features = resume if isinstance(resume, ResumeFeatures) else self.extract_resume_features(resume)
+
+        # Bitmaps are only comparable within one taxonomy version
+        vocabulary = self.vocabulary
+        if compiled_jd.vocabulary is not vocabulary and compiled_jd.jd_text is not None:
+            compiled_jd = self.compile_jd(compiled_jd.jd_text)
+        features = self.remap_features(features)
 
         # Calculate individual scores
-        skills_score = self._calculate_skills_match(jd_keywords, resume_keywords)
-        experience_score = self._calculate_experience_match(resume_text, jd_text)
-        education_score = self._calculate_education_match(resume_text, jd_text)
+        skills_score = self._score_skills(compiled_jd.skill_bits, features.skill_bits)
+        experience_score = self._score_experience(compiled_jd.required_years, features.years)
+        education_score = self._score_education(compiled_jd, features)
 
         # Calculate overall match (weighted average)
-        weights = {
-            'skills': 0.50,      # 50% weight on skills
-            'experience': 0.30,  # 30% weight on experience
-            'education': 0.20    # 20% weight on education
-        }
-
+        weights = compiled_jd.weights
         overall_match = (
             skills_score * weights['skills'] +
             experience_score * weights['experience'] +
             education_score * weights['education']
         )
 
+        semantic_match = None
+        if semantic_score is not None:
+            semantic_match = min(max(semantic_score, 0.0), 1.0) * 100
+            overall_match = (
+                overall_match * (1 - self.semantic_weight) +
+                semantic_match * self.semantic_weight
+            )
+
         # Generate detailed feedback
-        matched_skills = self._get_matched_skills(jd_keywords, resume_keywords)
-        missing_skills = self._get_missing_skills(jd_keywords, resume_keywords)
+        missing_bits = compiled_jd.skill_bits & ~features.skill_bits
+        matched_skills = self._skill_names(compiled_jd.skill_bits & features.skill_bits)
+        missing_skills = self._skill_names(missing_bits)
 
-        return {
+        details = self._generate_match_details(
+            skills_score, experience_score, education_score,
+            matched_skills, missing_skills
+        )
+        for skill_id in _iter_bits(missing_bits):
+            related = vocabulary.related[skill_id] & features.skill_bits
+            if related:
+                details.append(
+                    f"○ Related to missing {vocabulary.skills[skill_id]}: {', '.join(vocabulary.names(related))}"
+                )
+
+        result = {
             'overall_match': round(overall_match, 1),
             'skills_match': round(skills_score, 1),
             'experience_match': round(experience_score, 1),
             'education_match': round(education_score, 1),
             'matched_skills': matched_skills,
             'missing_skills': missing_skills,
-            'details': self._generate_match_details(
-                skills_score, experience_score, education_score,
-                matched_skills, missing_skills
-            )
+            'details': details
         }
+        if semantic_match is not None:
+            result['semantic_match'] = round(semantic_match, 1)
+        return result
 
-    def _extract_keywords(self, text: str) -> Dict[str, Set[str]]:
-        """Extract categorized keywords from text"""
+    def _extract_education_bits(self, text: str) -> int:
+        """Extract education keywords from text as a bitmap"""
         text_lower = text.lower()
-        keywords = {
-            'programming': set(),
-            'web': set(),
-            'database': set(),
-            'cloud': set(),
-            'data_science': set(),
-            'soft_skills': set(),
-            'all_skills': set()
-        }
-
-        # Extract skills by category
-        for category, skill_list in self.skill_categories.items():
-            for skill in skill_list:
-                # Use word boundaries to avoid partial matches
-                pattern = r'\b' + re.escape(skill.lower()) + r'\b'
-                if re.search(pattern, text_lower):
-                    keywords[category].add(skill)
-                    keywords['all_skills'].add(skill)
-
-        return keywords
-
-    def _calculate_skills_match(self, jd_keywords: Dict[str, Set[str]], 
-                                resume_keywords: Dict[str, Set[str]]) -> float:
-        """Calculate skills matching score"""
-        jd_skills = jd_keywords['all_skills']
-        resume_skills = resume_keywords['all_skills']
-
-        if not jd_skills:
+        bits = 0
+        for keyword_id, keyword in enumerate(self.education_keywords):
+            if keyword in text_lower:
+                bits |= 1 << keyword_id
+        return bits
+
+    def _degree_level(self, education_bits: int) -> int:
+        """Highest degree level present in an education bitmap"""
+        return max((self._education_levels[i] for i in _iter_bits(education_bits)), default=0)
+
+    def _skill_names(self, skill_bits: int) -> List[str]:
+        """Sorted skill names for a skill bitmap"""
+        return self.vocabulary.names(skill_bits)
+
+    def _score_skills(self, jd_bits: int, resume_bits: int) -> float:
+        """Calculate skills matching score from skill bitmaps"""
+        if not jd_bits:
             return 75.0  # Default if no specific skills in JD
 
+        matched = (jd_bits & resume_bits).bit_count()
+        extra = (resume_bits & ~jd_bits).bit_count()
+        return self._skills_formula(matched, jd_bits.bit_count(), extra)
+
+    @staticmethod
+    def _skills_formula(matched: int, required: int, extra: int) -> float:
+        """Skills score from matched, required and extra skill counts"""
         # Calculate match percentage
-        matched_skills = jd_skills.intersection(resume_skills)
-        match_percentage = (len(matched_skills) / len(jd_skills)) * 100
+        match_percentage = (matched / required) * 100
 
         # Bonus for extra skills not in JD
-        extra_skills = resume_skills - jd_skills
-        bonus = min(len(extra_skills) * 2, 10)  # Up to 10% bonus
+        bonus = min(extra * 2, 10)  # Up to 10% bonus
 
         return min(match_percentage + bonus, 100.0)
 
-    def _calculate_experience_match(self, resume_text: str, jd_text: str) -> float:
-        """Calculate experience matching score"""
-        # Extract years of experience from JD
-        jd_years = self._extract_years_experience(jd_text)
-        resume_years = self._extract_years_experience(resume_text)
-
+    @staticmethod
+    def _score_experience(jd_years: Optional[int], resume_years: Optional[int]) -> float:
+        """Score resume experience against the JD requirement"""
         if jd_years is None:
             # No specific experience requirement
             return 80.0 if resume_years else 60.0
@@ -194,71 +407,26 @@ class JDMatcher:
             else:
                 return 40.0   # Significantly below
 
-    def _extract_years_experience(self, text: str) -> int:
-        """Extract years of experience from text"""
-        # Patterns to match experience mentions
-        patterns = [
-            r'(\d+)\+?\s*(?:years?|yrs?)\s+(?:of\s+)?experience',
-            r'experience\s+(?:of\s+)?(\d+)\+?\s*(?:years?|yrs?)',
-            r'(\d+)\+?\s*(?:years?|yrs?)\s+(?:in|with)',
-        ]
+    def _extract_years_experience(self, text: str) -> Optional[int]:
+        """Extract years of experience stated in text (e.g. "5+ years experience")"""
+        return extract_stated_years(text)
 
-        years = []
-        for pattern in patterns:
-            matches = re.findall(pattern, text.lower())
-            years.extend([int(match) for match in matches])
-
-        return max(years) if years else None
-
-    def _calculate_education_match(self, resume_text: str, jd_text: str) -> float:
-        """Calculate education matching score"""
-        resume_lower = resume_text.lower()
-        jd_lower = jd_text.lower()
-
-        # Check for education keywords in both texts
-        jd_education = [kw for kw in self.education_keywords if kw in jd_lower]
-        resume_education = [kw for kw in self.education_keywords if kw in resume_lower]
-
-        if not jd_education:
+    @staticmethod
+    def _score_education(compiled_jd: CompiledJD, features: ResumeFeatures) -> float:
+        """Score resume education against the compiled JD requirement"""
+        if not compiled_jd.education_bits:
             # No specific education requirement
-            return 85.0 if resume_education else 70.0
+            return 85.0 if features.education_bits else 70.0
 
         # Calculate match percentage
-        matched = set(jd_education).intersection(set(resume_education))
-        match_percentage = (len(matched) / len(jd_education)) * 100
-
-        # Check for degree levels
-        degree_hierarchy = {
-            'phd': 4, 'doctorate': 4,
-            'master': 3, 'm.tech': 3, 'm.e': 3, 'mba': 3, 'mca': 3,
-            'bachelor': 2, 'b.tech': 2, 'b.e': 2, 'bca': 2,
-            'diploma': 1
-        }
-
-        jd_degree_level = max([degree_hierarchy.get(kw, 0) for kw in jd_education], default=0)
-        resume_degree_level = max([degree_hierarchy.get(kw, 0) for kw in resume_education], default=0)
+        matched = (compiled_jd.education_bits & features.education_bits).bit_count()
+        match_percentage = (matched / compiled_jd.education_count) * 100
 
-        if resume_degree_level >= jd_degree_level:
+        if features.degree_level >= compiled_jd.degree_level:
             return min(match_percentage + 20, 100.0)  # Bonus for meeting degree requirement
         else:
             return max(match_percentage - 20, 30.0)   # Penalty for not meeting requirement
 
-    def _get_matched_skills(self, jd_keywords: Dict[str, Set[str]], 
-                           resume_keywords: Dict[str, Set[str]]) -> List[str]:
-        """Get list of matched skills"""
-        jd_skills = jd_keywords['all_skills']
-        resume_skills = resume_keywords['all_skills']
-        matched = jd_skills.intersection(resume_skills)
-        return sorted(list(matched))
-
-    def _get_missing_skills(self, jd_keywords: Dict[str, Set[str]], 
-                           resume_keywords: Dict[str, Set[str]]) -> List[str]:
-        """Get list of skills in JD but missing from resume"""
-        jd_skills = jd_keywords['all_skills']
-        resume_skills = resume_keywords['all_skills']
-        missing = jd_skills - resume_skills
-        return sorted(list(missing))
-
     def _generate_match_details(self, skills_score: float, experience_score: float,
                                 education_score: float, matched_skills: List[str],
                                 missing_skills: List[str]) -> List[str]:
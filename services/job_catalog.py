@@ -0,0 +1,165 @@
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, List, Any, Optional, Set, Union
+
+from services.jd_matcher import JDMatcher, CompiledJD, ResumeFeatures, _iter_bits
+
+logger = logging.getLogger(__name__)
+
+
+class JobCatalog:
+    """
+    Catalog of open job descriptions with an inverted index from skill ID to jobs.
+
+    Each job is compiled once with JDMatcher.compile_jd. Matching a new resume
+    only visits the jobs that share at least one skill with it, so the cost
+    grows with the overlap rather than with the number of open jobs.
+    """
+
+    def __init__(self, jd_matcher: JDMatcher):
+        self.jd_matcher = jd_matcher
+        self._lock = threading.RLock()
+        self._jobs: Dict[int, Dict[str, Any]] = {}
+        self._postings: Dict[int, Set[int]] = {}
+        self._synced_at: Optional[datetime] = None
+        self._vocabulary = jd_matcher.vocabulary
+
+    def __len__(self) -> int:
+        return len(self._jobs)
+
+    def __contains__(self, job_id: int) -> bool:
+        return job_id in self._jobs
+
+    def add_job(self, job_id: int, title: str, description: str):
+        """
+        Add or replace an open job
+
+        Args:
+            job_id: Job identifier
+            title: Job title
+            description: Job description text
+        """
+        compiled = self.jd_matcher.compile_jd(description)
+        with self._lock:
+            self.remove_job(job_id)
+            self._jobs[job_id] = {'title': title, 'description': description, 'compiled': compiled}
+            for skill_id in _iter_bits(compiled.skill_bits):
+                self._postings.setdefault(skill_id, set()).add(job_id)
+
+    def remove_job(self, job_id: int) -> bool:
+        """Remove a job from the catalog"""
+        with self._lock:
+            job = self._jobs.pop(job_id, None)
+            if job is None:
+                return False
+            for skill_id in _iter_bits(job['compiled'].skill_bits):
+                postings = self._postings.get(skill_id)
+                if postings is not None:
+                    postings.discard(job_id)
+                    if not postings:
+                        del self._postings[skill_id]
+            return True
+
+    def _sync_vocabulary(self):
+        """Recompile every job if the skill taxonomy was reloaded"""
+        vocabulary = self.jd_matcher.vocabulary
+        if vocabulary is self._vocabulary:
+            return
+        with self._lock:
+            self._vocabulary = vocabulary
+            jobs = list(self._jobs.items())
+            self._jobs.clear()
+            self._postings.clear()
+            for job_id, job in jobs:
+                self.add_job(job_id, job['title'], job['description'])
+        logger.info(f"Job catalog recompiled for skill taxonomy {vocabulary.version}")
+
+    def sync(self, db) -> int:
+        """
+        Apply job changes made since the previous sync
+
+        Only rows updated since the last sync are read, so repeated syncs
+        cost proportional to the number of changed jobs.
+
+        Args:
+            db: Database session
+
+        Returns:
+            Number of jobs added, updated or removed
+        """
+        from models.db import Job
+
+        query = db.query(Job)
+        if self._synced_at is not None:
+            # >= so jobs updated within the same timestamp as the watermark are not missed;
+            # re-applying an unchanged job is idempotent
+            query = query.filter(Job.updated_at >= self._synced_at)
+
+        changed = 0
+        latest = self._synced_at
+        for job in query.order_by(Job.updated_at).all():
+            if job.status == 'open':
+                self.add_job(job.id, job.title, job.description)
+            else:
+                self.remove_job(job.id)
+            changed += 1
+            if job.updated_at and (latest is None or job.updated_at > latest):
+                latest = job.updated_at
+
+        self._synced_at = latest
+        if changed:
+            logger.info(f"Job catalog synced: {changed} changes, {len(self)} open jobs")
+        return changed
+
+    def candidate_jobs(self, skill_bits: int) -> Set[int]:
+        """Jobs sharing at least one skill with a skill bitmap"""
+        with self._lock:
+            jobs: Set[int] = set()
+            for skill_id in _iter_bits(skill_bits):
+                jobs.update(self._postings.get(skill_id, ()))
+            return jobs
+
+    def get_compiled(self, job_id: int) -> Optional[CompiledJD]:
+        """Compiled JD of a catalog job"""
+        job = self._jobs.get(job_id)
+        return job['compiled'] if job else None
+
+    def match_resume(self, resume: Union[str, ResumeFeatures], top_n: int = 5,
+                     min_score: float = 0.0) -> List[Dict[str, Any]]:
+        """
+        Match a resume against every open job that shares a skill with it
+
+        Args:
+            resume: Resume text or ResumeFeatures
+            top_n: Maximum number of matches returned
+            min_score: Drop matches with a lower overall score
+
+        Returns:
+            Matches sorted by overall score, best first
+        """
+        features = resume if isinstance(resume, ResumeFeatures) else self.jd_matcher.extract_resume_features(resume)
+        features = self.jd_matcher.remap_features(features)
+
+        with self._lock:
+            self._sync_vocabulary()
+            candidates = [(job_id, self._jobs[job_id]) for job_id in self.candidate_jobs(features.skill_bits)]
+
+        matches = []
+        for job_id, job in candidates:
+            result = self.jd_matcher.match_compiled(features, job['compiled'])
+            if result['overall_match'] < min_score:
+                continue
+            matches.append({
+                'job_id': job_id,
+                'title': job['title'],
+                'overall_match': result['overall_match'],
+                'skills_match': result['skills_match'],
+                'experience_match': result['experience_match'],
+                'education_match': result['education_match'],
+                'matched_skills': result['matched_skills'],
+                'missing_skills': result['missing_skills'],
+            })
+
+        matches.sort(key=lambda m: (-m['overall_match'], m['job_id']))
+        return matches[:top_n]
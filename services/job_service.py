@@ -0,0 +1,79 @@
+import logging
+from typing import List, Dict, Any, Optional
+from sqlalchemy.orm import Session
+
+from models.db import Job
+from services.job_catalog import JobCatalog
+
+logger = logging.getLogger(__name__)
+
+
+class JobService:
+    """
+    Handles job description CRUD and keeps the in-memory job catalog in sync.
+    """
+
+    def __init__(self, job_catalog: JobCatalog):
+        self.job_catalog = job_catalog
+
+    def create_job(self, data: Dict[str, Any], db: Session) -> Job:
+        """
+        Creates an open job and adds it to the catalog.
+        
+        Args:
+            data: Job data dict with title and description
+            db: Database session
+            
+        Returns:
+            Created Job object
+        """
+        try:
+            job = Job(title=data['title'], description=data['description'], status='open')
+            db.add(job)
+            db.commit()
+            db.refresh(job)
+
+            self.job_catalog.add_job(job.id, job.title, job.description)
+            logger.info(f"Created job: {job.id} - {job.title}")
+            return job
+
+        except Exception as e:
+            logger.error(f"Error creating job: {str(e)}")
+            db.rollback()
+            raise
+
+    def update_job(self, job_id: int, data: Dict[str, Any], db: Session) -> Optional[Job]:
+        """Update a job; closing it removes it from auto-matching"""
+        try:
+            job = self.get_job_by_id(job_id, db)
+            if not job:
+                return None
+
+            for field in ('title', 'description', 'status'):
+                if data.get(field) is not None:
+                    setattr(job, field, data[field])
+
+            db.commit()
+            db.refresh(job)
+
+            if job.status == 'open':
+                self.job_catalog.add_job(job.id, job.title, job.description)
+            else:
+                self.job_catalog.remove_job(job.id)
+            return job
+
+        except Exception as e:
+            logger.error(f"Error updating job: {str(e)}")
+            db.rollback()
+            raise
+
+    def get_job_by_id(self, job_id: int, db: Session) -> Optional[Job]:
+        """Get job by ID"""
+        return db.query(Job).filter(Job.id == job_id).first()
+
+    def get_jobs(self, db: Session, status: Optional[str] = None, skip: int = 0, limit: int = 100) -> List[Job]:
+        """Get jobs with optional status filter and pagination"""
+        query = db.query(Job)
+        if status:
+            query = query.filter(Job.status == status)
+        return query.order_by(Job.id.desc()).offset(skip).limit(limit).all()
@@ -0,0 +1,165 @@
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, Any, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Score histograms have ten buckets: 0-9, 10-19, ..., 90-100
+HISTOGRAM_BUCKETS = 10
+
+# Uploads within this many days count as recent
+RECENT_DAYS = 7
+
+
+def _empty_bucket() -> Dict[str, Any]:
+    return {
+        'count': 0,
+        'authenticity_sum': 0.0,
+        'match_count': 0,
+        'match_sum': 0.0,
+        'high_quality': 0,
+        'low_quality': 0,
+        'authenticity_histogram': [0] * HISTOGRAM_BUCKETS,
+        'match_histogram': [0] * HISTOGRAM_BUCKETS,
+    }
+
+
+def _histogram_bucket(score: float) -> int:
+    return min(max(int(score // 10), 0), HISTOGRAM_BUCKETS - 1)
+
+
+class ResultStatistics:
+    """
+    Running aggregates over stored analysis results
+
+    Totals and one bucket per upload day are updated as results are saved
+    and deleted, so statistics are read without touching the results.
+    Days that pass the retention period are subtracted from the totals
+    when the statistics are next read.
+    """
+
+    def __init__(self, retention_days: int = 0):
+        """
+        Initialize statistics
+
+        Args:
+            retention_days: Days of uploads counted (0 keeps everything)
+        """
+        self.retention_days = retention_days
+        self.totals = _empty_bucket()
+        self.days: Dict[str, Dict[str, Any]] = {}
+
+    @staticmethod
+    def _scores(result: Dict[str, Any]):
+        authenticity = (result.get('authenticity_score') or {}).get('overall_score', 0) or 0
+        matching = result.get('matching_score')
+        match = (matching.get('overall_match', 0) or 0) if matching else None
+        return authenticity, match
+
+    @staticmethod
+    def _day(result: Dict[str, Any]) -> str:
+        return str(result.get('upload_date') or '')[:10]
+
+    def _update(self, bucket: Dict[str, Any], authenticity: float, match: Optional[float], sign: int):
+        bucket['count'] += sign
+        bucket['authenticity_sum'] += sign * authenticity
+        bucket['authenticity_histogram'][_histogram_bucket(authenticity)] += sign
+        if authenticity >= 80:
+            bucket['high_quality'] += sign
+        elif authenticity < 60:
+            bucket['low_quality'] += sign
+        if match is not None:
+            bucket['match_count'] += sign
+            bucket['match_sum'] += sign * match
+            bucket['match_histogram'][_histogram_bucket(match)] += sign
+
+    def add(self, result: Dict[str, Any]):
+        """Count a saved result"""
+        day = self._day(result)
+        if day not in self.days:
+            if day < self._cutoff_day():
+                return
+            self.days[day] = _empty_bucket()
+        authenticity, match = self._scores(result)
+        self._update(self.days[day], authenticity, match, 1)
+        self._update(self.totals, authenticity, match, 1)
+
+    def remove(self, result: Dict[str, Any]):
+        """Uncount a replaced or deleted result"""
+        bucket = self.days.get(self._day(result))
+        if bucket is None:
+            # Its day has already expired out of the totals
+            return
+        authenticity, match = self._scores(result)
+        self._update(bucket, authenticity, match, -1)
+        self._update(self.totals, authenticity, match, -1)
+        if bucket['count'] <= 0:
+            del self.days[self._day(result)]
+
+    def _cutoff_day(self) -> str:
+        if not self.retention_days:
+            return ''
+        return (datetime.utcnow() - timedelta(days=self.retention_days)).date().isoformat()
+
+    def expire(self):
+        """Subtract days past the retention period from the totals"""
+        cutoff = self._cutoff_day()
+        if not cutoff:
+            return
+        for day in [day for day in self.days if day < cutoff]:
+            bucket = self.days.pop(day)
+            for key, value in bucket.items():
+                if isinstance(value, list):
+                    self.totals[key] = [total - v for total, v in zip(self.totals[key], value)]
+                else:
+                    self.totals[key] -= value
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Statistics in the /api/statistics format
+
+        Returns:
+            Dictionary with statistics
+        """
+        self.expire()
+        totals = self.totals
+        if totals['count'] <= 0:
+            return {
+                'total_resumes': 0,
+                'average_authenticity': 0,
+                'average_jd_match': 0,
+                'high_quality_count': 0,
+                'low_quality_count': 0
+            }
+
+        today = datetime.utcnow().date()
+        recent_days = [(today - timedelta(days=offset)).isoformat() for offset in range(RECENT_DAYS + 1)]
+        return {
+            'total_resumes': totals['count'],
+            'average_authenticity': round(totals['authenticity_sum'] / totals['count'], 1),
+            'average_jd_match': round(totals['match_sum'] / totals['match_count'], 1) if totals['match_count'] else 0,
+            'high_quality_count': totals['high_quality'],
+            'low_quality_count': totals['low_quality'],
+            'recent_uploads': sum(self.days[day]['count'] for day in recent_days if day in self.days),
+            'authenticity_histogram': list(totals['authenticity_histogram']),
+            'match_histogram': list(totals['match_histogram']),
+            'daily_uploads': {day: self.days[day]['count'] for day in recent_days[::-1] if day in self.days}
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'totals': self.totals, 'days': self.days}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], retention_days: int = 0) -> 'ResultStatistics':
+        stats = cls(retention_days)
+        stats.totals = data.get('totals') or _empty_bucket()
+        stats.days = data.get('days') or {}
+        return stats
+
+    @classmethod
+    def from_results(cls, results: List[Dict[str, Any]], retention_days: int = 0) -> 'ResultStatistics':
+        """Build statistics from scratch"""
+        stats = cls(retention_days)
+        for result in results:
+            stats.add(result)
+        return stats
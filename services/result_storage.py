@@ -1,78 +1,494 @@
+import io
+import csv
 import json
+import base64
 import os
+import zlib
+import re
+import uuid
+import heapq
+import bisect
 import logging
-from datetime import datetime
-from typing import List, Optional, Dict, Any
-from pathlib import Path
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import List, Optional, Dict, Any, Iterator, Tuple
+
+from services.result_statistics import ResultStatistics
 
 logger = logging.getLogger(__name__)
 
+try:
+    import fcntl
+except ImportError:  # Windows: single-process locking only
+    fcntl = None
+
+SEGMENT_PATTERN = re.compile(r'^segment-(\d{6})\.jsonl$')
+
+# Appends between checks for results that have passed the retention period
+RETENTION_CHECK_INTERVAL = 1000
+
+# Appends between writes of the statistics snapshot
+STATISTICS_PERSIST_INTERVAL = 50
+
+CSV_FIELDNAMES = [
+    'id', 'filename', 'upload_date', 'file_size',
+    'authenticity_score', 'font_consistency', 'grammar_score',
+    'formatting_score', 'jd_match', 'skills_match',
+    'experience_match', 'education_match'
+]
+
+
+def result_to_csv_row(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Flatten an analysis result into a CSV export row"""
+    auth_score = result.get('authenticity_score') or {}
+    match_score = result.get('matching_score') or {}
+    return {
+        'id': result.get('id', ''),
+        'filename': result.get('filename', ''),
+        'upload_date': result.get('upload_date', ''),
+        'file_size': result.get('file_size', 0),
+        'authenticity_score': auth_score.get('overall_score', 0),
+        'font_consistency': auth_score.get('font_consistency', 0),
+        'grammar_score': auth_score.get('grammar_score', 0),
+        'formatting_score': auth_score.get('formatting_score', 0),
+        'jd_match': match_score.get('overall_match', 0),
+        'skills_match': match_score.get('skills_match', 0),
+        'experience_match': match_score.get('experience_match', 0),
+        'education_match': match_score.get('education_match', 0),
+    }
+
 
 class ResultStorage:
-    """Handles persistence of resume analysis results"""
+    """
+    Handles persistence of resume analysis results
+
+    Results are stored in an append-only log of JSONL segment files. Each
+    save appends one line; deletes append a tombstone. An in-memory index
+    maps result ID to (segment, offset, length), so lookups read a single
+    line. The active segment is rotated at a size limit, and segments are
+    compacted (live records rewritten, dead ones dropped) once enough of
+    the log is superseded, deleted or past the retention period.
+
+    Statistics are running aggregates updated with each save and delete and
+    snapshotted next to the log along with the segment sizes they cover.
+    """
+
+    def __init__(self, storage_dir: str = "results", retention_days: int = 90,
+                 segment_max_bytes: int = 16 * 1024 * 1024, compact_min_bytes: int = 1024 * 1024,
+                 compact_ratio: float = 0.5):
+        """
+        Initialize storage
 
-    def __init__(self, storage_dir: str = "results"):
+        Args:
+            storage_dir: Directory holding the log
+            retention_days: Results older than this are dropped (0 keeps everything)
+            segment_max_bytes: Size at which the active segment is rotated
+            compact_min_bytes: Minimum log size before compaction is considered
+            compact_ratio: Compact when this share of the log is dead
+        """
         self.storage_dir = storage_dir
-        self.results_file = os.path.join(storage_dir, "analysis_results.json")
+        self.segments_dir = os.path.join(storage_dir, "segments")
+        self.results_file = os.path.join(storage_dir, "analysis_results.json")  # Legacy format
+        self.retention_days = retention_days
+        self.segment_max_bytes = segment_max_bytes
+        self.compact_min_bytes = compact_min_bytes
+        self.compact_ratio = compact_ratio
+
+        self._lock = threading.RLock()
+        self._index: Dict[str, Tuple[int, int, int, str]] = {}  # id -> (segment, offset, length, upload_date)
+        self._segment_sizes: Dict[int, int] = {}  # Bytes of each segment already indexed
+        self._order: List[Tuple[str, str]] = []  # (upload_date, id) of indexed results, ascending
+        self._live_bytes = 0
+        self._appends = 0
+        self._retention_checked_at = 0  # Append count at the last retention check
+        self._stats = ResultStatistics(retention_days)
+        self._stats_path = os.path.join(self.segments_dir, "statistics.json")
+        self._track_stats = False
         self._ensure_storage_exists()
 
+    # -- log files -----------------------------------------------------------
+
     def _ensure_storage_exists(self):
-        """Ensure storage directory and file exist"""
+        """Ensure storage directories exist, migrate the legacy file and build the index"""
         try:
-            os.makedirs(self.storage_dir, exist_ok=True)
-            if not os.path.exists(self.results_file):
-                self._write_results([])
+            os.makedirs(self.segments_dir, exist_ok=True)
+            with self._lock:
+                self._load_index()
+                if not self._segment_sizes and os.path.exists(self.results_file):
+                    self._migrate_legacy()
         except Exception as e:
             logger.error(f"Error creating storage: {str(e)}")
 
+    @contextmanager
+    def _file_lock(self, exclusive: bool = False):
+        """Inter-process lock: appends share it, compaction holds it exclusively"""
+        if fcntl is None:
+            yield
+            return
+        with open(os.path.join(self.segments_dir, '.lock'), 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _segment_path(self, segment: int) -> str:
+        return os.path.join(self.segments_dir, f"segment-{segment:06d}.jsonl")
+
+    def _list_segments(self) -> List[int]:
+        segments = []
+        for name in os.listdir(self.segments_dir):
+            match = SEGMENT_PATTERN.match(name)
+            if match:
+                segments.append(int(match.group(1)))
+        return sorted(segments)
+
+    def _active_segment(self) -> int:
+        """Segment new records are appended to, rotating when it is full"""
+        if not self._segment_sizes:
+            return 1
+        segment = max(self._segment_sizes)
+        if self._segment_sizes[segment] >= self.segment_max_bytes:
+            return segment + 1
+        return segment
+
+    def _load_index(self):
+        """Rebuild the index from every segment"""
+        self._track_stats = False
+        self._index.clear()
+        self._order = []
+        self._segment_sizes.clear()
+        self._live_bytes = 0
+        for segment in self._list_segments():
+            self._segment_sizes[segment] = 0
+            self._scan_segment(segment)
+        self._load_statistics()
+        self._track_stats = True
+
+    def _load_statistics(self):
+        """Load the statistics snapshot, or rebuild it if the log has changed since"""
+        try:
+            if os.path.exists(self._stats_path):
+                with open(self._stats_path, 'r', encoding='utf-8') as f:
+                    snapshot = json.load(f)
+                if snapshot.get('segment_sizes') == {str(k): v for k, v in self._segment_sizes.items()}:
+                    self._stats = ResultStatistics.from_dict(snapshot['statistics'], self.retention_days)
+                    return
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable statistics snapshot: {str(e)}")
+
+        self._stats = ResultStatistics.from_results(
+            self._iter_records(self._live_locations()), self.retention_days
+        )
+        if self._segment_sizes:
+            self._persist_statistics()
+
+    def _persist_statistics(self):
+        """Snapshot the statistics with the segment sizes they cover"""
+        try:
+            snapshot = {
+                'segment_sizes': {str(k): v for k, v in self._segment_sizes.items()},
+                'statistics': self._stats.to_dict()
+            }
+            tmp_path = f"{self._stats_path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(snapshot, f)
+            os.replace(tmp_path, self._stats_path)
+        except Exception as e:
+            logger.error(f"Error saving statistics snapshot: {str(e)}")
+
+    def _scan_segment(self, segment: int):
+        """Index the complete lines of a segment past the bytes already indexed"""
+        path = self._segment_path(segment)
+        start = self._segment_sizes.get(segment, 0)
+        with open(path, 'rb') as f:
+            f.seek(start)
+            data = f.read()
+
+        # A crash mid-append leaves a partial last line; it is skipped until completed
+        end = data.rfind(b'\n') + 1
+        offset = start
+        for line in data[:end].split(b'\n')[:-1]:
+            length = len(line) + 1
+            try:
+                entry = json.loads(line)
+                self._apply(entry, segment, offset, length)
+            except ValueError:
+                logger.warning(f"Skipping corrupt result log entry in segment {segment} at {offset}")
+            offset += length
+        self._segment_sizes[segment] = start + end
+
+    def _apply(self, entry: Dict[str, Any], segment: int, offset: int, length: int):
+        """Apply one log entry to the index"""
+        result_id = entry.get('id')
+        previous = self._index.pop(result_id, None)
+        if previous is not None:
+            self._unorder(str(previous[3]), result_id)
+            self._live_bytes -= previous[2]
+            if self._track_stats:
+                old = self._read_entry(previous)
+                if old is not None:
+                    self._stats.remove(old)
+        if entry.get('deleted'):
+            return
+        upload_date = entry.get('data', {}).get('upload_date', '')
+        if self._is_expired(upload_date):
+            return
+        self._index[result_id] = (segment, offset, length, upload_date)
+        bisect.insort(self._order, (str(upload_date), result_id))
+        self._live_bytes += length
+        if self._track_stats:
+            self._stats.add(entry['data'])
+
+    def _unorder(self, upload_date: str, result_id: str):
+        """Drop a result from the sorted key list"""
+        i = bisect.bisect_left(self._order, (upload_date, result_id))
+        if i < len(self._order) and self._order[i] == (upload_date, result_id):
+            del self._order[i]
+
+    def _refresh(self):
+        """Pick up records appended by other processes sharing the directory"""
+        segments = self._list_segments()
+        if any(segment not in segments for segment in self._segment_sizes):
+            # Another process compacted the log
+            self._load_index()
+            return
+        for segment in segments:
+            size = os.path.getsize(self._segment_path(segment))
+            if size > self._segment_sizes.get(segment, 0):
+                self._scan_segment(segment)
+
+    def _append(self, entry: Dict[str, Any]):
+        """Append one entry to the active segment and index it"""
+        self._append_many([entry])
+
+    def _append_many(self, entries: List[Dict[str, Any]]):
+        """Append entries to the active segment with a single write and index them"""
+        lines = [(json.dumps(entry, default=str) + '\n').encode('utf-8') for entry in entries]
+        data = b''.join(lines)
+        with self._file_lock():
+            self._refresh()
+            segment = self._active_segment()
+            # O_APPEND keeps concurrent appends from separate processes whole
+            with open(self._segment_path(segment), 'ab') as f:
+                f.write(data)
+                f.flush()
+                end = f.tell()
+        persisted_at = self._appends // STATISTICS_PERSIST_INTERVAL
+        self._appends += len(entries)
+        offset = end - len(data)
+        if offset != self._segment_sizes.get(segment, 0):
+            # Other processes appended since the last scan; index their entries first
+            self._scan_segment(segment)
+        else:
+            self._segment_sizes[segment] = end
+            for entry, line in zip(entries, lines):
+                self._apply(entry, segment, offset, len(line))
+                offset += len(line)
+        if self._appends // STATISTICS_PERSIST_INTERVAL != persisted_at:
+            self._persist_statistics()
+
+    def _read_entry(self, location: Tuple[int, int, int, str], handle=None) -> Optional[Dict[str, Any]]:
+        segment, offset, length, _ = location
+        f = handle or open(self._segment_path(segment), 'rb')
+        try:
+            f.seek(offset)
+            return json.loads(f.read(length)).get('data')
+        finally:
+            if handle is None:
+                f.close()
+
+    def _open_segments(self, locations: List[Tuple[int, int, int, str]]) -> Dict[int, Any]:
+        """
+        Open every segment holding the given locations
+
+        Open handles stay readable after compaction deletes their files, so
+        readers that outlive the lock (streamed exports) open them up front.
+        """
+        handles = {}
+        try:
+            for segment in sorted({location[0] for location in locations}):
+                handles[segment] = open(self._segment_path(segment), 'rb')
+        except Exception:
+            for handle in handles.values():
+                handle.close()
+            raise
+        return handles
+
+    def _iter_entries(self, locations: List[Tuple[int, int, int, str]],
+                      handles: Optional[Dict[int, Any]] = None) -> Iterator[Tuple[tuple, Dict[str, Any]]]:
+        """Read (location, record) pairs, keeping one open handle per segment (handles are closed when done)"""
+        handles = handles if handles is not None else {}
+        try:
+            for location in locations:
+                segment = location[0]
+                if segment not in handles:
+                    handles[segment] = open(self._segment_path(segment), 'rb')
+                record = self._read_entry(location, handles[segment])
+                if record is not None:
+                    yield location, record
+        finally:
+            for handle in handles.values():
+                handle.close()
+
+    def _iter_records(self, locations: List[Tuple[int, int, int, str]],
+                      handles: Optional[Dict[int, Any]] = None) -> Iterator[Dict[str, Any]]:
+        """Read records at the given index locations"""
+        for _, record in self._iter_entries(locations, handles):
+            yield record
+
+    def _is_expired(self, upload_date: Optional[str]) -> bool:
+        if not self.retention_days or not upload_date:
+            return False
+        cutoff = (datetime.utcnow() - timedelta(days=self.retention_days)).isoformat()
+        return str(upload_date) < cutoff
+
+    def _live_locations(self) -> List[Tuple[int, int, int, str]]:
+        """Index entries within retention, in log order"""
+        return sorted(
+            (location for location in self._index.values() if not self._is_expired(location[3])),
+            key=lambda location: (location[0], location[1])
+        )
+
     def _read_results(self) -> List[Dict[str, Any]]:
-        """Read all results from storage"""
+        """Read all live results in the order they were saved"""
         try:
-            if os.path.exists(self.results_file):
-                with open(self.results_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            return []
+            with self._lock:
+                self._refresh()
+                locations = self._live_locations()
+                return list(self._iter_records(locations))
         except Exception as e:
             logger.error(f"Error reading results: {str(e)}")
             return []
 
-    def _write_results(self, results: List[Dict[str, Any]]):
-        """Write results to storage"""
+    # -- maintenance ---------------------------------------------------------
+
+    def _maybe_compact(self):
+        """Compact when enough of the log is dead"""
+        total = sum(self._segment_sizes.values())
+        if total < self.compact_min_bytes:
+            return
+        dead = total - self._live_bytes
+        # Batched appends advance the count by more than one, so compare against the last check
+        if self.retention_days and self._appends - self._retention_checked_at >= RETENTION_CHECK_INTERVAL:
+            self._retention_checked_at = self._appends
+            dead += sum(location[2] for location in self._index.values() if self._is_expired(location[3]))
+        if dead >= total * self.compact_ratio:
+            self.compact()
+
+    def compact(self) -> int:
+        """
+        Rewrite live records into fresh segments and delete the old ones
+
+        Returns:
+            Number of bytes reclaimed
+        """
+        with self._lock, self._file_lock(exclusive=True):
+            try:
+                self._refresh()
+                old_segments = sorted(self._segment_sizes)
+                if not old_segments:
+                    return 0
+                before = sum(self._segment_sizes.values())
+                locations = self._live_locations()
+                ids = {(location[0], location[1]): result_id for result_id, location in self._index.items()}
+
+                segment = old_segments[-1] + 1
+                new_sizes: Dict[int, int] = {}
+                new_index: Dict[str, Tuple[int, int, int, str]] = {}
+                tmp_path = self._segment_path(segment) + '.tmp'
+                out = open(tmp_path, 'wb')
+                size = 0
+                for location, record in self._iter_entries(locations):
+                    if size >= self.segment_max_bytes:
+                        out.close()
+                        os.replace(tmp_path, self._segment_path(segment))
+                        new_sizes[segment] = size
+                        segment += 1
+                        tmp_path = self._segment_path(segment) + '.tmp'
+                        out = open(tmp_path, 'wb')
+                        size = 0
+                    result_id = ids[(location[0], location[1])]
+                    line = (json.dumps({'id': result_id, 'data': record}, default=str) + '\n').encode('utf-8')
+                    out.write(line)
+                    new_index[result_id] = (segment, size, len(line), location[3])
+                    size += len(line)
+                out.close()
+                os.replace(tmp_path, self._segment_path(segment))
+                new_sizes[segment] = size
+
+                for old in old_segments:
+                    os.remove(self._segment_path(old))
+
+                self._index = new_index
+                self._order = sorted((str(location[3]), result_id) for result_id, location in new_index.items())
+                self._segment_sizes = new_sizes
+                self._live_bytes = sum(location[2] for location in new_index.values())
+                reclaimed = before - sum(new_sizes.values())
+                self._persist_statistics()
+                logger.info(f"Compacted result log: {len(new_index)} live results, {reclaimed} bytes reclaimed")
+                return reclaimed
+            except Exception as e:
+                logger.error(f"Error compacting result log: {str(e)}")
+                return 0
+
+    def _migrate_legacy(self):
+        """Import the legacy analysis_results.json into the log"""
         try:
-            with open(self.results_file, 'w', encoding='utf-8') as f:
-                json.dump(results, f, indent=2, default=str)
+            with open(self.results_file, 'r', encoding='utf-8') as f:
+                legacy = json.load(f)
+            for record in legacy:
+                self._append({'id': record.get('id') or str(uuid.uuid4()), 'data': record})
+            os.replace(self.results_file, self.results_file + '.migrated')
+            logger.info(f"Migrated {len(legacy)} results from {self.results_file}")
         except Exception as e:
-            logger.error(f"Error writing results: {str(e)}")
-            raise
+            logger.error(f"Error migrating legacy results: {str(e)}")
+
+    # -- public API ----------------------------------------------------------
 
     def save_result(self, analysis: Dict[str, Any]) -> bool:
         """
         Save a single analysis result
-        
+
         Args:
             analysis: Analysis result dictionary
-            
+
         Returns:
             True if successful, False otherwise
         """
+        return self.save_results([analysis])
+
+    def save_results(self, analyses: List[Dict[str, Any]]) -> bool:
+        """
+        Save several analysis results with one append (group commit)
+
+        Args:
+            analyses: Analysis result dictionaries
+
+        Returns:
+            True if all were saved, False otherwise
+        """
         try:
-            results = self._read_results()
-            
-            # Add timestamp if not present
-            if 'upload_date' not in analysis:
-                analysis['upload_date'] = datetime.utcnow().isoformat()
-            
-            # Add to results
-            results.append(analysis)
-            
-            # Keep only last 100 results to prevent file from growing too large
-            if len(results) > 100:
-                results = results[-100:]
-            
-            self._write_results(results)
-            logger.info(f"Saved result for {analysis.get('filename', 'unknown')}")
+            entries = []
+            for analysis in analyses:
+                # Add timestamp if not present; stored as ISO text so the log sorts by it
+                if 'upload_date' not in analysis:
+                    analysis['upload_date'] = datetime.utcnow().isoformat()
+                elif isinstance(analysis['upload_date'], datetime):
+                    analysis['upload_date'] = analysis['upload_date'].isoformat()
+                entries.append({'id': analysis.get('id') or str(uuid.uuid4()), 'data': analysis})
+            if not entries:
+                return True
+
+            with self._lock:
+                self._append_many(entries)
+                self._maybe_compact()
+
+            for analysis in analyses:
+                logger.info(f"Saved result for {analysis.get('filename', 'unknown')}")
             return True
-            
+
         except Exception as e:
             logger.error(f"Error saving result: {str(e)}")
             return False
@@ -80,45 +496,123 @@ class ResultStorage:
     def get_all_results(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
         """
         Get all stored results
-        
+
         Args:
             limit: Maximum number of results to return (most recent first)
-            
+
         Returns:
             List of analysis results
         """
         try:
-            results = self._read_results()
-            
-            # Sort by upload date (most recent first)
-            results.sort(key=lambda x: x.get('upload_date', ''), reverse=True)
-            
-            if limit:
-                results = results[:limit]
-            
-            return results
-            
+            with self._lock:
+                self._refresh()
+                locations = self._live_locations()
+                # Most recent first; ties keep the later save first
+                key = lambda location: (str(location[3]), location[0], location[1])
+                if limit:
+                    locations = heapq.nlargest(limit, locations, key=key)
+                else:
+                    locations = sorted(locations, key=key, reverse=True)
+                return list(self._iter_records(locations))
+
         except Exception as e:
             logger.error(f"Error getting results: {str(e)}")
             return []
 
+    def get_results_page(self, limit: int = 50, cursor: Optional[str] = None,
+                         fields: Optional[List[str]] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Get one page of results, most recent first, by keyset on (upload date, ID)
+
+        Args:
+            limit: Page size
+            cursor: Cursor returned with the previous page (None for the first page)
+            fields: Fields to return (see project_result; None returns full records)
+
+        Returns:
+            Tuple of (results, cursor for the next page or None on the last page)
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        after = decode_cursor(cursor) if cursor else None
+        try:
+            with self._lock:
+                self._refresh()
+                # Seek the cursor in the sorted key list and walk back one page
+                # (O(log N + limit)); only the page's records are read
+                position = bisect.bisect_left(self._order, after) if after else len(self._order)
+                page = []
+                while position > 0 and len(page) <= limit:
+                    position -= 1
+                    upload_date, result_id = self._order[position]
+                    location = self._index[result_id]
+                    if not self._is_expired(location[3]):
+                        page.append((upload_date, result_id, location))
+                records = list(self._iter_records([c[2] for c in page[:limit]]))
+
+            next_cursor = encode_cursor(*page[limit - 1][:2]) if len(page) > limit else None
+            return [project_result(record, fields) for record in records], next_cursor
+
+        except Exception as e:
+            logger.error(f"Error getting results page: {str(e)}")
+            return [], None
+
+    def iter_results(self, start_date: Optional[str] = None, end_date: Optional[str] = None,
+                     min_score: Optional[float] = None, max_score: Optional[float] = None,
+                     min_match: Optional[float] = None, has_jd: Optional[bool] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Stream results in upload order, one record in memory at a time
+
+        Args:
+            start_date: Earliest upload date (ISO date or timestamp, inclusive)
+            end_date: Latest upload date (ISO date or timestamp, inclusive)
+            min_score: Minimum authenticity score
+            max_score: Maximum authenticity score
+            min_match: Minimum JD match score (results without a JD match are excluded)
+            has_jd: Only results with (True) or without (False) a JD match
+
+        Yields:
+            Analysis results
+        """
+        # The records are read after the lock is released, while the consumer
+        # streams them; the segments are opened under the lock so a compaction
+        # (here or in another process) meanwhile cannot remove them from under us
+        with self._lock, self._file_lock():
+            self._refresh()
+            # Dates are filtered from the index; only candidate records are read
+            locations = [
+                location for location in self._live_locations()
+                if (not start_date or str(location[3]) >= start_date)
+                and (not end_date or str(location[3])[:len(end_date)] <= end_date)
+            ]
+            handles = self._open_segments(locations)
+        locations.sort(key=lambda location: (str(location[3]), location[0], location[1]))
+
+        for record in self._iter_records(locations, handles):
+            if result_matches(record, min_score, max_score, min_match, has_jd):
+                yield record
+
     def get_result_by_id(self, result_id: str) -> Optional[Dict[str, Any]]:
         """
         Get a specific result by ID
-        
+
         Args:
             result_id: The ID of the result to retrieve
-            
+
         Returns:
             Analysis result or None if not found
         """
         try:
-            results = self._read_results()
-            for result in results:
-                if result.get('id') == result_id:
-                    return result
-            return None
-            
+            with self._lock:
+                location = self._index.get(result_id)
+                if location is None:
+                    self._refresh()
+                    location = self._index.get(result_id)
+                if location is None or self._is_expired(location[3]):
+                    return None
+                return self._read_entry(location)
+
         except Exception as e:
             logger.error(f"Error getting result by ID: {str(e)}")
             return None
@@ -126,26 +620,24 @@ class ResultStorage:
     def delete_result(self, result_id: str) -> bool:
         """
         Delete a specific result
-        
+
         Args:
             result_id: The ID of the result to delete
-            
+
         Returns:
             True if successful, False otherwise
         """
         try:
-            results = self._read_results()
-            original_length = len(results)
-            
-            results = [r for r in results if r.get('id') != result_id]
-            
-            if len(results) < original_length:
-                self._write_results(results)
-                logger.info(f"Deleted result {result_id}")
-                return True
-            
-            return False
-            
+            with self._lock:
+                self._refresh()
+                if result_id not in self._index:
+                    return False
+                self._append({'id': result_id, 'deleted': True})
+                self._maybe_compact()
+
+            logger.info(f"Deleted result {result_id}")
+            return True
+
         except Exception as e:
             logger.error(f"Error deleting result: {str(e)}")
             return False
@@ -153,61 +645,23 @@ class ResultStorage:
     def get_statistics(self) -> Dict[str, Any]:
         """
         Get statistics about stored results
-        
+
         Returns:
             Dictionary with statistics
         """
         try:
-            results = self._read_results()
-            
-            if not results:
-                return {
-                    'total_resumes': 0,
-                    'average_authenticity': 0,
-                    'average_jd_match': 0,
-                    'high_quality_count': 0,
-                    'low_quality_count': 0
-                }
-            
-            # Calculate statistics
-            authenticity_scores = [
-                r.get('authenticity_score', {}).get('overall_score', 0)
-                for r in results
-            ]
-            
-            jd_matches = [
-                r.get('matching_score', {}).get('overall_match', 0)
-                for r in results
-                if r.get('matching_score')
-            ]
-            
-            high_quality = sum(1 for score in authenticity_scores if score >= 80)
-            low_quality = sum(1 for score in authenticity_scores if score < 60)
-            
-            return {
-                'total_resumes': len(results),
-                'average_authenticity': round(sum(authenticity_scores) / len(authenticity_scores), 1),
-                'average_jd_match': round(sum(jd_matches) / len(jd_matches), 1) if jd_matches else 0,
-                'high_quality_count': high_quality,
-                'low_quality_count': low_quality,
-                'recent_uploads': len([r for r in results if self._is_recent(r.get('upload_date'))])
-            }
-            
+            with self._lock:
+                self._refresh()
+                return self._stats.summary()
+
         except Exception as e:
             logger.error(f"Error calculating statistics: {str(e)}")
             return {}
 
-    def _is_recent(self, date_str: Optional[str], days: int = 7) -> bool:
-        """Check if a date is within the last N days"""
-        if not date_str:
-            return False
-        
-        try:
-            upload_date = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
-            days_ago = (datetime.utcnow() - upload_date).days
-            return days_ago <= days
-        except:
-            return False
+    def close(self):
+        """Write the statistics snapshot (call on shutdown)"""
+        with self._lock:
+            self._persist_statistics()
 
     def export_to_csv(self, output_path: str) -> bool:
         """
@@ -220,43 +674,15 @@ class ResultStorage:
             True if successful, False otherwise
         """
         try:
-            import csv
-            
             results = self._read_results()
             if not results:
                 return False
             
             with open(output_path, 'w', newline='', encoding='utf-8') as csvfile:
-                fieldnames = [
-                    'id', 'filename', 'upload_date', 'file_size',
-                    'authenticity_score', 'font_consistency', 'grammar_score',
-                    'formatting_score', 'jd_match', 'skills_match',
-                    'experience_match', 'education_match'
-                ]
-                
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+                writer = csv.DictWriter(csvfile, fieldnames=CSV_FIELDNAMES)
                 writer.writeheader()
-                
                 for result in results:
-                    auth_score = result.get('authenticity_score', {})
-                    match_score = result.get('matching_score', {})
-                    
-                    row = {
-                        'id': result.get('id', ''),
-                        'filename': result.get('filename', ''),
-                        'upload_date': result.get('upload_date', ''),
-                        'file_size': result.get('file_size', 0),
-                        'authenticity_score': auth_score.get('overall_score', 0),
-                        'font_consistency': auth_score.get('font_consistency', 0),
-                        'grammar_score': auth_score.get('grammar_score', 0),
-                        'formatting_score': auth_score.get('formatting_score', 0),
-                        'jd_match': match_score.get('overall_match', 0) if match_score else 0,
-                        'skills_match': match_score.get('skills_match', 0) if match_score else 0,
-                        'experience_match': match_score.get('experience_match', 0) if match_score else 0,
-                        'education_match': match_score.get('education_match', 0) if match_score else 0,
-                    }
-                    
-                    writer.writerow(row)
+                    writer.writerow(result_to_csv_row(result))
             
             logger.info(f"Exported {len(results)} results to {output_path}")
             return True
@@ -264,3 +690,159 @@ class ResultStorage:
         except Exception as e:
             logger.error(f"Error exporting to CSV: {str(e)}")
             return False
+
+
+# Fields returned for fields=summary: enough for a results list, without diagnostics
+SUMMARY_FIELDS = [
+    'id', 'filename', 'file_size', 'upload_date', 'status', 'personal_info',
+    'authenticity_score.overall_score', 'matching_score.overall_match'
+]
+
+
+def parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """Parse a fields= parameter: comma-separated (dotted) paths, or summary"""
+    if not fields:
+        return None
+    if fields.strip() == 'summary':
+        return SUMMARY_FIELDS
+    return [field.strip() for field in fields.split(',') if field.strip()] or None
+
+
+def project_result(result: Dict[str, Any], fields: Optional[List[str]]) -> Dict[str, Any]:
+    """
+    Keep only the given fields of a result
+
+    Args:
+        result: Analysis result
+        fields: Top-level keys or dotted paths into nested objects (None keeps everything)
+
+    Returns:
+        Projected result; missing fields are left out
+    """
+    if not fields:
+        return result
+    projected: Dict[str, Any] = {}
+    for field in fields:
+        parts = field.split('.')
+        value = result
+        for part in parts:
+            if not isinstance(value, dict) or part not in value:
+                break
+            value = value[part]
+        else:
+            target = projected
+            for part in parts[:-1]:
+                target = target.setdefault(part, {})
+            target[parts[-1]] = value
+    return projected
+
+
+def needs_diagnostics(fields: Optional[List[str]]) -> bool:
+    """Whether a projection includes the authenticity diagnostics"""
+    if not fields:
+        return True
+    return any(
+        field == 'authenticity_score' or field.startswith('authenticity_score.diagnostics')
+        for field in fields
+    )
+
+
+def encode_cursor(upload_date: Any, result_id: str) -> str:
+    """Opaque page cursor for the (upload date, ID) position of a result"""
+    raw = json.dumps([str(upload_date or ''), result_id]).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii')
+
+
+def decode_cursor(cursor: str) -> Tuple[str, str]:
+    """
+    Decode a page cursor
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        upload_date, result_id = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+        return str(upload_date), str(result_id)
+    except Exception:
+        raise ValueError(f"Invalid cursor: {cursor}")
+
+
+def result_matches(result: Dict[str, Any], min_score: Optional[float] = None,
+                   max_score: Optional[float] = None, min_match: Optional[float] = None,
+                   has_jd: Optional[bool] = None) -> bool:
+    """Check a result against export score and JD filters"""
+    score = (result.get('authenticity_score') or {}).get('overall_score', 0) or 0
+    match_score = result.get('matching_score')
+    if min_score is not None and score < min_score:
+        return False
+    if max_score is not None and score > max_score:
+        return False
+    if has_jd is not None and bool(match_score) != has_jd:
+        return False
+    if min_match is not None and (not match_score or (match_score.get('overall_match') or 0) < min_match):
+        return False
+    return True
+
+
+def iter_csv(results: Iterator[Dict[str, Any]], columns: Optional[List[str]] = None,
+             compress: bool = False, batch_rows: int = 500) -> Iterator[bytes]:
+    """
+    Encode results as CSV chunks without materializing the export
+
+    Args:
+        results: Results to export
+        columns: Columns to include, in order (defaults to CSV_FIELDNAMES)
+        compress: Gzip the stream
+        batch_rows: Rows encoded per chunk
+
+    Yields:
+        CSV (or gzip) bytes, the header first
+    """
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=columns or CSV_FIELDNAMES, extrasaction='ignore')
+    gzip = zlib.compressobj(wbits=31) if compress else None
+
+    def drain() -> bytes:
+        data = buffer.getvalue().encode('utf-8')
+        buffer.seek(0)
+        buffer.truncate()
+        return gzip.compress(data) if gzip else data
+
+    writer.writeheader()
+    yield drain()
+    rows = 0
+    for result in results:
+        writer.writerow(result_to_csv_row(result))
+        rows += 1
+        if rows % batch_rows == 0:
+            chunk = drain()
+            if chunk:
+                yield chunk
+    chunk = drain()
+    if gzip:
+        chunk += gzip.flush()
+    if chunk:
+        yield chunk
+
+
+def create_result_storage(backend: str = "jsonl", storage_dir: str = "results", retention_days: int = 90,
+                          segment_max_bytes: int = 16 * 1024 * 1024):
+    """
+    Create the configured result storage backend
+
+    Args:
+        backend: "jsonl" (append-only segment log) or "sqlite" (WAL-mode database)
+        storage_dir: Directory holding the results
+        retention_days: Results older than this are dropped (0 keeps everything)
+        segment_max_bytes: Segment rotation size (jsonl backend only)
+
+    Returns:
+        ResultStorage or SQLiteResultStorage
+    """
+    backend = (backend or "jsonl").lower()
+    if backend == "sqlite":
+        from services.sqlite_result_storage import SQLiteResultStorage
+        return SQLiteResultStorage(storage_dir, retention_days=retention_days)
+    if backend != "jsonl":
+        logger.warning(f"Unknown result storage backend '{backend}', using jsonl")
+    return ResultStorage(storage_dir, retention_days=retention_days, segment_max_bytes=segment_max_bytes)
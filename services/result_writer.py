@@ -0,0 +1,156 @@
+import asyncio
+import logging
+from typing import Dict, Any, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncResultWriter:
+    """
+    Single background writer for analysis results
+
+    Request handlers enqueue results instead of writing them. The writer
+    task collects whatever is pending (up to max_batch, waiting at most
+    max_delay for more) and commits it with one save_results call in a
+    worker thread, so storage I/O stays off the event loop and concurrent
+    scans share a write.
+
+    The task starts on the first submit (so it runs on the serving loop
+    even where startup events are not fired) and must be closed on
+    shutdown to flush what is still queued.
+    """
+
+    def __init__(self, storage, max_batch: int = 64, max_delay: float = 0.05,
+                 wait_for_commit: bool = False, max_queue: int = 10000):
+        """
+        Initialize writer
+
+        Args:
+            storage: ResultStorage or SQLiteResultStorage
+            max_batch: Most results committed together
+            max_delay: Seconds a result waits for others to share its commit
+            wait_for_commit: Acknowledge submits only once committed
+            max_queue: Pending results before submitters wait
+        """
+        self.storage = storage
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.wait_for_commit = wait_for_commit
+        self.max_queue = max_queue
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._batch: List[Tuple[Dict[str, Any], Optional[asyncio.Future]]] = []
+        self.batches = 0
+        self.written = 0
+        self.failed = 0
+
+    def _ensure_started(self):
+        """Start the writer task on the running loop"""
+        loop = asyncio.get_running_loop()
+        if self._loop is loop and self._task is not None and not self._task.done():
+            return
+        if self._queue is not None and self._loop is not loop:
+            # The previous loop is gone; commit what it left behind
+            self._drain_sync()
+        self._loop = loop
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._task = loop.create_task(self._run())
+
+    def _drain_sync(self):
+        # Results the old task had taken but not committed, then whatever is still queued
+        leftover = [result for result, _ in self._batch]
+        self._batch = []
+        while not self._queue.empty():
+            leftover.append(self._queue.get_nowait()[0])
+        if leftover:
+            self._commit(leftover)
+
+    async def submit(self, result: Dict[str, Any], wait: Optional[bool] = None) -> bool:
+        """
+        Queue a result for writing
+
+        Args:
+            result: Analysis result dictionary
+            wait: Wait until the result is committed (defaults to wait_for_commit)
+
+        Returns:
+            True once queued, or the commit outcome when waiting
+        """
+        self._ensure_started()
+        future = self._loop.create_future() if (self.wait_for_commit if wait is None else wait) else None
+        await self._queue.put((result, future))
+        if future is None:
+            return True
+        return await future
+
+    async def flush(self):
+        """Wait until everything queued so far is committed"""
+        if self._queue is None:
+            return
+        if self._loop is asyncio.get_running_loop():
+            await self._queue.join()
+        else:
+            # Queued on a loop that is gone; commit here and restart on the next submit
+            self._drain_sync()
+            self._queue = None
+            self._task = None
+
+    async def close(self):
+        """Flush pending results and stop the writer task"""
+        if self._task is None:
+            return
+        try:
+            if self._loop is asyncio.get_running_loop():
+                await self.flush()
+                self._task.cancel()
+            else:
+                self._drain_sync()
+        finally:
+            self._task = None
+
+    async def _run(self):
+        while True:
+            batch = self._batch = [await self._queue.get()]
+            deadline = self._loop.time() + self.max_delay
+            while len(batch) < self.max_batch:
+                timeout = deadline - self._loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            await self._commit_batch(batch)
+            self._batch = []
+
+    async def _commit_batch(self, batch: List[Tuple[Dict[str, Any], Optional[asyncio.Future]]]):
+        try:
+            ok = await asyncio.to_thread(self._commit, [result for result, _ in batch])
+        except Exception as e:
+            logger.error(f"Error writing result batch: {str(e)}")
+            ok = False
+        for _, future in batch:
+            if future is not None and not future.done():
+                future.set_result(ok)
+            self._queue.task_done()
+
+    def _commit(self, results: List[Dict[str, Any]]) -> bool:
+        ok = self.storage.save_results(results)
+        self.batches += 1
+        if ok:
+            self.written += len(results)
+        else:
+            self.failed += len(results)
+            logger.warning(f"Failed to save {len(results)} results")
+        return ok
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Writer counters"""
+        return {
+            'pending': self._queue.qsize() if self._queue is not None else 0,
+            'batches': self.batches,
+            'written': self.written,
+            'failed': self.failed
+        }
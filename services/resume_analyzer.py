@@ -1,27 +1,39 @@
 import re
+import hashlib
 import logging
+import threading
 from typing import Dict, List, Any, Optional
 from collections import Counter
 
+from core.admission import admission
 from services.google_search_verifier import GoogleSearchVerifier
+from services.section_segmenter import section_segmenter
+from services.resume_annotator import resume_annotator
 from services.selenium_linkedin_verifier import SeleniumLinkedInVerifier
 
 logger = logging.getLogger(__name__)
 
+# Bump when analysis output changes; shared cache entries from other versions are ignored
+ANALYZER_VERSION = "2026.10.1"
+
 class ResumeAuthenticityAnalyzer:
     """Analyzes resume authenticity using multiple criteria"""
 
-    def __init__(self, google_search_verifier=None, use_selenium=True):
+    def __init__(self, google_search_verifier=None, use_selenium=True, verification_cache=None):
         """
         Initialize Resume Authenticity Analyzer
         
         Args:
             google_search_verifier: Optional GoogleSearchVerifier instance
             use_selenium: Use Selenium for LinkedIn verification (default: True)
+            verification_cache: Optional SimpleCache for verification results by contact details
         """
         self.google_search_verifier = google_search_verifier
+        self.verification_cache = verification_cache
         self.use_selenium = use_selenium
         self.selenium_verifier = None
+        # One browser session; scans on the pipeline threads take turns with it
+        self._selenium_lock = threading.Lock()
         
         # Initialize Selenium verifier if requested
         if use_selenium:
@@ -346,31 +358,9 @@ class ResumeAuthenticityAnalyzer:
                     })
 
             # ALWAYS perform verification if configured and we have candidate info
-            # Priority: Selenium (more accurate) > API (limited)
             verification = None
             if candidate_name:
-                # Try Selenium first (more accurate, real browser results)
-                if self.selenium_verifier:
-                    try:
-                        logger.info(f"Using Selenium for LinkedIn verification: {candidate_name}")
-                        verification = self.selenium_verifier.verify_candidate(
-                            candidate_name, candidate_email, candidate_phone
-                        )
-                        logger.info(f"✅ Selenium verification complete")
-                    except Exception as e:
-                        logger.warning(f"Selenium verification failed: {e}, falling back to API")
-                        verification = None
-                
-                # Fallback to API if Selenium failed or not available
-                if not verification and self.google_search_verifier:
-                    try:
-                        logger.info("Using Google API for LinkedIn verification")
-                        verification = self.google_search_verifier.verify_candidate(
-                            candidate_name, candidate_email, candidate_phone
-                        )
-                    except Exception as e:
-                        logger.warning(f"API verification also failed: {e}")
-                        verification = None
+                verification = self._verify_candidate(candidate_name, candidate_email, candidate_phone)
             
             if verification:
                 result['google_verification'] = verification
@@ -434,6 +424,47 @@ class ResumeAuthenticityAnalyzer:
             logger.error(f"LinkedIn profile check failed: {str(e)}")
             return 50.0  # Default neutral score
     
+    def _verify_candidate(self, name: str, email: Optional[str], phone: Optional[str]) -> Optional[Dict[str, Any]]:
+        """
+        Verify the candidate online, reusing earlier verifications of the same contact details
+
+        Priority: Selenium (more accurate) > API (limited)
+        """
+        key = None
+        if self.verification_cache is not None:
+            key = hashlib.sha256(f"{name}|{email or ''}|{phone or ''}".encode('utf-8')).hexdigest()
+            cached = self.verification_cache.get_key(key)
+            if cached is not None:
+                return cached
+
+        verification = None
+        # Online lookups are slow and rate limited; only a few run at once
+        with admission.stage_sync('verification'):
+            # Try Selenium first (more accurate, real browser results)
+            if self.selenium_verifier:
+                try:
+                    logger.info(f"Using Selenium for LinkedIn verification: {name}")
+                    with self._selenium_lock:
+                        verification = self.selenium_verifier.verify_candidate(name, email, phone)
+                    logger.info(f"✅ Selenium verification complete")
+                except Exception as e:
+                    logger.warning(f"Selenium verification failed: {e}, falling back to API")
+                    verification = None
+        
+            # Fallback to API if Selenium failed or not available
+            if not verification and self.google_search_verifier:
+                try:
+                    logger.info("Using Google API for LinkedIn verification")
+                    verification = self.google_search_verifier.verify_candidate(name, email, phone)
+                except Exception as e:
+                    logger.warning(f"API verification also failed: {e}")
+                    verification = None
+
+        # Only completed searches are kept; failed ones are retried on the next scan
+        if key is not None and verification and verification.get('search_attempted') and 'error' not in verification:
+            self.verification_cache.set_key(key, verification)
+        return verification
+
     def _normalize_linkedin_url(self, url: str) -> str:
         """Normalize LinkedIn URL for comparison"""
         if not url:
@@ -448,26 +479,16 @@ class ResumeAuthenticityAnalyzer:
         return url
     
     def _extract_candidate_name(self, text_content: str) -> Optional[str]:
-        """Extract candidate name from resume text"""
-        lines = text_content.split('\n')
-        for line in lines[:10]:
-            line = line.strip()
-            if line and len(line.split()) <= 4 and len(line) > 3:
-                if not any(char.isdigit() for char in line):
-                    return line
-        return None
+        """Extract candidate name from resume text (shared annotation layer)"""
+        return resume_annotator.annotate(text_content).value('name')
     
     def _extract_email(self, text_content: str) -> Optional[str]:
-        """Extract email from resume text"""
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        match = re.search(email_pattern, text_content)
-        return match.group(0) if match else None
+        """Extract email from resume text (shared annotation layer)"""
+        return resume_annotator.annotate(text_content).value('email')
     
     def _extract_phone(self, text_content: str) -> Optional[str]:
-        """Extract phone number from resume text"""
-        phone_pattern = r'[\+\(]?[1-9][0-9 .\-\(\)]{8,}[0-9]'
-        match = re.search(phone_pattern, text_content)
-        return match.group(0) if match else None
+        """Extract phone number (E.164) from resume text (shared annotation layer)"""
+        return resume_annotator.annotate(text_content).value('phone')
 
     def _analyze_capitalization_consistency(self, text_content: str) -> float:
         """Analyze capitalization consistency across the document"""
@@ -638,8 +659,30 @@ class ResumeAuthenticityAnalyzer:
         # 4. Grammar Issues Diagnostics
         diagnostics['grammar'] = self._get_grammar_diagnostics(text_content)
 
+        # 5. Section Structure Diagnostics
+        diagnostics['sections'] = self._get_section_diagnostics(text_content)
+
         return diagnostics
 
+    def _get_section_diagnostics(self, text_content: str) -> Dict[str, Any]:
+        """Get detected resume sections and the expected ones that are missing"""
+        try:
+            sections = section_segmenter.segment(text_content)
+            expected = ['experience', 'education', 'skills']
+            missing = [name for name in expected if name not in sections]
+            return {
+                'found': sections.found,
+                'missing': missing,
+                'spans': sections.to_dict(),
+                'recommendation': (
+                    f"Add clear section headings for: {', '.join(missing)}" if missing
+                    else "All key sections present"
+                )
+            }
+        except Exception as e:
+            logger.error(f"Section diagnostics failed: {str(e)}")
+            return {'found': [], 'missing': [], 'spans': {}, 'recommendation': 'Unable to analyze sections'}
+
     def _get_font_diagnostics(self, structure_info: Dict[str, Any]) -> Dict[str, Any]:
         """Get detailed font usage information"""
         try:
@@ -0,0 +1,272 @@
+import re
+import logging
+import threading
+from functools import lru_cache
+from typing import Dict, List, Any, Optional, Tuple
+
+import phonenumbers
+from email_validator import validate_email, EmailNotValidError
+
+from core.cache import DocumentMemo
+from core.config import settings
+from services.section_segmenter import section_segmenter, HEADER
+
+logger = logging.getLogger(__name__)
+
+EMAIL_PATTERN = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', re.IGNORECASE)
+LINKEDIN_PATTERN = re.compile(
+    r'(?:https?://)?(?:(?:www|in)\.)?linkedin\.com/(?:in|pub)/[\w-]+/?', re.IGNORECASE
+)
+
+# Confidence of contact details found in the header vs. elsewhere in the document
+HEADER_CONFIDENCE = 0.95
+BODY_CONFIDENCE = 0.7
+
+# Without any section heading, only this much of the top counts as the header
+HEADER_MAX_LINES = 8
+HEADER_MAX_CHARS = 600
+
+
+@lru_cache(maxsize=4096)
+def _normalize_email(email: str) -> Optional[str]:
+    """Validate an email address once per unique string; None if invalid"""
+    try:
+        return validate_email(email, check_deliverability=False).email
+    except EmailNotValidError:
+        return None
+
+
+class Span:
+    """A typed entity found in a document, with character offsets into the text"""
+
+    __slots__ = ('entity', 'start', 'end', 'text', 'value', 'confidence')
+
+    def __init__(self, entity: str, start: int, end: int, text: str,
+                 value: Optional[str] = None, confidence: float = 1.0):
+        self.entity = entity
+        self.start = start
+        self.end = end
+        self.text = text
+        self.value = value if value is not None else text
+        self.confidence = confidence
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'entity': self.entity,
+            'start': self.start,
+            'end': self.end,
+            'text': self.text,
+            'value': self.value,
+            'confidence': self.confidence
+        }
+
+    def __repr__(self):
+        return f"<Span({self.entity}, {self.start}:{self.end}, '{self.value}', {self.confidence})>"
+
+
+class DocumentAnnotations:
+    """
+    All entity spans of one document.
+
+    Contact spans are computed once when the document is annotated; skill
+    spans depend on the skill taxonomy and are computed on first use for
+    each taxonomy version.
+    """
+
+    def __init__(self, text: str, spans: List[Span]):
+        self.text = text
+        self.spans = spans
+        self._skills: Dict[str, Tuple[List[Span], int]] = {}
+        self._lock = threading.Lock()
+
+    def all(self, entity: str) -> List[Span]:
+        """Spans of an entity, best first"""
+        return [span for span in self.spans if span.entity == entity]
+
+    def first(self, entity: str) -> Optional[Span]:
+        """Highest-confidence span of an entity"""
+        spans = self.all(entity)
+        return spans[0] if spans else None
+
+    def value(self, entity: str) -> Optional[str]:
+        """Normalized value of the best span of an entity"""
+        span = self.first(entity)
+        return span.value if span else None
+
+    def skill_spans(self, vocabulary) -> List[Span]:
+        """Skill mentions (canonical skill as value) under a compiled taxonomy"""
+        return self._skill_index(vocabulary)[0]
+
+    def skill_bits(self, vocabulary) -> int:
+        """Bitmap of the skills mentioned (synonyms resolved, no ancestors)"""
+        return self._skill_index(vocabulary)[1]
+
+    def _skill_index(self, vocabulary) -> Tuple[List[Span], int]:
+        cached = self._skills.get(vocabulary.version)
+        if cached is not None:
+            return cached
+
+        text_lower = self.text.lower()
+        spans: List[Span] = []
+        bits = 0
+        for skill_id, pattern in enumerate(vocabulary.patterns):
+            for match in pattern.finditer(text_lower):
+                spans.append(Span('skill', match.start(), match.end(),
+                                  self.text[match.start():match.end()], vocabulary.skills[skill_id]))
+                bits |= 1 << skill_id
+        spans.sort(key=lambda span: span.start)
+
+        with self._lock:
+            self._skills[vocabulary.version] = (spans, bits)
+        return spans, bits
+
+    def to_dict(self, vocabulary=None) -> List[Dict[str, Any]]:
+        """JSON-serializable spans (skills included when a vocabulary is given)"""
+        spans = self.spans + (self.skill_spans(vocabulary) if vocabulary is not None else [])
+        return [span.to_dict() for span in spans]
+
+
+class ResumeAnnotator:
+    """
+    Produces typed, offset-annotated entity spans once per document.
+
+    Name, email, phone and LinkedIn spans are found with one set of rules
+    and cached by text hash, so the extractor, the authenticity analyzer,
+    verification and the matcher all see the same answers.
+    """
+
+    def __init__(self, phone_region: Optional[str] = None, cache_size: int = 1024):
+        """
+        Initialize annotator
+
+        Args:
+            phone_region: Region assumed for numbers without a country code
+                (e.g. "US", "IN"); defaults to settings.phone_default_region
+            cache_size: Number of annotated documents kept (LRU)
+        """
+        self.phone_region = (phone_region or settings.phone_default_region or '').upper() or None
+        self._cache = DocumentMemo(cache_size)
+
+    def annotate(self, text: str) -> DocumentAnnotations:
+        """
+        Annotate a document
+
+        Args:
+            text: Resume text
+
+        Returns:
+            DocumentAnnotations with contact spans ordered best first per entity
+        """
+        return self._cache.get_or_compute(text, self._annotate)
+
+    def _annotate(self, text: str) -> DocumentAnnotations:
+        """Annotate a document (uncached)"""
+        spans: List[Span] = []
+        try:
+            header_end = self._header_end(text)
+            spans.extend(self._name_spans(text, header_end))
+            spans.extend(self._email_spans(text, header_end))
+            spans.extend(self._phone_spans(text, header_end))
+            spans.extend(self._linkedin_spans(text, header_end))
+        except Exception as e:
+            logger.error(f"Error annotating resume: {str(e)}")
+        return DocumentAnnotations(text, spans)
+
+    @staticmethod
+    def _header_end(text: str) -> int:
+        """
+        Character offset where the header (lines above the first section heading) ends
+
+        A resume without any recognised heading would otherwise be all
+        header; its header is capped at the first HEADER_MAX_LINES lines
+        and HEADER_MAX_CHARS characters.
+        """
+        sections = section_segmenter.segment(text)
+        ranges = sections.line_ranges(HEADER)
+        if not ranges:
+            return 0
+        header_lines = ranges[0][1]
+        if header_lines >= len(sections.lines):
+            capped = sum(len(line) + 1 for line in sections.lines[:HEADER_MAX_LINES])
+            return min(capped, HEADER_MAX_CHARS, len(text))
+        return sum(len(line) + 1 for line in sections.lines[:header_lines])
+
+    @staticmethod
+    def _confidence(start: int, header_end: int) -> float:
+        return HEADER_CONFIDENCE if start < header_end else BODY_CONFIDENCE
+
+    def _name_spans(self, text: str, header_end: int) -> List[Span]:
+        """Name: the first short line of 2-4 capitalized words near the top"""
+        lines = []
+        offset = 0
+        for line in text.split('\n'):
+            stripped = line.strip()
+            if stripped:
+                lines.append((offset + line.index(stripped), stripped))
+            offset += len(line) + 1
+
+        # Skip lines with email or phone (likely contact info, not name)
+        for start, line in lines[:5]:
+            if '@' in line or re.search(r'\d{3,}', line):
+                continue
+            capitalized_words = [w for w in line.split() if w and w[0].isupper()]
+            if 2 <= len(capitalized_words) <= 4 and len(line) < 50:
+                return [Span('name', start, start + len(line), line, ' '.join(capitalized_words),
+                             0.9 if start < header_end else 0.6)]
+
+        # Fallback: first line that's not too long
+        for start, line in lines[:3]:
+            if len(line) < 50 and '@' not in line:
+                return [Span('name', start, start + len(line), line, confidence=0.4)]
+        return []
+
+    def _email_spans(self, text: str, header_end: int) -> List[Span]:
+        spans = []
+        for match in EMAIL_PATTERN.finditer(text):
+            validated = _normalize_email(match.group(0))
+            if validated:
+                spans.append(Span('email', match.start(), match.end(), match.group(0), validated,
+                                  self._confidence(match.start(), header_end)))
+        spans.sort(key=lambda span: -span.confidence)
+        return spans
+
+    def _phone_spans(self, text: str, header_end: int) -> List[Span]:
+        """
+        Phones in E.164 from one PhoneNumberMatcher pass
+
+        Valid numbers are taken from the whole text. If there are none, the
+        header alone is scanned accepting any possible number, which keeps
+        placeholder numbers such as (555) 123-4567 without turning dates and
+        IDs in the body into phones.
+        """
+        spans = self._match_phones(text, phonenumbers.Leniency.VALID, header_end)
+        if not spans and header_end:
+            spans = self._match_phones(text[:header_end], phonenumbers.Leniency.POSSIBLE, header_end, 0.5)
+        spans.sort(key=lambda span: -span.confidence)
+        return spans
+
+    def _match_phones(self, text: str, leniency, header_end: int,
+                      confidence: Optional[float] = None) -> List[Span]:
+        spans = []
+        for match in phonenumbers.PhoneNumberMatcher(text, self.phone_region, leniency=leniency):
+            spans.append(Span(
+                'phone', match.start, match.end, match.raw_string,
+                phonenumbers.format_number(match.number, phonenumbers.PhoneNumberFormat.E164),
+                confidence if confidence is not None else self._confidence(match.start, header_end)
+            ))
+        return spans
+
+    def _linkedin_spans(self, text: str, header_end: int) -> List[Span]:
+        spans = []
+        for match in LINKEDIN_PATTERN.finditer(text):
+            url = match.group(0)
+            if not url.lower().startswith('http'):
+                url = 'https://' + url
+            spans.append(Span('linkedin', match.start(), match.end(), match.group(0), url,
+                              self._confidence(match.start(), header_end)))
+        spans.sort(key=lambda span: -span.confidence)
+        return spans
+
+
+# Shared annotator so every stage reuses the same per-document annotations
+resume_annotator = ResumeAnnotator()
@@ -2,30 +2,29 @@ import re
 import logging
 from typing import Dict, List, Optional, Any
 from datetime import datetime
-import phonenumbers
-from email_validator import validate_email, EmailNotValidError
+from services.experience_timeline import timeline_engine
+from services.section_segmenter import section_segmenter
+from services.resume_annotator import ResumeAnnotator, resume_annotator
 
 logger = logging.getLogger(__name__)
 
+
 class ResumeDataExtractor:
     """
     Extracts structured data from resume text using regex patterns and NLP.
     Extracts: name, email, phone, LinkedIn, education, work experience, skills
     """
 
-    def __init__(self):
-        self.phone_patterns = [
-            r'\+?\d{1,3}[-.\s]?\(?\d{1,4}\)?[-.\s]?\d{1,4}[-.\s]?\d{1,9}',  # International
-            r'\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}',  # US format
-            r'\d{10}',  # 10 digits
-        ]
-        
-        self.email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        
-        self.linkedin_patterns = [
-            r'(?:https?://)?(?:www\.)?linkedin\.com/in/[\w-]+/?',
-            r'(?:https?://)?(?:in\.)?linkedin\.com/in/[\w-]+/?',
-        ]
+    def __init__(self, phone_region: Optional[str] = None):
+        """
+        Initialize extractor
+
+        Args:
+            phone_region: Region assumed for numbers without a country code
+                (e.g. "US", "IN"); defaults to settings.phone_default_region
+        """
+        # Contact details come from the shared annotation layer
+        self.annotator = ResumeAnnotator(phone_region) if phone_region else resume_annotator
         
         # Common skills to look for
         self.common_skills = [
@@ -43,7 +42,8 @@ class ResumeDataExtractor:
         Extract all structured data from resume text.
         
         Returns:
-            Dict with extracted data: email, phone, linkedin, name, skills, education, experience
+            Dict with extracted data: email, phone, linkedin, name, skills, education, experience,
+            and experience_years from the merged date-range timeline
         """
         try:
             if not text or len(text.strip()) < 50:
@@ -58,6 +58,9 @@ class ResumeDataExtractor:
                 'skills': self.extract_skills(text),
                 'education': self.extract_education(text),
                 'work_experience': self.extract_work_experience(text),
+                'experience_years': timeline_engine.experience_years(text),
+                'experience_timeline': timeline_engine.timeline(text).to_dict(),
+                'annotations': self.annotator.annotate(text).to_dict(),
             }
             
             return extracted_data
@@ -75,41 +78,23 @@ class ResumeDataExtractor:
             'skills': [],
             'education': [],
             'work_experience': [],
+            'experience_years': None,
+            'experience_timeline': None,
+            'annotations': [],
         }
 
     def extract_email(self, text: str) -> Optional[str]:
-        """Extract email address from text"""
+        """Extract email address from text, preferring the header"""
         try:
-            matches = re.findall(self.email_pattern, text, re.IGNORECASE)
-            for email in matches:
-                try:
-                    # Validate email
-                    validated = validate_email(email, check_deliverability=False)
-                    return validated.email
-                except EmailNotValidError:
-                    continue
-            return None
+            return self.annotator.annotate(text).value('email')
         except Exception as e:
             logger.error(f"Error extracting email: {e}")
             return None
 
     def extract_phone(self, text: str) -> Optional[str]:
-        """Extract phone number from text"""
+        """Extract phone number from text in E.164 format, preferring the header"""
         try:
-            for pattern in self.phone_patterns:
-                matches = re.findall(pattern, text)
-                for match in matches:
-                    try:
-                        # Try to parse and validate phone number
-                        phone_obj = phonenumbers.parse(match, None)
-                        if phonenumbers.is_valid_number(phone_obj):
-                            return phonenumbers.format_number(phone_obj, phonenumbers.PhoneNumberFormat.INTERNATIONAL)
-                    except:
-                        # If parsing fails, just clean and return the match
-                        cleaned = re.sub(r'[^\d+]', '', match)
-                        if len(cleaned) >= 10:
-                            return match
-            return None
+            return self.annotator.annotate(text).value('phone')
         except Exception as e:
             logger.error(f"Error extracting phone: {e}")
             return None
@@ -117,15 +102,7 @@ class ResumeDataExtractor:
     def extract_linkedin(self, text: str) -> Optional[str]:
         """Extract LinkedIn URL from text"""
         try:
-            for pattern in self.linkedin_patterns:
-                match = re.search(pattern, text, re.IGNORECASE)
-                if match:
-                    url = match.group(0)
-                    # Normalize URL
-                    if not url.startswith('http'):
-                        url = 'https://' + url
-                    return url
-            return None
+            return self.annotator.annotate(text).value('linkedin')
         except Exception as e:
             logger.error(f"Error extracting LinkedIn: {e}")
             return None
@@ -133,31 +110,10 @@ class ResumeDataExtractor:
     def extract_name(self, text: str) -> Optional[str]:
         """
         Extract candidate name from text.
-        Uses heuristics: first 3 lines, capitalized words, common patterns
+        Uses heuristics: first lines, capitalized words (see ResumeAnnotator)
         """
         try:
-            lines = [line.strip() for line in text.split('\n') if line.strip()]
-            
-            # Look in first 5 lines for name
-            for line in lines[:5]:
-                # Skip if line has email or phone (likely contact info, not name)
-                if '@' in line or re.search(r'\d{3,}', line):
-                    continue
-                
-                # Name is likely 2-4 capitalized words
-                words = line.split()
-                capitalized_words = [w for w in words if w and w[0].isupper()]
-                
-                if 2 <= len(capitalized_words) <= 4 and len(line) < 50:
-                    # Likely a name
-                    return ' '.join(capitalized_words)
-            
-            # Fallback: first line that's not too long
-            for line in lines[:3]:
-                if len(line) < 50 and not '@' in line:
-                    return line
-            
-            return None
+            return self.annotator.annotate(text).value('name')
         except Exception as e:
             logger.error(f"Error extracting name: {e}")
             return None
@@ -195,7 +151,8 @@ class ResumeDataExtractor:
                 r'\b(MBA|M\.B\.A\.)\b',
             ]
             
-            lines = text.split('\n')
+            # Only the Education section is scanned when the resume has one
+            lines = section_segmenter.segment(text).text('education').split('\n')
             
             for i, line in enumerate(lines):
                 for pattern in degree_patterns:
@@ -247,7 +204,8 @@ class ResumeDataExtractor:
             # Company indicators
             company_keywords = ['inc', 'ltd', 'llc', 'corp', 'corporation', 'company', 'technologies', 'systems']
             
-            lines = text.split('\n')
+            # Only the Experience section is scanned when the resume has one
+            lines = section_segmenter.segment(text).text('experience').split('\n')
             
             for i, line in enumerate(lines):
                 # Look for date ranges
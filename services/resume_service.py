@@ -1,5 +1,5 @@
 import os
-import hashlib
+import uuid
 import logging
 from typing import List, Dict, Any, Optional
 from fastapi import UploadFile
@@ -8,6 +8,9 @@ from datetime import datetime
 
 from core.config import settings
 from core.database import SessionLocal
+from core.uploads import IngestedUpload, ingest_stream
+from core.archives import ZipArchiveReader, ArchiveError
+from core.jobs import job_store
 from models.db import Resume, Candidate
 from tasks.resume_tasks import process_resume
 
@@ -21,22 +24,10 @@ class ResumeService:
         self.upload_dir = settings.upload_dir
         os.makedirs(self.upload_dir, exist_ok=True)
     
-    def _calculate_file_hash(self, content: bytes) -> str:
-        """Calculate SHA-256 hash of file content"""
-        return hashlib.sha256(content).hexdigest()
-    
-    def _save_file(self, file: UploadFile, content: bytes) -> str:
-        """Save uploaded file and return file path"""
-        # Generate unique filename
+    def _stored_path(self, filename: str) -> str:
+        """Final path for an uploaded file (unique, so same-named files never replace each other)"""
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        filename = f"{timestamp}_{file.filename}"
-        file_path = os.path.join(self.upload_dir, filename)
-        
-        # Save file
-        with open(file_path, 'wb') as f:
-            f.write(content)
-        
-        return file_path
+        return os.path.join(self.upload_dir, f"{timestamp}_{uuid.uuid4().hex}_{os.path.basename(filename)}")
     
     def upload_resume(self, file: UploadFile, db: Session) -> Dict[str, Any]:
         """
@@ -46,32 +37,55 @@ class ResumeService:
             file: Uploaded file
             db: Database session
             
+        Returns:
+            Dict with job_id, file_name, status
+            
+        Raises:
+            UploadTooLargeError: If the file is larger than settings.max_file_size
+        """
+        try:
+            # Stream the file to disk, hashing as it goes
+            upload = ingest_stream(file.file, self.upload_dir, settings.max_file_size, filename=file.filename)
+        except Exception as e:
+            logger.error(f"Error uploading resume: {str(e)}", exc_info=True)
+            raise
+        return self._register_upload(upload, file.filename, db)
+    
+    def _register_upload(self, upload: IngestedUpload, file_name: str, db: Session) -> Dict[str, Any]:
+        """
+        Dedupe an ingested file by content hash, store it and queue it for processing
+        
+        Args:
+            upload: File spooled to the upload directory
+            file_name: Original file name
+            db: Database session
+            
         Returns:
             Dict with job_id, file_name, status
         """
         try:
-            # Read file content
-            content = file.file.read()
-            file_hash = self._calculate_file_hash(content)
+            file_hash = upload.sha256
             
             # Check for duplicate by file hash
             existing_resume = db.query(Resume).filter(Resume.file_hash == file_hash).first()
             if existing_resume:
+                upload.discard()
                 logger.info(f"Duplicate resume detected: {file_hash}")
                 return {
                     "job_id": str(existing_resume.id),
-                    "file_name": file.filename,
+                    "file_name": file_name,
                     "status": "duplicate",
                     "message": "This resume has already been uploaded",
                     "existing_resume_id": existing_resume.id
                 }
             
-            # Save file
-            file_path = self._save_file(file, content)
+            # Keep the file under its final name
+            upload.move_to(self._stored_path(file_name))
+            file_path = upload.path
             
             # Create Resume record in database
             resume = Resume(
-                file_name=file.filename,
+                file_name=file_name,
                 file_path=file_path,
                 file_hash=file_hash,
                 upload_status='pending'
@@ -80,22 +94,78 @@ class ResumeService:
             db.commit()
             db.refresh(resume)
             
-            # Trigger background processing task
+            # Trigger background processing task; the task reports progress to the shared job store
+            job_store.create(str(resume.id), kind='resume', file_name=file_name)
             process_resume.delay(resume.id)
             
-            logger.info(f"Resume uploaded: {resume.id} - {file.filename}")
+            logger.info(f"Resume uploaded: {resume.id} - {file_name}")
             
             return {
                 "job_id": str(resume.id),
-                "file_name": file.filename,
+                "file_name": file_name,
                 "status": "processing"
             }
         
         except Exception as e:
             logger.error(f"Error uploading resume: {str(e)}", exc_info=True)
+            if 'resume' not in locals():
+                upload.discard()
             db.rollback()
             raise
     
+    def upload_archive(self, file: UploadFile, db: Session) -> List[Dict[str, Any]]:
+        """
+        Queues every resume in a ZIP archive for background processing.
+        
+        Members are decompressed one at a time into the upload directory
+        and deduplicated by content hash (within the archive and against
+        earlier uploads); members that are not resumes or trip the zip-bomb
+        limits are reported as skipped.
+        
+        Args:
+            file: Uploaded ZIP archive
+            db: Database session
+            
+        Returns:
+            List of dicts with job_id, file_name, status (and error) per member
+            
+        Raises:
+            ArchiveError: If the archive is unreadable or exceeds the archive limits
+        """
+        # The multipart parser has already spooled the archive; check its size before opening it
+        file.file.seek(0, os.SEEK_END)
+        if file.file.tell() > settings.archive_max_bytes:
+            raise ArchiveError(
+                f"Archive exceeds maximum allowed size ({settings.archive_max_bytes / (1024 * 1024):.0f}MB)."
+            )
+        file.file.seek(0)
+
+        reader = ZipArchiveReader(
+            file.file, settings.allowed_extensions,
+            max_member_bytes=settings.max_file_size,
+            max_total_bytes=settings.archive_max_total_bytes,
+            max_ratio=settings.archive_max_ratio,
+            max_members=settings.archive_max_members
+        )
+        results = []
+        try:
+            for member in reader.members:
+                if member.skip_reason:
+                    if not member.info.is_dir():
+                        results.append({"job_id": None, "file_name": member.name,
+                                        "status": "skipped", "error": member.skip_reason})
+                    continue
+                try:
+                    upload = reader.ingest(member, self.upload_dir)
+                    results.append(self._register_upload(upload, member.filename, db))
+                except Exception as e:
+                    logger.error(f"Error uploading {member.name}: {str(e)}")
+                    results.append({"job_id": None, "file_name": member.name,
+                                    "status": "failed", "error": str(e)})
+        finally:
+            reader.close()
+        return results
+    
     def upload_resume_batch(self, files: List[UploadFile], db: Session) -> List[Dict[str, Any]]:
         """
         Handles batch resume uploads.
@@ -128,13 +198,21 @@ class ResumeService:
         """
         Retrieves the status of a resume processing job.
         
+        Scan jobs started by the main app's background mode live only in the
+        shared job store; resume jobs are read from the database, with the
+        current processing stage from the job store.
+        
         Args:
-            job_id: Resume ID (job ID)
+            job_id: Resume ID or scan job ID
             db: Database session
             
         Returns:
             Dict with job status information
         """
+        job = job_store.get(job_id)
+        if job is not None and job.get('kind') != 'resume':
+            return job
+        
         try:
             resume = db.query(Resume).filter(Resume.id == int(job_id)).first()
             
@@ -149,7 +227,9 @@ class ResumeService:
                 "processed_at": resume.processed_at.isoformat() if resume.processed_at else None,
                 "candidate_id": resume.candidate_id,
                 "authenticity_score": resume.authenticity_score,
+                "experience_years": resume.experience_years,
                 "extracted_data": resume.extracted_data,
+                "stage": job.get('stage') if job else None,
             }
         
         except Exception as e:
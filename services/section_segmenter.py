@@ -0,0 +1,199 @@
+import re
+import logging
+from typing import Dict, List, Any, Optional, Tuple
+
+from core.cache import DocumentMemo
+
+logger = logging.getLogger(__name__)
+
+# Canonical section names and the headings that introduce them
+SECTION_HEADINGS = {
+    'summary': [
+        'summary', 'professional summary', 'career summary', 'profile', 'professional profile',
+        'objective', 'career objective', 'about me'
+    ],
+    'experience': [
+        'experience', 'work experience', 'professional experience', 'employment',
+        'employment history', 'work history', 'career history', 'relevant experience'
+    ],
+    'education': [
+        'education', 'academic background', 'academic qualifications', 'educational qualifications',
+        'qualifications', 'education and training'
+    ],
+    'skills': [
+        'skills', 'technical skills', 'key skills', 'core skills', 'core competencies',
+        'competencies', 'technologies', 'tools and technologies'
+    ],
+    'projects': ['projects', 'key projects', 'personal projects', 'academic projects'],
+    'certifications': [
+        'certifications', 'certificates', 'licenses and certifications', 'courses', 'training'
+    ],
+    'awards': ['awards', 'honors', 'honours', 'achievements', 'accomplishments'],
+    'publications': ['publications', 'research'],
+    'languages': ['languages'],
+    'interests': ['interests', 'hobbies', 'hobbies and interests'],
+}
+
+# Lines before the first heading (name and contact details)
+HEADER = 'header'
+
+# Sections commonly written inline ("Skills: Python, SQL"); other headings
+# followed by a colon and text start a section only if the text is a list
+INLINE_SECTIONS = {'skills', 'languages', 'interests'}
+LIST_SEPARATORS = re.compile(r'\s*[,;|•·]\s*')
+# Longest list item (in words) for inline text to count as a list
+MAX_LIST_ITEM_WORDS = 4
+
+
+def _heading_pattern() -> Tuple["re.Pattern", Dict[str, str]]:
+    """One alternation of every heading, longest first, with optional numbering and trailing colon"""
+    heading_to_section = {
+        heading: section for section, headings in SECTION_HEADINGS.items() for heading in headings
+    }
+    alternatives = '|'.join(
+        re.escape(heading).replace(r'\ ', r'\s+').replace(r'\s+and\s+', r'\s*(?:and|&)\s*')
+        for heading in sorted(heading_to_section, key=len, reverse=True)
+    )
+    return re.compile(
+        rf'^\s*(?:\d+[.)]\s*)?(?P<heading>{alternatives})\s*(?::\s*(?P<rest>.*?))?\s*$',
+        re.IGNORECASE
+    ), heading_to_section
+
+
+HEADING_PATTERN, HEADING_TO_SECTION = _heading_pattern()
+
+
+class ResumeSections:
+    """
+    Line spans of the sections of one document.
+
+    A section can occur more than once (e.g. two "Experience" blocks), so
+    each name maps to a list of half-open (start, end) line ranges.
+    """
+
+    def __init__(self, lines: List[str], spans: Dict[str, List[Tuple[int, int]]]):
+        self.lines = lines
+        self.spans = spans
+        self._texts: Dict[str, str] = {}
+
+    def __contains__(self, section: str) -> bool:
+        return section in self.spans
+
+    @property
+    def found(self) -> List[str]:
+        """Sections present in the document, in order of first appearance"""
+        return [name for name in self.spans if name != HEADER]
+
+    def line_ranges(self, section: str) -> List[Tuple[int, int]]:
+        """Line spans of a section (empty if missing)"""
+        return self.spans.get(section, [])
+
+    def text(self, section: str, fallback: bool = True) -> str:
+        """
+        Text of a section
+
+        Args:
+            section: Canonical section name (see SECTION_HEADINGS) or 'header'
+            fallback: Return the whole document if the section is missing
+
+        Returns:
+            The section's lines joined with newlines
+        """
+        if section not in self.spans:
+            return '\n'.join(self.lines) if fallback else ''
+        if section not in self._texts:
+            self._texts[section] = '\n'.join(
+                line for start, end in self.spans[section] for line in self.lines[start:end]
+            )
+        return self._texts[section]
+
+    def section_at(self, line_no: int) -> Optional[str]:
+        """Section containing a line"""
+        for name, ranges in self.spans.items():
+            if any(start <= line_no < end for start, end in ranges):
+                return name
+        return None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable section spans"""
+        return {name: [list(span) for span in ranges] for name, ranges in self.spans.items()}
+
+
+class SectionSegmenter:
+    """
+    Splits resume text into sections in a single pass over its lines.
+
+    A line is a heading when, on its own (optionally numbered or followed
+    by a colon), it is one of the known section titles. Inline headings
+    such as "Skills: Python, SQL" start the section on the same line; for
+    sections other than skills, languages and interests the inline text
+    must look like a list, so a line such as "Training: onboarded 12
+    engineers" inside a job does not end the Experience section.
+    Results are cached by text hash so the extractor, analyzer and matcher
+    share one segmentation per document.
+    """
+
+    def __init__(self, cache_size: int = 1024, max_heading_length: int = 60):
+        self.max_heading_length = max_heading_length
+        self._cache = DocumentMemo(cache_size)
+
+    def segment(self, text: str) -> ResumeSections:
+        """
+        Segment a document
+
+        Args:
+            text: Resume text
+
+        Returns:
+            ResumeSections with the line spans of every detected section
+        """
+        return self._cache.get_or_compute(text, self._segment)
+
+    def _segment(self, text: str) -> ResumeSections:
+        """Segment a document (uncached)"""
+        lines = text.split('\n')
+        try:
+            spans = self._find_spans(lines)
+        except Exception as e:
+            logger.error(f"Error segmenting resume sections: {str(e)}")
+            spans = {}
+        return ResumeSections(lines, spans)
+
+    def _find_spans(self, lines: List[str]) -> Dict[str, List[Tuple[int, int]]]:
+        spans: Dict[str, List[Tuple[int, int]]] = {}
+        current = HEADER
+        start = 0
+
+        for i, line in enumerate(lines):
+            stripped = line.strip()
+            # Cheap pre-check: a standalone heading is short; longer lines need an inline colon
+            if not stripped or (len(stripped) > self.max_heading_length and ':' not in stripped):
+                continue
+            match = HEADING_PATTERN.match(stripped)
+            if not match:
+                continue
+            rest = match.group('rest')
+
+            heading = re.sub(r'\s*&\s*', ' and ', re.sub(r'\s+', ' ', match.group('heading').lower()))
+            section = HEADING_TO_SECTION.get(heading, current)
+            if rest and section not in INLINE_SECTIONS and not _looks_like_list(rest):
+                continue
+            if start < i:
+                spans.setdefault(current, []).append((start, i))
+            current = section
+            # Inline content ("Skills: Python, SQL") belongs to the new section
+            start = i if rest else i + 1
+
+        if start < len(lines):
+            spans.setdefault(current, []).append((start, len(lines)))
+        return spans
+
+
+def _looks_like_list(text: str) -> bool:
+    """Whether inline text after a heading is a list of short items rather than a sentence"""
+    items = [item for item in LIST_SEPARATORS.split(text.strip().rstrip('.')) if item]
+    return len(items) >= 2 and all(len(item.split()) <= MAX_LIST_ITEM_WORDS for item in items)
+
+
+# Shared segmenter so every consumer reuses the same per-document cache
+section_segmenter = SectionSegmenter()
@@ -0,0 +1,210 @@
+import os
+import re
+import json
+import time
+import logging
+import threading
+from typing import Dict, List, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def _iter_bits(bits: int):
+    """Yield the positions of the set bits in an integer bitmap"""
+    while bits:
+        low = bits & -bits
+        yield low.bit_length() - 1
+        bits ^= low
+
+
+class CompiledTaxonomy:
+    """
+    Immutable compiled form of the skill taxonomy.
+
+    Every canonical skill gets a bit position. Each skill's surface forms
+    (canonical name plus aliases) are compiled into one regex, and the
+    transitive closure of its parents is precomputed as a bitset, so
+    synonym- and hierarchy-aware extraction is a single OR per found skill.
+    """
+
+    def __init__(self, version: str, skills: List[str], categories: List[str],
+                 surface_forms: List[List[str]], parents: List[List[int]], related: List[List[int]]):
+        self.version = version
+        self.skills = skills
+        self.categories = categories
+        self.ids: Dict[str, int] = {skill: i for i, skill in enumerate(skills)}
+
+        self.patterns = [
+            re.compile(r'\b(?:' + '|'.join(re.escape(form) for form in sorted(forms, key=len, reverse=True)) + r')\b')
+            for forms in surface_forms
+        ]
+        self.closure = self._transitive_closure(parents)
+        self.related = [sum(1 << r for r in rel) for rel in related]
+
+    @staticmethod
+    def _transitive_closure(parents: List[List[int]]) -> List[int]:
+        """Bitset of each skill plus all of its ancestors"""
+        closure: List[Optional[int]] = [None] * len(parents)
+
+        def visit(skill_id: int, path: set) -> int:
+            if closure[skill_id] is not None:
+                return closure[skill_id]
+            if skill_id in path:
+                return 1 << skill_id  # Cycle in the file; stop expanding
+            path.add(skill_id)
+            bits = 1 << skill_id
+            for parent in parents[skill_id]:
+                bits |= visit(parent, path)
+            path.discard(skill_id)
+            closure[skill_id] = bits
+            return bits
+
+        return [visit(i, set()) for i in range(len(parents))]
+
+    def extract_direct_bits(self, text_lower: str) -> int:
+        """Skills mentioned in (already lower-cased) text, without ancestors"""
+        bits = 0
+        for skill_id, pattern in enumerate(self.patterns):
+            if pattern.search(text_lower):
+                bits |= 1 << skill_id
+        return bits
+
+    def expand(self, bits: int) -> int:
+        """Add the ancestors of every skill in a bitmap"""
+        expanded = bits
+        for skill_id in _iter_bits(bits):
+            expanded |= self.closure[skill_id]
+        return expanded
+
+    def names(self, bits: int) -> List[str]:
+        """Sorted canonical names for a bitmap"""
+        return sorted(self.skills[i] for i in _iter_bits(bits))
+
+    def bits_for(self, names: List[str]) -> int:
+        """Bitmap for canonical skill names; unknown names are ignored"""
+        bits = 0
+        for name in names:
+            skill_id = self.ids.get(name)
+            if skill_id is not None:
+                bits |= 1 << skill_id
+        return bits
+
+
+class SkillTaxonomy:
+    """
+    Loads the skill taxonomy file and keeps its compiled form current.
+
+    The file is re-read when its modification time changes (checked at most
+    every `check_interval` seconds). A new CompiledTaxonomy is built off to
+    the side and swapped in with a single reference assignment, so readers
+    never see a half-built structure and workers never need a restart.
+    """
+
+    def __init__(self, path: Optional[str], base_categories: Dict[str, List[str]], check_interval: float = 5.0):
+        """
+        Initialize taxonomy
+
+        Args:
+            path: JSON taxonomy file; None uses only the base skills
+            base_categories: Built-in skills by category, always part of the vocabulary
+            check_interval: Minimum seconds between file modification checks
+        """
+        self.path = path
+        self.base_categories = base_categories
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._mtime: Optional[float] = None
+        self._checked_at = 0.0
+        self._compiled = self._compile(self._read_file())
+
+    @property
+    def compiled(self) -> CompiledTaxonomy:
+        """Current compiled taxonomy, reloading first if the file changed"""
+        now = time.monotonic()
+        if self.path and now - self._checked_at >= self.check_interval:
+            self._checked_at = now
+            self.reload()
+        return self._compiled
+
+    def _read_file(self) -> Dict[str, Any]:
+        """Read the taxonomy file, recording its modification time"""
+        if not self.path or not os.path.exists(self.path):
+            return {}
+        try:
+            self._mtime = os.path.getmtime(self.path)
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            logger.error(f"Error reading skill taxonomy {self.path}: {str(e)}")
+            return {}
+
+    def reload(self, force: bool = False) -> bool:
+        """
+        Recompile the taxonomy if the file changed
+
+        Returns:
+            True if a new compiled taxonomy was swapped in
+        """
+        if not self.path:
+            return False
+        with self._lock:
+            try:
+                mtime = os.path.getmtime(self.path) if os.path.exists(self.path) else None
+            except OSError:
+                return False
+            if not force and mtime == self._mtime:
+                return False
+
+            data = self._read_file()
+            if not data and mtime is not None:
+                return False  # Keep serving the previous taxonomy on a bad file
+
+            compiled = self._compile(data)
+            self._compiled = compiled
+            logger.info(f"Skill taxonomy reloaded: {len(compiled.skills)} skills (version {compiled.version})")
+            return True
+
+    def _compile(self, data: Dict[str, Any]) -> CompiledTaxonomy:
+        """Build a CompiledTaxonomy from the base skills and taxonomy data"""
+        skills: List[str] = []
+        categories: List[str] = []
+        ids: Dict[str, int] = {}
+
+        def skill_id(name: str, category: str = 'other') -> int:
+            name = name.lower()
+            if name not in ids:
+                ids[name] = len(skills)
+                skills.append(name)
+                categories.append(category)
+            return ids[name]
+
+        # Built-in skills keep the first, stable bit positions
+        for category, skill_list in self.base_categories.items():
+            for skill in skill_list:
+                skill_id(skill, category)
+
+        entries = data.get('skills', {})
+        for name, entry in entries.items():
+            skill_id(name, entry.get('category', 'other'))
+        for entry in entries.values():
+            for name in entry.get('parents', []) + entry.get('related', []):
+                skill_id(name)
+
+        surface_forms = [[skill] for skill in skills]
+        parents: List[List[int]] = [[] for _ in skills]
+        related: List[List[int]] = [[] for _ in skills]
+        alias_owner: Dict[str, str] = {}
+        for name, entry in entries.items():
+            sid = ids[name.lower()]
+            for alias in entry.get('aliases', []):
+                alias = alias.lower()
+                if alias in ids or alias in alias_owner:
+                    logger.warning(f"Skill taxonomy alias '{alias}' is already used; ignoring it for '{name}'")
+                    continue
+                alias_owner[alias] = name
+                surface_forms[sid].append(alias)
+            parents[sid] = [ids[p.lower()] for p in entry.get('parents', [])]
+            related[sid] = [ids[r.lower()] for r in entry.get('related', [])]
+
+        version = f"{data.get('version', 0)}:{len(skills)}:{self._mtime or 0}"
+        return CompiledTaxonomy(version, skills, categories, surface_forms, parents, related)
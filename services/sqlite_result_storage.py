@@ -0,0 +1,453 @@
+import os
+import csv
+import json
+import zlib
+import uuid
+import sqlite3
+import logging
+import threading
+from datetime import datetime, timedelta
+from contextlib import contextmanager
+from typing import List, Optional, Dict, Any, Iterator, Tuple
+
+from services.result_storage import (
+    ResultStorage, CSV_FIELDNAMES, result_to_csv_row, project_result, needs_diagnostics,
+    encode_cursor, decode_cursor
+)
+from services.result_statistics import ResultStatistics
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    id TEXT PRIMARY KEY,
+    upload_date TEXT NOT NULL,
+    filename TEXT,
+    authenticity_score REAL,
+    jd_match REAL,
+    record TEXT NOT NULL,
+    diagnostics BLOB
+);
+CREATE INDEX IF NOT EXISTS idx_results_upload_date ON results (upload_date, id);
+CREATE INDEX IF NOT EXISTS idx_results_authenticity ON results (authenticity_score);
+CREATE INDEX IF NOT EXISTS idx_results_jd_match ON results (jd_match);
+CREATE TABLE IF NOT EXISTS statistics (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    data TEXT NOT NULL
+);
+"""
+
+# Saves between purges of results that have passed the retention period
+RETENTION_CHECK_INTERVAL = 1000
+
+
+class SQLiteResultStorage:
+    """
+    Analysis result storage backed by SQLite in WAL mode
+
+    Same interface as ResultStorage. Upload date, ID and scores are indexed
+    columns, so listings and lookups are answered by SQL instead of reading
+    every record; the bulky diagnostics are kept as a zlib-compressed blob.
+    Statistics are running aggregates kept in their own row and updated in
+    the same transaction as each save and delete.
+    """
+
+    def __init__(self, storage_dir: str = "results", retention_days: int = 90,
+                 db_name: str = "analysis_results.db"):
+        """
+        Initialize storage
+
+        Args:
+            storage_dir: Directory holding the database
+            retention_days: Results older than this are dropped (0 keeps everything)
+            db_name: Database file name
+        """
+        self.storage_dir = storage_dir
+        self.db_path = os.path.join(storage_dir, db_name)
+        self.retention_days = retention_days
+        self._local = threading.local()
+        self._saves = 0
+        self._ensure_storage_exists()
+
+    def _ensure_storage_exists(self):
+        """Create the database, purge expired results and import an existing result log"""
+        try:
+            os.makedirs(self.storage_dir, exist_ok=True)
+            conn = self._connection()
+            with conn:
+                conn.executescript(SCHEMA)
+            if not conn.execute("SELECT 1 FROM results LIMIT 1").fetchone():
+                self._import_result_log()
+            if not conn.execute("SELECT 1 FROM statistics").fetchone():
+                self._rebuild_statistics()
+            self._purge_expired()
+        except Exception as e:
+            logger.error(f"Error creating storage: {str(e)}")
+
+    def _connection(self) -> sqlite3.Connection:
+        """Per-thread connection (sqlite3 connections must not be shared across threads)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def _write_transaction(self):
+        """Transaction holding the write lock from the start, so statistics updates don't race"""
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+    def _load_statistics(self, conn: sqlite3.Connection) -> ResultStatistics:
+        row = conn.execute("SELECT data FROM statistics WHERE id = 1").fetchone()
+        data = json.loads(row[0]) if row else {}
+        return ResultStatistics.from_dict(data, self.retention_days)
+
+    @staticmethod
+    def _store_statistics(conn: sqlite3.Connection, stats: ResultStatistics):
+        conn.execute("INSERT OR REPLACE INTO statistics (id, data) VALUES (1, ?)", (json.dumps(stats.to_dict()),))
+
+    def _rebuild_statistics(self):
+        """Recompute the statistics row from every stored result"""
+        with self._write_transaction() as conn:
+            results = (json.loads(record) for record, in conn.execute("SELECT record FROM results"))
+            self._store_statistics(conn, ResultStatistics.from_results(results, self.retention_days))
+
+    def _import_result_log(self):
+        """Import results from the JSONL log (or legacy JSON file) in the same directory"""
+        has_log = os.path.isdir(os.path.join(self.storage_dir, "segments")) or \
+            os.path.exists(os.path.join(self.storage_dir, "analysis_results.json"))
+        if not has_log:
+            return
+        log = ResultStorage(self.storage_dir, retention_days=self.retention_days)
+        results = log.get_all_results()
+        if results:
+            conn = self._connection()
+            with conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    [self._to_row(result) for result in results]
+                )
+            logger.info(f"Imported {len(results)} results into {self.db_path}")
+
+    def _cutoff(self) -> str:
+        """Oldest upload date still within retention"""
+        if not self.retention_days:
+            return ''
+        return (datetime.utcnow() - timedelta(days=self.retention_days)).isoformat()
+
+    def _purge_expired(self):
+        if not self.retention_days:
+            return
+        with self._write_transaction() as conn:
+            stats = self._load_statistics(conn)
+            expired = conn.execute("SELECT record FROM results WHERE upload_date < ?", (self._cutoff(),)).fetchall()
+            for record, in expired:
+                stats.remove(json.loads(record))
+            deleted = conn.execute("DELETE FROM results WHERE upload_date < ?", (self._cutoff(),)).rowcount
+            self._store_statistics(conn, stats)
+        if deleted:
+            logger.info(f"Purged {deleted} results past the retention period")
+
+    @staticmethod
+    def _to_row(analysis: Dict[str, Any]) -> Tuple:
+        """Split a result into indexed columns, the record JSON and compressed diagnostics"""
+        record = dict(analysis)
+        auth_score = dict(record.get('authenticity_score') or {})
+        diagnostics = auth_score.pop('diagnostics', None)
+        if record.get('authenticity_score'):
+            record['authenticity_score'] = auth_score
+        match_score = record.get('matching_score') or {}
+        return (
+            record['id'],
+            str(record.get('upload_date', '')),
+            record.get('filename'),
+            auth_score.get('overall_score'),
+            match_score.get('overall_match'),
+            json.dumps(record, default=str),
+            zlib.compress(json.dumps(diagnostics, default=str).encode('utf-8')) if diagnostics is not None else None
+        )
+
+    @staticmethod
+    def _from_row(record: str, diagnostics: Optional[bytes]) -> Dict[str, Any]:
+        result = json.loads(record)
+        if diagnostics is not None and isinstance(result.get('authenticity_score'), dict):
+            result['authenticity_score']['diagnostics'] = json.loads(zlib.decompress(diagnostics))
+        return result
+
+    def _query(self, where: str = '', params: Tuple = (), order: str = 'upload_date DESC, id DESC',
+               limit: Optional[int] = None, offset: int = 0,
+               with_diagnostics: bool = True) -> Iterator[Dict[str, Any]]:
+        """Yield results within retention matching a WHERE clause"""
+        clauses = ["upload_date >= ?"]
+        args: List[Any] = [self._cutoff()]
+        if where:
+            clauses.append(where)
+            args.extend(params)
+        columns = "record, diagnostics" if with_diagnostics else "record, NULL"
+        sql = f"SELECT {columns} FROM results WHERE {' AND '.join(clauses)} ORDER BY {order}"
+        if limit or offset:
+            sql += " LIMIT ? OFFSET ?"
+            args.extend([limit if limit else -1, offset])
+        for record, diagnostics in self._connection().execute(sql, args):
+            yield self._from_row(record, diagnostics)
+
+    def save_result(self, analysis: Dict[str, Any]) -> bool:
+        """
+        Save a single analysis result
+
+        Args:
+            analysis: Analysis result dictionary
+
+        Returns:
+            True if successful, False otherwise
+        """
+        return self.save_results([analysis])
+
+    def save_results(self, analyses: List[Dict[str, Any]]) -> bool:
+        """
+        Save several analysis results in one transaction (group commit)
+
+        Args:
+            analyses: Analysis result dictionaries
+
+        Returns:
+            True if all were saved, False otherwise
+        """
+        try:
+            rows = []
+            for analysis in analyses:
+                # Add timestamp if not present
+                if 'upload_date' not in analysis:
+                    analysis['upload_date'] = datetime.utcnow().isoformat()
+                elif isinstance(analysis['upload_date'], datetime):
+                    analysis['upload_date'] = analysis['upload_date'].isoformat()
+                if not analysis.get('id'):
+                    analysis['id'] = str(uuid.uuid4())
+                rows.append(self._to_row(analysis))
+            if not rows:
+                return True
+
+            with self._write_transaction() as conn:
+                stats = self._load_statistics(conn)
+                for row in rows:
+                    previous = conn.execute("SELECT record FROM results WHERE id = ?", (row[0],)).fetchone()
+                    if previous:
+                        stats.remove(json.loads(previous[0]))
+                    conn.execute("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?)", row)
+                    stats.add(json.loads(row[5]))
+                self._store_statistics(conn, stats)
+
+            purged_at = self._saves // RETENTION_CHECK_INTERVAL
+            self._saves += len(rows)
+            if self._saves // RETENTION_CHECK_INTERVAL != purged_at:
+                self._purge_expired()
+
+            for analysis in analyses:
+                logger.info(f"Saved result for {analysis.get('filename', 'unknown')}")
+            return True
+
+        except Exception as e:
+            logger.error(f"Error saving result: {str(e)}")
+            return False
+
+    def get_all_results(self, limit: Optional[int] = None, offset: int = 0) -> List[Dict[str, Any]]:
+        """
+        Get all stored results
+
+        Args:
+            limit: Maximum number of results to return (most recent first)
+            offset: Number of most recent results to skip
+
+        Returns:
+            List of analysis results
+        """
+        try:
+            return list(self._query(limit=limit, offset=offset))
+        except Exception as e:
+            logger.error(f"Error getting results: {str(e)}")
+            return []
+
+    def get_results_page(self, limit: int = 50, cursor: Optional[str] = None,
+                         fields: Optional[List[str]] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Get one page of results, most recent first, by keyset on (upload date, ID)
+
+        Args:
+            limit: Page size
+            cursor: Cursor returned with the previous page (None for the first page)
+            fields: Fields to return (see project_result; None returns full records)
+
+        Returns:
+            Tuple of (results, cursor for the next page or None on the last page)
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        where, params = '', ()
+        if cursor:
+            where, params = "(upload_date, id) < (?, ?)", decode_cursor(cursor)
+        try:
+            results = list(self._query(where, params, limit=limit + 1,
+                                       with_diagnostics=needs_diagnostics(fields)))
+            next_cursor = None
+            if len(results) > limit:
+                results = results[:limit]
+                next_cursor = encode_cursor(results[-1].get('upload_date'), results[-1]['id'])
+            return [project_result(result, fields) for result in results], next_cursor
+
+        except Exception as e:
+            logger.error(f"Error getting results page: {str(e)}")
+            return [], None
+
+    def iter_results(self, start_date: Optional[str] = None, end_date: Optional[str] = None,
+                     min_score: Optional[float] = None, max_score: Optional[float] = None,
+                     min_match: Optional[float] = None, has_jd: Optional[bool] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Stream results in upload order, one record in memory at a time
+
+        Args:
+            start_date: Earliest upload date (ISO date or timestamp, inclusive)
+            end_date: Latest upload date (ISO date or timestamp, inclusive)
+            min_score: Minimum authenticity score
+            max_score: Maximum authenticity score
+            min_match: Minimum JD match score (results without a JD match are excluded)
+            has_jd: Only results with (True) or without (False) a JD match
+
+        Yields:
+            Analysis results
+        """
+        clauses, params = [], []
+        if start_date:
+            clauses.append("upload_date >= ?")
+            params.append(start_date)
+        if end_date:
+            clauses.append("substr(upload_date, 1, ?) <= ?")
+            params.extend([len(end_date), end_date])
+        if min_score is not None:
+            clauses.append("COALESCE(authenticity_score, 0) >= ?")
+            params.append(min_score)
+        if max_score is not None:
+            clauses.append("COALESCE(authenticity_score, 0) <= ?")
+            params.append(max_score)
+        if min_match is not None:
+            clauses.append("jd_match >= ?")
+            params.append(min_match)
+        if has_jd is not None:
+            clauses.append("jd_match IS NOT NULL" if has_jd else "jd_match IS NULL")
+
+        # A dedicated connection: a slow consumer doesn't hold up this thread's writes, and
+        # streaming responses may advance the generator from different worker threads
+        conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+        try:
+            where = f" AND {' AND '.join(clauses)}" if clauses else ''
+            cursor = conn.execute(
+                f"SELECT record, diagnostics FROM results WHERE upload_date >= ?{where} ORDER BY upload_date, id",
+                [self._cutoff()] + params
+            )
+            for record, diagnostics in cursor:
+                yield self._from_row(record, diagnostics)
+        finally:
+            conn.close()
+
+    def get_result_by_id(self, result_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a specific result by ID
+
+        Args:
+            result_id: The ID of the result to retrieve
+
+        Returns:
+            Analysis result or None if not found
+        """
+        try:
+            return next(self._query("id = ?", (result_id,)), None)
+        except Exception as e:
+            logger.error(f"Error getting result by ID: {str(e)}")
+            return None
+
+    def delete_result(self, result_id: str) -> bool:
+        """
+        Delete a specific result
+
+        Args:
+            result_id: The ID of the result to delete
+
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            with self._write_transaction() as conn:
+                previous = conn.execute("SELECT record FROM results WHERE id = ?", (result_id,)).fetchone()
+                if not previous:
+                    return False
+                stats = self._load_statistics(conn)
+                stats.remove(json.loads(previous[0]))
+                conn.execute("DELETE FROM results WHERE id = ?", (result_id,))
+                self._store_statistics(conn, stats)
+
+            logger.info(f"Deleted result {result_id}")
+            return True
+
+        except Exception as e:
+            logger.error(f"Error deleting result: {str(e)}")
+            return False
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """
+        Get statistics about stored results
+
+        Returns:
+            Dictionary with statistics
+        """
+        try:
+            return self._load_statistics(self._connection()).summary()
+
+        except Exception as e:
+            logger.error(f"Error calculating statistics: {str(e)}")
+            return {}
+
+    def close(self):
+        """Close this thread's connection"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def export_to_csv(self, output_path: str) -> bool:
+        """
+        Export results to CSV file
+
+        Args:
+            output_path: Path to output CSV file
+
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            count = 0
+            with open(output_path, 'w', newline='', encoding='utf-8') as csvfile:
+                writer = csv.DictWriter(csvfile, fieldnames=CSV_FIELDNAMES)
+                writer.writeheader()
+                for result in self._query(order='upload_date, id'):
+                    writer.writerow(result_to_csv_row(result))
+                    count += 1
+
+            if not count:
+                os.remove(output_path)
+                return False
+
+            logger.info(f"Exported {count} results to {output_path}")
+            return True
+
+        except Exception as e:
+            logger.error(f"Error exporting to CSV: {str(e)}")
+            return False
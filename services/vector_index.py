@@ -0,0 +1,358 @@
+import os
+import json
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Any, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+try:
+    import fcntl
+except ImportError:  # Windows: single-process locking only
+    fcntl = None
+
+# Keeps tokens such as c++, c#, node.js and asp.net intact
+TOKEN_PATTERN = r'(?u)[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9]+)*'
+
+
+class ResumeVectorIndex:
+    """
+    Incrementally maintained sparse TF-IDF index over resume text.
+
+    Documents are hashed (no vocabulary to refit) into sublinear term
+    frequencies and appended to flat CSR files on disk, which are
+    memory-mapped for queries. Document frequencies are updated on every
+    append, so IDF weights are always current without a full refit.
+
+    Several processes may share an index directory: appends and removals
+    hold an exclusive file lock and first pick up rows the other processes
+    wrote, and queries pick them up under a shared lock. Removals are
+    persisted as tombstones (row numbers in deleted.bin).
+    """
+
+    def __init__(self, index_dir: str, n_features: int = 2 ** 18, ngram_range: tuple = (1, 2)):
+        """
+        Initialize (or reopen) an index
+
+        Args:
+            index_dir: Directory holding the index files
+            n_features: Number of hash buckets
+            ngram_range: Word n-gram range used for hashing
+        """
+        from sklearn.feature_extraction.text import HashingVectorizer
+
+        self.index_dir = index_dir
+        self._lock = threading.RLock()
+        os.makedirs(index_dir, exist_ok=True)
+
+        meta = self._read_meta()
+        if meta:
+            n_features = meta['n_features']
+            ngram_range = tuple(meta['ngram_range'])
+        else:
+            self._write_meta(n_features, ngram_range)
+
+        self.n_features = n_features
+        self._vectorizer = HashingVectorizer(
+            n_features=n_features,
+            ngram_range=ngram_range,
+            token_pattern=TOKEN_PATTERN,
+            alternate_sign=False,
+            norm=None
+        )
+
+        self._ids: List[str] = []
+        self._row_of: Dict[str, int] = {}
+        self._deleted = np.zeros(0, dtype=bool)
+        self._df = np.zeros(n_features, dtype=np.int32)
+        self._indptr: List[int] = [0]
+        self._ids_bytes = 0
+        self._tombstones = 0
+        self._counted_rows = 0
+        self._matrix = None
+        self._doc_norms = None
+        self._load()
+
+    # -- file layout -------------------------------------------------------
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.index_dir, name)
+
+    def _read_meta(self) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._path('meta.json'), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def _write_meta(self, n_features: int, ngram_range: tuple):
+        with open(self._path('meta.json'), 'w', encoding='utf-8') as f:
+            json.dump({'n_features': n_features, 'ngram_range': list(ngram_range)}, f)
+
+    @contextmanager
+    def _file_lock(self, exclusive: bool = False):
+        """Inter-process lock: queries share it, appends and removals hold it exclusively"""
+        if fcntl is None:
+            yield
+            return
+        with open(self._path('.lock'), 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _load(self):
+        """Restore ids, row offsets and document frequencies from disk"""
+        try:
+            with self._lock, self._file_lock(exclusive=True):
+                self._refresh()
+                # A crash between file appends leaves trailing partial rows; drop them
+                self._truncate()
+            if self._ids:
+                logger.info(f"Loaded vector index with {len(self._row_of)} documents")
+        except Exception as e:
+            logger.error(f"Error loading vector index: {str(e)}")
+
+    def _refresh(self):
+        """Pick up rows and removals written since the last refresh (by any process); needs the file lock"""
+        known = len(self._ids)
+        ends = np.zeros(0, dtype=np.int64)
+        if os.path.exists(self._path('indptr.bin')) and os.path.getsize(self._path('indptr.bin')) > 8 * known:
+            ends = np.fromfile(self._path('indptr.bin'), dtype=np.int64, offset=8 * known)
+
+        if len(ends):
+            with open(self._path('ids.txt'), 'rb') as f:
+                f.seek(self._ids_bytes)
+                lines = f.read().split(b'\n')[:-1]  # The last piece is an incomplete line (or empty)
+            rows = min(len(lines), len(ends))
+            self._deleted = np.concatenate([self._deleted, np.zeros(rows, dtype=bool)])
+            for line, end in zip(lines[:rows], ends[:rows].tolist()):
+                self._apply_row(line.decode('utf-8'), end)
+                self._ids_bytes += len(line) + 1
+            self._count_terms()
+
+        if os.path.exists(self._path('deleted.bin')) and \
+                os.path.getsize(self._path('deleted.bin')) > 8 * self._tombstones:
+            deleted = np.fromfile(self._path('deleted.bin'), dtype=np.int64, offset=8 * self._tombstones)
+            for row in deleted.tolist():
+                if row < len(self._ids) and not self._deleted[row]:
+                    self._drop_row(row)
+            self._tombstones += len(deleted)
+
+    def _apply_row(self, doc_id: str, end: int):
+        """Track a row appended to the files (its _deleted flag already allocated); replaces any earlier row with the same ID"""
+        previous = self._row_of.get(doc_id)
+        if previous is not None:
+            self._drop_row(previous)
+        self._ids.append(doc_id)
+        self._indptr.append(end)
+        self._row_of[doc_id] = len(self._ids) - 1
+
+        # Row count changed: the CSR view and IDF-weighted norms are stale
+        self._matrix = None
+        self._doc_norms = None
+
+    def _count_terms(self):
+        """Add the terms of rows appended since the last call to the document frequencies"""
+        start, end = self._indptr[self._counted_rows], self._indptr[-1]
+        if end > start:
+            indices = np.memmap(self._path('indices.bin'), dtype=np.int32, mode='r', shape=(end,))[start:]
+            live = np.repeat(~self._deleted[self._counted_rows:], np.diff(self._indptr[self._counted_rows:]))
+            self._df += np.bincount(indices[live], minlength=self.n_features).astype(np.int32)
+        self._counted_rows = len(self._ids)
+
+    def _drop_row(self, row: int):
+        """Exclude a row from document frequencies and query results"""
+        self._deleted[row] = True
+        if self._row_of.get(self._ids[row]) == row:
+            del self._row_of[self._ids[row]]
+        if row < self._counted_rows:
+            np.subtract.at(self._df, self._row_indices(row), 1)
+        self._doc_norms = None
+
+    def _truncate(self):
+        """Drop bytes written past the last complete row; needs the exclusive file lock"""
+        rows, nnz = len(self._ids), self._indptr[-1]
+        for name, size in (('indices.bin', 4 * nnz), ('data.bin', 4 * nnz), ('indptr.bin', 8 * rows),
+                           ('ids.txt', self._ids_bytes)):
+            path = self._path(name)
+            if os.path.exists(path) and os.path.getsize(path) > size:
+                with open(path, 'r+b') as f:
+                    f.truncate(size)
+
+    # -- indexing ----------------------------------------------------------
+
+    def _term_frequencies(self, text: str):
+        """Hashed sublinear term frequencies of a text as a 1-row CSR matrix"""
+        vector = self._vectorizer.transform([text.lower()])
+        vector.data = (1.0 + np.log(vector.data)).astype(np.float32)
+        return vector
+
+    def sync(self):
+        """Pick up documents added or removed by other processes"""
+        with self._lock, self._file_lock():
+            self._refresh()
+
+    def __len__(self) -> int:
+        self.sync()
+        return len(self._row_of)
+
+    def __contains__(self, doc_id: str) -> bool:
+        self.sync()
+        return str(doc_id) in self._row_of
+
+    def add(self, doc_id: str, text: str):
+        """
+        Append a document; re-adding an ID replaces the earlier version
+
+        Args:
+            doc_id: Document identifier
+            text: Document text
+        """
+        doc_id = str(doc_id)
+        if '\n' in doc_id:
+            raise ValueError("Document IDs cannot contain newlines")
+
+        vector = self._term_frequencies(text)
+        indices = vector.indices.astype(np.int32)
+        data = vector.data.astype(np.float32)
+
+        with self._lock, self._file_lock(exclusive=True):
+            # Other processes may have appended since; offsets follow the files, not this process
+            self._refresh()
+            self._truncate()
+            end = self._indptr[-1] + len(indices)
+            with open(self._path('indices.bin'), 'ab') as f:
+                indices.tofile(f)
+            with open(self._path('data.bin'), 'ab') as f:
+                data.tofile(f)
+            with open(self._path('indptr.bin'), 'ab') as f:
+                np.array([end], dtype=np.int64).tofile(f)
+            encoded = (doc_id + '\n').encode('utf-8')
+            with open(self._path('ids.txt'), 'ab') as f:
+                f.write(encoded)
+
+            self._ids_bytes += len(encoded)
+            self._deleted = np.append(self._deleted, False)
+            self._apply_row(doc_id, end)
+            self._count_terms()
+
+    def remove(self, doc_id: str) -> bool:
+        """Remove a document from query results (persisted, so it stays removed after a restart)"""
+        doc_id = str(doc_id)
+        with self._lock, self._file_lock(exclusive=True):
+            self._refresh()
+            row = self._row_of.get(doc_id)
+            if row is None:
+                return False
+            with open(self._path('deleted.bin'), 'ab') as f:
+                np.array([row], dtype=np.int64).tofile(f)
+            self._tombstones += 1
+            self._drop_row(row)
+            return True
+
+    def _row_indices(self, row: int) -> np.ndarray:
+        start, end = self._indptr[row], self._indptr[row + 1]
+        return np.memmap(self._path('indices.bin'), dtype=np.int32, mode='r', shape=(self._indptr[-1],))[start:end]
+
+    # -- querying ----------------------------------------------------------
+
+    def _idf(self) -> np.ndarray:
+        """Smoothed inverse document frequencies over the live documents"""
+        n_docs = len(self._row_of)
+        return (np.log((1.0 + n_docs) / (1.0 + self._df)) + 1.0).astype(np.float32)
+
+    def _csr(self):
+        """Memory-mapped CSR view of all rows"""
+        from scipy.sparse import csr_matrix
+
+        if self._matrix is None:
+            nnz = self._indptr[-1]
+            rows = len(self._ids)
+            if nnz:
+                indices = np.memmap(self._path('indices.bin'), dtype=np.int32, mode='r', shape=(nnz,))
+                data = np.memmap(self._path('data.bin'), dtype=np.float32, mode='r', shape=(nnz,))
+            else:
+                indices = np.zeros(0, dtype=np.int32)
+                data = np.zeros(0, dtype=np.float32)
+            self._matrix = csr_matrix(
+                (data, indices, np.asarray(self._indptr, dtype=np.int64)),
+                shape=(rows, self.n_features)
+            )
+        return self._matrix
+
+    def _norms(self, idf: np.ndarray) -> np.ndarray:
+        """IDF-weighted L2 norms of every row, cached until the index changes"""
+        if self._doc_norms is None:
+            matrix = self._csr()
+            weighted_sq = matrix.multiply(matrix).dot(idf.astype(np.float64) ** 2)
+            self._doc_norms = np.sqrt(np.asarray(weighted_sq).ravel())
+        return self._doc_norms
+
+    def _query_weights(self, text: str, idf: np.ndarray):
+        """IDF-weighted query vector and its norm"""
+        query = self._term_frequencies(text)
+        weights = query.data * idf[query.indices]
+        return query.indices, weights, float(np.sqrt(np.dot(weights, weights)))
+
+    def search(self, query_text: str, top_k: int = 10) -> List[Dict[str, Any]]:
+        """
+        Cosine top-K search
+
+        Args:
+            query_text: Free text, typically a job description
+            top_k: Number of results
+
+        Returns:
+            List of {'id', 'score'} sorted by descending similarity
+        """
+        with self._lock:
+            self.sync()
+            if not self._row_of or top_k < 1:
+                return []
+
+            idf = self._idf()
+            q_indices, q_weights, q_norm = self._query_weights(query_text, idf)
+            if q_norm == 0:
+                return []
+
+            # Dot product of IDF-weighted vectors: tf_d . (idf^2 * tf_q)
+            dense_query = np.zeros(self.n_features, dtype=np.float64)
+            dense_query[q_indices] = q_weights * idf[q_indices]
+            norms = self._norms(idf)
+            scores = self._csr().dot(dense_query)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                scores = np.where(norms > 0, scores / (norms * q_norm), 0.0)
+            scores[self._deleted] = -1.0
+
+            k = min(top_k, len(self._row_of))
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top], kind='stable')]
+            return [
+                {'id': self._ids[row], 'score': round(float(scores[row]), 4)}
+                for row in top if scores[row] > 0
+            ]
+
+    def similarity(self, text_a: str, text_b: str) -> float:
+        """
+        Cosine similarity of two texts under the index's current IDF weights
+
+        Returns:
+            Similarity in the range 0-1
+        """
+        with self._lock:
+            self.sync()
+            idf = self._idf()
+        a_indices, a_weights, a_norm = self._query_weights(text_a, idf)
+        b_indices, b_weights, b_norm = self._query_weights(text_b, idf)
+        if a_norm == 0 or b_norm == 0:
+            return 0.0
+
+        common, a_pos, b_pos = np.intersect1d(a_indices, b_indices, assume_unique=True, return_indices=True)
+        if len(common) == 0:
+            return 0.0
+        return float(np.dot(a_weights[a_pos], b_weights[b_pos]) / (a_norm * b_norm))
@@ -4,13 +4,25 @@ from datetime import datetime
 from sqlalchemy.orm import Session
 from core.celery_app import celery_app
 from core.database import SessionLocal
+from core.jobs import job_store
 from models.db import Resume, Candidate, Education, WorkExperience, Skill
 from services.document_processor import DocumentProcessor
 from services.resume_data_extractor import ResumeDataExtractor
 from services.resume_analyzer import ResumeAuthenticityAnalyzer
+from services.jd_matcher import JDMatcher
+from services.job_catalog import JobCatalog
 
 logger = logging.getLogger(__name__)
 
+# Open jobs are compiled once per worker process and kept in sync incrementally
+job_catalog = JobCatalog(JDMatcher.from_settings())
+
+def _report(task, resume_id: int, stage: str):
+    """Publish the current processing stage to Celery and the shared job store"""
+    task.update_state(state='PROCESSING', meta={'status': stage})
+    job_store.update(str(resume_id), status='processing', stage=stage)
+
+
 @celery_app.task(bind=True, name='tasks.resume_tasks.process_resume')
 def process_resume(self, resume_id: int):
     """
@@ -20,7 +32,8 @@ def process_resume(self, resume_id: int):
     3. Analyze authenticity
     4. Check for duplicates
     5. Create/update candidate record
-    6. Update resume status
+    6. Auto-match against open jobs
+    7. Update resume status
     
     Args:
         resume_id: ID of the resume to process
@@ -29,7 +42,7 @@ def process_resume(self, resume_id: int):
     
     try:
         # Update task state
-        self.update_state(state='PROCESSING', meta={'status': 'Starting resume processing'})
+        _report(self, resume_id, 'Starting resume processing')
         
         # Get resume from database
         resume = db.query(Resume).filter(Resume.id == resume_id).first()
@@ -43,7 +56,7 @@ def process_resume(self, resume_id: int):
         logger.info(f"Processing resume {resume_id}: {resume.file_name}")
         
         # Step 1: Extract text
-        self.update_state(state='PROCESSING', meta={'status': 'Extracting text from document'})
+        _report(self, resume_id, 'Extracting text from document')
         doc_processor = DocumentProcessor()
         text = doc_processor.extract_text(resume.file_path)
         resume.raw_text = text
@@ -53,14 +66,15 @@ def process_resume(self, resume_id: int):
             raise ValueError("Could not extract meaningful text from document")
         
         # Step 2: Extract structured data
-        self.update_state(state='PROCESSING', meta={'status': 'Extracting structured data'})
+        _report(self, resume_id, 'Extracting structured data')
         data_extractor = ResumeDataExtractor()
         extracted_data = data_extractor.extract_all(text)
         resume.extracted_data = extracted_data
+        resume.experience_years = extracted_data.get('experience_years')
         db.commit()
         
         # Step 3: Analyze authenticity
-        self.update_state(state='PROCESSING', meta={'status': 'Analyzing authenticity'})
+        _report(self, resume_id, 'Analyzing authenticity')
         analyzer = ResumeAuthenticityAnalyzer()
         auth_result = analyzer.analyze_authenticity(resume.file_path, text)
         resume.authenticity_score = int(auth_result.get('overall_score', 0))
@@ -68,7 +82,7 @@ def process_resume(self, resume_id: int):
         db.commit()
         
         # Step 4: Check for duplicate candidate
-        self.update_state(state='PROCESSING', meta={'status': 'Checking for duplicates'})
+        _report(self, resume_id, 'Checking for duplicates')
         candidate = None
         
         if extracted_data.get('email'):
@@ -82,7 +96,7 @@ def process_resume(self, resume_id: int):
         
         # Step 5: Create or update candidate
         if not candidate and extracted_data.get('email'):
-            self.update_state(state='PROCESSING', meta={'status': 'Creating candidate profile'})
+            _report(self, resume_id, 'Creating candidate profile')
             
             candidate = Candidate(
                 full_name=extracted_data.get('name') or 'Unknown',
@@ -133,11 +147,29 @@ def process_resume(self, resume_id: int):
         if candidate:
             resume.candidate_id = candidate.id
         
+        # Step 6: Auto-match against open jobs sharing skills with the resume
+        _report(self, resume_id, 'Matching against open jobs')
+        try:
+            job_catalog.sync(db)
+            job_matches = job_catalog.match_resume(text)
+            if job_matches:
+                resume.jd_match_score = int(job_matches[0]['overall_match'])
+                resume.jd_match_details = {
+                    'matches': job_matches,
+                    'matched_at': datetime.utcnow().isoformat(),
+                }
+        except Exception as e:
+            # Matching is best-effort; the resume itself processed fine
+            logger.warning(f"Auto-matching failed for resume {resume_id}: {str(e)}")
+        
         # Update resume status to completed
         resume.upload_status = 'completed'
         resume.processed_at = datetime.utcnow()
         db.commit()
         
+        job_store.update(str(resume_id), status='completed', stage=None,
+                         result={'candidate_id': candidate.id if candidate else None,
+                                 'authenticity_score': resume.authenticity_score})
         logger.info(f"Successfully processed resume {resume_id}")
         
         return {
@@ -150,6 +182,8 @@ def process_resume(self, resume_id: int):
     except Exception as e:
         logger.error(f"Error processing resume {resume_id}: {str(e)}", exc_info=True)
         
+        job_store.update(str(resume_id), status='failed', error=str(e))
+        
         # Update resume status to failed
         if resume:
             resume.upload_status = 'failed'
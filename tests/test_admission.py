@@ -0,0 +1,132 @@
+import time
+import asyncio
+import threading
+import pytest
+from core.admission import AdmissionController, AdmissionRejected, StageGate
+
+
+@pytest.fixture
+def controller():
+    return AdmissionController(max_scans=2, scan_queue=1, stage_limits={'ocr': 1}, stage_queues={'ocr': 1})
+
+
+class TestStageGate:
+    """Test cases for per-stage concurrency limits"""
+
+    def test_limit_is_respected(self):
+        """Test no more than limit holders run at once, from threads and the loop alike"""
+        gate = StageGate('parse', limit=2, max_queue=10)
+        running = []
+        peak = []
+
+        def work():
+            with gate.hold():
+                running.append(1)
+                peak.append(len(running))
+                time.sleep(0.02)
+                running.pop()
+
+        async def run():
+            async def held():
+                async with gate.hold_async():
+                    running.append(1)
+                    peak.append(len(running))
+                    await asyncio.sleep(0.02)
+                    running.pop()
+
+            await asyncio.gather(*(held() for _ in range(4)), *(asyncio.to_thread(work) for _ in range(4)))
+
+        asyncio.run(run())
+
+        assert max(peak) <= 2
+        assert gate.running == 0
+        assert gate.waiting == 0
+        assert gate.get_stats()['completed'] == 8
+
+    def test_cancelled_waiter_passes_slot_on(self):
+        """Test a waiter that gives up does not keep the slot"""
+        gate = StageGate('matching', limit=1, max_queue=10)
+
+        async def run():
+            async with gate.hold_async():
+                waiter = asyncio.ensure_future(gate.hold_async().__aenter__())
+                await asyncio.sleep(0)
+                assert gate.waiting == 1
+                waiter.cancel()
+                with pytest.raises(asyncio.CancelledError):
+                    await waiter
+            async with gate.hold_async():
+                return gate.running
+
+        assert asyncio.run(run()) == 1
+        assert gate.running == 0
+
+    def test_retry_after_grows_with_queue(self):
+        """Test the Retry-After estimate follows queue depth and stage time"""
+        gate = StageGate('ocr', limit=2, max_queue=4)
+        gate.avg_seconds = 3.0
+        assert gate.retry_after() == 2
+
+        gate._waiters.extend([lambda: False] * 5)
+        assert gate.retry_after() == 9
+
+
+class TestAdmissionController:
+    """Test cases for refusing scans when the pipeline is saturated"""
+
+    def test_admits_until_queue_full(self, controller):
+        """Test scans wait for a slot, then are refused with 429 once the queue is full"""
+        async def run():
+            release = asyncio.Event()
+
+            async def scan():
+                controller.check()
+                async with controller.scans.hold_async():
+                    await release.wait()
+
+            tasks = [asyncio.ensure_future(scan()) for _ in range(3)]
+            await asyncio.sleep(0.01)
+            assert controller.scans.running == 2
+            assert controller.scans.waiting == 1
+
+            with pytest.raises(AdmissionRejected) as rejected:
+                controller.check()
+            release.set()
+            await asyncio.gather(*tasks)
+            return rejected.value
+
+        error = asyncio.run(run())
+
+        assert error.status_code == 429
+        assert error.headers['Retry-After'] == str(error.retry_after)
+        assert controller.get_stats()['rejected'] == 1
+        assert controller.scans.running == 0
+
+    def test_backed_up_stage_refuses_with_503(self, controller):
+        """Test new scans get 503 while a stage's wait queue is full"""
+        release = threading.Event()
+
+        def ocr():
+            with controller.stage_sync('ocr'):
+                release.wait()
+
+        threads = [threading.Thread(target=ocr) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        while controller.stages['ocr'].waiting < 1:
+            time.sleep(0.001)
+
+        with pytest.raises(AdmissionRejected) as rejected:
+            controller.check()
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        assert rejected.value.status_code == 503
+        assert rejected.value.stage == 'ocr'
+        controller.check()
+
+    def test_unknown_stage_is_unlimited(self, controller):
+        """Test stages without a configured limit are not gated"""
+        with controller.stage_sync('matching'):
+            pass
@@ -0,0 +1,69 @@
+import io
+import os
+import zipfile
+import hashlib
+import pytest
+from core.archives import ZipArchiveReader, ArchiveError
+
+EXTENSIONS = [".pdf", ".doc", ".docx"]
+
+
+def make_zip(members):
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for name, content in members.items():
+            archive.writestr(name, content)
+    buf.seek(0)
+    return buf
+
+
+def open_reader(buf, **limits):
+    options = dict(max_member_bytes=1024 * 1024, max_total_bytes=10 * 1024 * 1024, max_ratio=100, max_members=100)
+    options.update(limits)
+    return ZipArchiveReader(buf, EXTENSIONS, **options)
+
+
+class TestZipArchiveReader:
+    """Test cases for streaming resumes out of ZIP archives"""
+
+    def test_members_ingested_with_hash(self, tmp_path):
+        """Test a member is decompressed into the spool and hashed"""
+        content = os.urandom(2000)
+        reader = open_reader(make_zip({'resumes/cv.pdf': content}))
+        member = reader.members[0]
+
+        upload = reader.ingest(member, str(tmp_path))
+
+        assert member.skip_reason is None
+        assert upload.filename == 'cv.pdf'
+        assert upload.sha256 == hashlib.sha256(content).hexdigest()
+        assert upload.read_bytes() == content
+
+    def test_non_resumes_skipped(self):
+        """Test directories, metadata and other file types are skipped"""
+        buf = make_zip({'dir/': b'', 'notes.txt': b'hi', '__MACOSX/._cv.pdf': b'x', 'cv.docx': b'resume'})
+        reasons = {member.name: member.skip_reason for member in open_reader(buf).members}
+
+        assert reasons['dir/'] == 'directory'
+        assert 'not allowed' in reasons['notes.txt']
+        assert reasons['__MACOSX/._cv.pdf'] == 'hidden or metadata file'
+        assert reasons['cv.docx'] is None
+
+    def test_zip_bomb_limits(self):
+        """Test highly compressed, oversized and too many members are refused"""
+        bomb = make_zip({'bomb.pdf': b'\0' * 500000})
+        assert open_reader(bomb).members[0].skip_reason == 'suspicious compression ratio'
+
+        big = make_zip({'big.pdf': os.urandom(5000)})
+        assert 'maximum allowed size' in open_reader(big, max_member_bytes=1000).members[0].skip_reason
+
+        with pytest.raises(ArchiveError):
+            open_reader(make_zip({f'cv{i}.pdf': b'x' for i in range(5)}), max_members=3)
+
+        with pytest.raises(ArchiveError):
+            open_reader(make_zip({'a.pdf': os.urandom(3000)}), max_total_bytes=1000)
+
+    def test_invalid_archive(self):
+        """Test a file that is not a ZIP archive is rejected"""
+        with pytest.raises(ArchiveError):
+            open_reader(io.BytesIO(b'not a zip'))
@@ -0,0 +1,203 @@
+import time
+import pytest
+from core.cache import SimpleCache, TieredCache, DocumentMemo
+
+
+def make_analysis(name, padding=100):
+    return {'filename': name, 'details': 'x' * padding}
+
+
+@pytest.fixture
+def cache():
+    return SimpleCache(ttl_minutes=30, max_bytes=1000)
+
+
+class TestSimpleCache:
+    """Test cases for the bounded analysis cache"""
+
+    def test_get_and_set(self, cache):
+        """Test entries are keyed by content and JD"""
+        cache.set(b'resume', make_analysis('a'), 'jd one')
+
+        assert cache.get(b'resume', 'jd one')['filename'] == 'a'
+        assert cache.get(b'resume', 'jd two') is None
+        assert cache.get(b'resume') is None
+
+    def test_byte_budget_evicts_least_recently_used(self, cache):
+        """Test the cache stays within its byte budget, dropping the LRU entry"""
+        for i in range(4):
+            cache.set(f'r{i}'.encode(), make_analysis(f'r{i}', padding=200))
+        cache.get(b'r0')
+        cache.set(b'r4', make_analysis('r4', padding=200))
+
+        stats = cache.get_stats()
+        assert stats['bytes'] <= 1000
+        assert stats['evictions'] >= 1
+        assert cache.get(b'r0') is not None
+        assert cache.get(b'r1') is None
+
+    def test_oversized_entry_not_cached(self, cache):
+        """Test entries larger than the budget are skipped"""
+        cache.set(b'big', make_analysis('big', padding=5000))
+
+        assert cache.get(b'big') is None
+        assert cache.get_stats()['bytes'] == 0
+
+    def test_replacing_entry_updates_bytes(self, cache):
+        """Test re-setting a key doesn't double count its size"""
+        cache.set(b'a', make_analysis('a'))
+        size = cache.get_stats()['bytes']
+        cache.set(b'a', make_analysis('a'))
+
+        assert cache.get_stats()['bytes'] == size
+
+    def test_ttl_expiry(self):
+        """Test expired entries are misses and are removed"""
+        cache = SimpleCache(ttl_minutes=0.001)
+        cache.set(b'a', make_analysis('a'))
+        time.sleep(0.1)
+
+        assert cache.get(b'a') is None
+        assert cache.get_stats()['expirations'] == 1
+        assert cache.get_stats()['total_entries'] == 0
+
+    def test_hit_miss_counters(self, cache):
+        """Test hit and miss counters and hit rate"""
+        cache.set(b'a', make_analysis('a'))
+        cache.get(b'a')
+        cache.get(b'b')
+
+        stats = cache.get_stats()
+        assert (stats['hits'], stats['misses'], stats['hit_rate']) == (1, 1, 0.5)
+
+
+class FakeRedis:
+    """In-memory stand-in for the Redis client"""
+
+    def __init__(self):
+        self.store = {}
+        self.fail = False
+
+    def get(self, key):
+        if self.fail:
+            raise ConnectionError("redis down")
+        return self.store.get(key)
+
+    def set(self, key, value, ex=None):
+        if self.fail:
+            raise ConnectionError("redis down")
+        self.store[key] = value
+
+
+class TestTieredCache:
+    """Test cases for the two-tier analysis cache"""
+
+    def test_workers_share_entries(self):
+        """Test an analysis cached by one worker is a hit in another"""
+        shared = FakeRedis()
+        worker_a = TieredCache(SimpleCache(), shared, namespace="analysis:1")
+        worker_b = TieredCache(SimpleCache(), shared, namespace="analysis:1")
+
+        worker_a.set(b'resume', make_analysis('a'), 'jd')
+
+        assert worker_b.get(b'resume', 'jd')['filename'] == 'a'
+        assert worker_b.get_stats()['shared']['hits'] == 1
+        # Promoted into the local tier
+        assert worker_b.local.get(b'resume', 'jd') is not None
+
+    def test_values_compressed(self):
+        """Test the shared tier stores compressed payloads"""
+        shared = FakeRedis()
+        cache = TieredCache(SimpleCache(), shared)
+        cache.set(b'resume', make_analysis('a', padding=5000))
+
+        payload = next(iter(shared.store.values()))
+        assert len(payload) < 1000
+
+    def test_version_namespace(self):
+        """Test a new analyzer version does not read old entries"""
+        shared = FakeRedis()
+        TieredCache(SimpleCache(), shared, namespace="analysis:1").set(b'resume', make_analysis('a'))
+
+        assert TieredCache(SimpleCache(), shared, namespace="analysis:2").get(b'resume') is None
+
+    def test_redis_errors_fall_back_to_local(self):
+        """Test Redis failures don't fail lookups"""
+        shared = FakeRedis()
+        cache = TieredCache(SimpleCache(), shared)
+        shared.fail = True
+
+        cache.set(b'resume', make_analysis('a'))
+
+        assert cache.get(b'resume')['filename'] == 'a'
+        assert cache.get(b'other') is None
+        assert cache.get_stats()['shared']['errors'] == 1
+
+    def test_local_only_without_url(self):
+        """Test the cache works without a shared tier"""
+        cache = TieredCache.from_url(SimpleCache(), None)
+        cache.set(b'resume', make_analysis('a'))
+
+        assert cache.get(b'resume') is not None
+        assert cache.get_stats()['shared']['enabled'] is False
+
+    def test_async_access_runs_off_the_loop(self):
+        """Test shared tier round trips made from coroutines run on worker threads"""
+        import asyncio
+        import threading
+
+        class RecordingRedis(FakeRedis):
+            threads = set()
+
+            def get(self, key):
+                self.threads.add(threading.current_thread())
+                return super().get(key)
+
+            def set(self, key, value, ex=None):
+                self.threads.add(threading.current_thread())
+                super().set(key, value, ex)
+
+        shared = RecordingRedis()
+        worker_a = TieredCache(SimpleCache(), shared)
+        worker_b = TieredCache(SimpleCache(), shared)
+
+        async def run():
+            key = worker_a.key_for_digest('abc')
+            await worker_a.aset_key(key, make_analysis('a'))
+            return await worker_b.aget_key(key)
+
+        assert asyncio.run(run())['filename'] == 'a'
+        assert threading.main_thread() not in RecordingRedis.threads
+
+
+class TestDocumentMemo:
+    """Test cases for the per-document memo"""
+
+    def test_computes_once_per_text(self):
+        """Test a text is computed once and the least recently used text is dropped"""
+        memo = DocumentMemo(max_entries=2)
+        calls = []
+
+        def compute(text):
+            calls.append(text)
+            return [text]
+
+        first = memo.get_or_compute('a', compute)
+        assert memo.get_or_compute('a', compute) is first
+        memo.get_or_compute('b', compute)
+        memo.get_or_compute('a', compute)
+        memo.get_or_compute('c', compute)
+        memo.get_or_compute('a', compute)
+
+        assert calls == ['a', 'b', 'c']
+        assert len(memo) == 2
+
+    def test_invalid_value_recomputed(self):
+        """Test a stored value failing the validity check is replaced"""
+        memo = DocumentMemo(max_entries=2)
+        memo.get_or_compute('jd', lambda text: {'version': 1})
+
+        value = memo.get_or_compute('jd', lambda text: {'version': 2}, valid=lambda v: v['version'] == 2)
+
+        assert value == {'version': 2}
+        assert memo.get_or_compute('jd', lambda text: {'version': 3}) == {'version': 2}
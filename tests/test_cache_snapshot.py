@@ -0,0 +1,108 @@
+import os
+import pytest
+from core.cache import SimpleCache
+from core.cache_snapshot import CacheSnapshot, CacheSnapshotter
+
+VERSION = {'analyzer': '1', 'matcher': '1'}
+
+
+@pytest.fixture
+def snapshot_path(tmp_path):
+    return str(tmp_path / "cache_snapshot.bin")
+
+
+def make_snapshotter(path, version=VERSION):
+    caches = {'analysis': SimpleCache(ttl_minutes=30), 'verification': SimpleCache(ttl_minutes=60)}
+    return CacheSnapshotter(path, caches, version, interval_seconds=0), caches
+
+
+class TestCacheSnapshot:
+    """Test cases for persisting caches across restarts"""
+
+    def test_entries_survive_restart(self, snapshot_path):
+        """Test a new process serves snapshotted entries, decoding them on first use"""
+        snapshotter, caches = make_snapshotter(snapshot_path)
+        caches['analysis'].set_key('a', {'id': 'a', 'score': 80})
+        caches['verification'].set_key('v', {'linkedin_found': True})
+        assert snapshotter.save()
+
+        restarted, fresh = make_snapshotter(snapshot_path)
+        assert restarted.load()
+        assert fresh['analysis'].get_stats()['total_entries'] == 0
+
+        assert fresh['analysis'].get_key('a') == {'id': 'a', 'score': 80}
+        assert fresh['verification'].get_key('v') == {'linkedin_found': True}
+        assert fresh['analysis'].get_key('v') is None
+        assert fresh['analysis'].get_stats()['snapshot_hits'] == 1
+
+    def test_other_version_ignored(self, snapshot_path):
+        """Test a snapshot from another analyzer or matcher version is not used"""
+        snapshotter, caches = make_snapshotter(snapshot_path)
+        caches['analysis'].set_key('a', {'id': 'a'})
+        snapshotter.save()
+
+        restarted, fresh = make_snapshotter(snapshot_path, {'analyzer': '2', 'matcher': '1'})
+
+        assert not restarted.load()
+        assert fresh['analysis'].get_key('a') is None
+
+    def test_untouched_entries_carried_over(self, snapshot_path):
+        """Test entries never looked up since loading are kept in the next snapshot"""
+        snapshotter, caches = make_snapshotter(snapshot_path)
+        caches['analysis'].set_key('old', {'id': 'old'})
+        snapshotter.save()
+
+        restarted, fresh = make_snapshotter(snapshot_path)
+        restarted.load()
+        fresh['analysis'].set_key('new', {'id': 'new'})
+        restarted.save()
+
+        third, caches = make_snapshotter(snapshot_path)
+        third.load()
+        assert caches['analysis'].get_key('old') == {'id': 'old'}
+        assert caches['analysis'].get_key('new') == {'id': 'new'}
+
+    def test_expired_entries_not_loaded(self, snapshot_path):
+        """Test TTLs keep running while the process is down"""
+        snapshotter, caches = make_snapshotter(snapshot_path)
+        caches['analysis'].set_key('a', {'id': 'a'})
+        snapshotter.save()
+
+        snapshot = CacheSnapshot(snapshot_path, VERSION)
+        snapshot._sections['analysis']['a'] = snapshot._sections['analysis']['a'][:2] + (0, 10)
+
+        assert snapshot.get('analysis', 'a') is None
+
+    def test_corrupt_file_ignored(self, snapshot_path):
+        """Test a truncated snapshot starts the caches empty"""
+        with open(snapshot_path, 'wb') as f:
+            f.write(b'partial')
+
+        snapshotter, caches = make_snapshotter(snapshot_path)
+
+        assert not snapshotter.load()
+        assert caches['analysis'].get_key('a') is None
+        assert os.path.exists(snapshot_path)
+
+    def test_concurrent_writers_do_not_interleave(self, snapshot_path):
+        """Test workers saving at the same time each replace the file with a whole snapshot"""
+        import threading
+
+        writers = []
+        for i in range(4):
+            snapshotter, caches = make_snapshotter(snapshot_path)
+            for n in range(50):
+                caches['analysis'].set_key(f'{i}-{n}', {'id': f'{i}-{n}', 'text': 'x' * 200})
+            writers.append(snapshotter)
+
+        threads = [threading.Thread(target=writer.save) for writer in writers for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        snapshot = CacheSnapshot(snapshot_path, VERSION)
+        keys = list(snapshot._sections['analysis'])
+        assert len(keys) == 50
+        assert all(snapshot.get('analysis', key) is not None for key in keys)
+        assert [name for name in os.listdir(os.path.dirname(snapshot_path)) if name.endswith('.tmp')] == []
@@ -0,0 +1,135 @@
+import pytest
+from services.jd_matcher import JDMatcher
+from services.candidate_ranker import CandidateRanker
+
+
+RESUMES = {
+    'a': "Python, Django and PostgreSQL developer with 4 years of experience. B.Tech graduate.",
+    'b': "Java developer with 10 years of experience in Spring. Master of Engineering.",
+    'c': "Python and AWS engineer. 1 year experience.",
+    'd': "Graphic designer",
+}
+JD = "Python developer with 3 years of experience. Bachelor's degree. Skills: Python, Django, AWS"
+
+
+@pytest.fixture
+def matcher():
+    return JDMatcher()
+
+
+@pytest.fixture
+def ranker(matcher, tmp_path):
+    ranker = CandidateRanker(matcher, index_path=str(tmp_path / "index.jsonl"), initial_capacity=2)
+    for candidate_id, text in RESUMES.items():
+        ranker.add_candidate(candidate_id, text=text, filename=f"{candidate_id}.pdf",
+                             status='screened' if candidate_id == 'c' else 'new')
+    return ranker
+
+
+class TestCandidateRanker:
+    """Test cases for ranking stored resumes against a JD"""
+
+    def test_rank_order_matches_individual_scores(self, matcher, ranker):
+        """Test ranking agrees with scoring each resume individually"""
+        result = ranker.rank(matcher.compile_jd(JD), limit=10)
+
+        expected = sorted(
+            RESUMES,
+            key=lambda cid: -matcher.match_resume_with_jd(RESUMES[cid], JD)['overall_match']
+        )
+        assert result['total'] == 4
+        assert [r['id'] for r in result['results']] == expected
+        for row in result['results']:
+            assert row['overall_match'] == matcher.match_resume_with_jd(RESUMES[row['id']], JD)['overall_match']
+
+    def test_pagination(self, matcher, ranker):
+        """Test offset and limit return consecutive pages"""
+        compiled = matcher.compile_jd(JD)
+        full = [r['id'] for r in ranker.rank(compiled, limit=4)['results']]
+        page = ranker.rank(compiled, limit=2, offset=2)
+
+        assert [r['id'] for r in page['results']] == full[2:]
+        assert [r['rank'] for r in page['results']] == [3, 4]
+
+    def test_status_filter(self, matcher, ranker):
+        """Test ranking only candidates with the requested status"""
+        result = ranker.rank(matcher.compile_jd(JD), statuses=['screened'])
+
+        assert result['total'] == 1
+        assert result['results'][0]['id'] == 'c'
+
+    def test_iter_ranked_streams_same_order(self, matcher, ranker):
+        """Test the streaming iterator yields the same order as rank"""
+        compiled = matcher.compile_jd(JD)
+        streamed = [r['id'] for r in ranker.iter_ranked(compiled)]
+
+        assert streamed == [r['id'] for r in ranker.rank(compiled, limit=10)['results']]
+
+    def test_index_reloaded_from_file(self, matcher, ranker):
+        """Test a new ranker restores the persisted index"""
+        reloaded = CandidateRanker(matcher, index_path=ranker.index_path)
+        compiled = matcher.compile_jd(JD)
+
+        assert len(reloaded) == len(ranker)
+        assert reloaded.rank(compiled) == ranker.rank(compiled)
+
+    def test_replacing_candidate_updates_row(self, matcher, ranker):
+        """Test re-adding a candidate replaces its features"""
+        ranker.add_candidate('d', text="Python Django AWS developer with 3 years of experience. Bachelor")
+        result = ranker.rank(matcher.compile_jd(JD), limit=1)
+
+        assert len(ranker) == 4
+        assert result['results'][0]['id'] == 'd'
+
+    def test_upload_status_filtered_separately(self, matcher, ranker):
+        """Test upload statuses do not mix with hiring statuses"""
+        ranker.add_candidate('e', text=RESUMES['a'], upload_status='completed')
+        compiled = matcher.compile_jd(JD)
+
+        assert [r['id'] for r in ranker.rank(compiled, upload_statuses=['completed'])['results']] == ['e']
+        assert ranker.rank(compiled, statuses=['completed'])['total'] == 0
+        assert ranker.rank(compiled, statuses=['new'], upload_statuses=['completed'])['total'] == 1
+
+    def test_index_file_compacted(self, matcher, ranker, monkeypatch):
+        """Test re-adds are compacted away so the index file stays bounded"""
+        monkeypatch.setattr('services.candidate_ranker.INDEX_COMPACT_MIN_ENTRIES', 10)
+        for i in range(20):
+            ranker.add_candidate('a', text=RESUMES['a'], status='screened' if i % 2 else 'new')
+
+        with open(ranker.index_path, encoding='utf-8') as f:
+            lines = f.readlines()
+        reloaded = CandidateRanker(matcher, index_path=ranker.index_path)
+
+        assert len(lines) < 10
+        assert len(reloaded) == 4
+        assert reloaded.rank(matcher.compile_jd(JD), statuses=['screened'])['total'] == 2
+
+    def test_shared_index_file(self, matcher, ranker, monkeypatch):
+        """Test a ranker on another worker ranks candidates appended to the shared file, also after compaction"""
+        monkeypatch.setattr('services.candidate_ranker.INDEX_COMPACT_MIN_ENTRIES', 10)
+        other = CandidateRanker(matcher, index_path=ranker.index_path)
+        ranker.add_candidate('e', text="Django and AWS developer, 5 years of experience", filename='e.pdf')
+
+        assert other.rank(matcher.compile_jd(JD), limit=10)['total'] == 5
+
+        for i in range(20):
+            other.add_candidate('f', text=RESUMES['c'], status='screened' if i % 2 else 'new')
+
+        result = ranker.rank(matcher.compile_jd(JD), limit=10, statuses=['screened'])
+        assert sorted(row['id'] for row in result['results']) == ['c', 'f']
+
+    def test_unchanged_candidate_not_appended(self, matcher, ranker):
+        """Test re-indexing an unchanged candidate (as after a restart) does not grow the index file"""
+        with open(ranker.index_path, encoding='utf-8') as f:
+            before = len(f.readlines())
+        ranker.add_candidate('a', text=RESUMES['a'], filename='a.pdf')
+
+        with open(ranker.index_path, encoding='utf-8') as f:
+            assert len(f.readlines()) == before
+
+    def test_from_settings(self, matcher, tmp_path, monkeypatch):
+        """Test rankers built from settings share the index file in the results directory"""
+        from core.config import settings
+        monkeypatch.setattr(settings, 'results_dir', str(tmp_path))
+
+        assert CandidateRanker.from_settings(matcher).index_path == str(tmp_path / "candidate_index.jsonl")
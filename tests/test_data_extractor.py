@@ -58,6 +58,24 @@ class TestPhoneExtraction:
         phone = extractor.extract_phone(text)
         assert phone is None
 
+    def test_phone_normalized_to_e164(self, extractor):
+        """Test numbers are returned in E.164 format"""
+        text = "Jane Doe\nPhone: (415) 555-2671"
+        assert extractor.extract_phone(text) == "+14155552671"
+
+    def test_default_region_applied(self):
+        """Test numbers without a country code use the configured region"""
+        extractor = ResumeDataExtractor(phone_region="IN")
+        assert extractor.extract_phone("Mobile: 98765 43210") == "+919876543210"
+
+    def test_header_phone_preferred_over_body_digits(self, extractor):
+        """Test digit-heavy body text does not produce a phone number"""
+        text = (
+            "Jane Doe\n+91 98765 43210\n\nEDUCATION\nCGPA 8.7, 2014 - 2018, Roll No 4155552671\n"
+        )
+        assert extractor.extract_phone(text) == "+919876543210"
+        assert extractor.extract_phone("EDUCATION\nCGPA 8.7, 2014 - 2018, ID 123456789") is None
+
 
 class TestLinkedInExtraction:
     """Test LinkedIn URL extraction"""
@@ -0,0 +1,63 @@
+import time
+import asyncio
+import threading
+import pytest
+from core.executor import PipelineExecutor
+
+
+@pytest.fixture
+def executor():
+    pool = PipelineExecutor(max_workers=4, max_pending=2)
+    yield pool
+    pool.shutdown()
+
+
+class TestPipelineExecutor:
+    """Test cases for running blocking scan stages off the event loop"""
+
+    def test_runs_off_the_event_loop(self, executor):
+        """Test stages run on pool threads and return their result"""
+        result = asyncio.run(executor.run(lambda a, b: (a + b, threading.current_thread().name), 1, b=2))
+
+        assert result[0] == 3
+        assert result[1].startswith('scan')
+
+    def test_loop_stays_responsive(self, executor):
+        """Test a slow stage does not block other coroutines"""
+        async def run():
+            ticks = 0
+            task = asyncio.ensure_future(executor.run(time.sleep, 0.2))
+            while not task.done():
+                ticks += 1
+                await asyncio.sleep(0.01)
+            return ticks
+
+        assert asyncio.run(run()) > 5
+
+    def test_submission_is_bounded(self, executor):
+        """Test no more than max_pending stages are handed to the pool at once"""
+        running = []
+        peak = []
+
+        def stage():
+            running.append(1)
+            peak.append(len(running))
+            time.sleep(0.05)
+            running.pop()
+
+        async def run():
+            await asyncio.gather(*(executor.run(stage) for _ in range(6)))
+
+        asyncio.run(run())
+
+        assert max(peak) <= 2
+        assert executor.get_stats()['submitted'] == 6
+
+    def test_errors_propagate(self, executor):
+        """Test a failing stage raises in the caller"""
+        def fail():
+            raise ValueError("corrupt document")
+
+        with pytest.raises(ValueError):
+            asyncio.run(executor.run(fail))
+        assert executor.get_stats()['failed'] == 1
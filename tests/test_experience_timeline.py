@@ -0,0 +1,97 @@
+import pytest
+from datetime import date
+from services.experience_timeline import ExperienceTimelineEngine, merge_intervals, extract_stated_years
+from services.jd_matcher import JDMatcher
+
+
+@pytest.fixture
+def engine():
+    """Engine with a fixed 'today' so open-ended ranges are deterministic"""
+    return ExperienceTimelineEngine(today=date(2024, 6, 15))
+
+
+class TestDateRanges:
+    """Test date range parsing"""
+
+    @pytest.mark.parametrize("start, end, months", [
+        ("Jan 2020", "Mar 2020", 3),
+        ("January 2019", "December 2019", 12),
+        ("Sept. 2021", "Feb 2022", 6),
+        ("03/2018", "02/2021", 36),
+        ("2018", "2020", 24),
+        ("2020", "2020", 12),
+        ("Jan 2024", "Present", 6),
+    ])
+    def test_parse_range(self, engine, start, end, months):
+        """Test supported formats produce the expected duration"""
+        interval = engine.parse_range(start, end)
+
+        assert interval is not None
+        assert interval[1] - interval[0] == months
+
+    def test_implausible_range_rejected(self, engine):
+        """Test reversed or out-of-range dates are ignored"""
+        assert engine.parse_range("2022", "2019") is None
+        assert engine.parse_range("1900", "1905") is None
+
+
+class TestTimeline:
+    """Test timeline merging and per-skill experience"""
+
+    RESUME = """Senior Engineer
+Acme Corp | Jan 2020 - Present
+Built services in Python and Django on AWS
+
+Engineer
+Beta Inc | 03/2018 - 02/2021
+Java and Python development
+
+EDUCATION
+B.Tech Computer Science, XYZ University 2012 - 2016
+"""
+
+    def test_overlapping_positions_merged(self, engine):
+        """Test overlapping jobs are not double counted"""
+        timeline = engine.timeline(self.RESUME)
+
+        # Mar 2018 - Jun 2024, despite two overlapping positions
+        assert timeline.total_months == 76
+        assert len(timeline.intervals) == 1
+
+    def test_education_ranges_ignored(self, engine):
+        """Test study periods are not counted as work experience"""
+        assert engine.timeline("B.Tech, XYZ University 2012 - 2016").total_months == 0
+
+    def test_skill_experience(self, engine):
+        """Test per-skill years come from the positions mentioning the skill"""
+        skill_years = engine.timeline(self.RESUME).skill_years(JDMatcher().vocabulary)
+
+        assert skill_years['python'] == round(76 / 12, 1)
+        assert skill_years['java'] == 3.0
+        assert skill_years['django'] == 4.5
+
+    def test_timeline_cached_per_document(self, engine):
+        """Test the same text is parsed once"""
+        assert engine.timeline(self.RESUME) is engine.timeline(self.RESUME)
+
+    def test_merge_intervals(self):
+        """Test merging of overlapping and adjacent intervals"""
+        assert merge_intervals([(5, 10), (0, 3), (3, 6), (12, 14)]) == [(0, 10), (12, 14)]
+
+    def test_experience_years_uses_larger_source(self, engine):
+        """Test stated years and the timeline are combined with max"""
+        text = "10 years of experience\nAcme Corp Jan 2022 - Dec 2022"
+
+        assert extract_stated_years(text) == 10
+        assert engine.experience_years(text) == 10
+        assert engine.experience_years("Acme Corp Jan 2015 - Dec 2022") == 8.0
+        assert engine.experience_years("No dates here") is None
+
+    def test_matcher_uses_timeline_years(self):
+        """Test JD matching counts experience from date ranges"""
+        matcher = JDMatcher()
+        resume = "Python developer\nAcme Corp Jan 2015 - Dec 2019\nBeta Inc Jan 2019 - Dec 2020"
+        result = matcher.match_resume_with_jd(resume, "Python developer with 5 years of experience")
+
+        assert matcher.extract_resume_features(resume).years == 6.0
+        assert result['experience_match'] == 100.0
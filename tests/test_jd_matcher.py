@@ -1,5 +1,6 @@
 import pytest
 from services.jd_matcher import JDMatcher
+from services.skill_taxonomy import _iter_bits
 
 
 class TestJDMatcher:
@@ -15,24 +16,32 @@ class TestJDMatcher:
         assert hasattr(self.matcher, 'skill_categories')
         assert hasattr(self.matcher, 'education_keywords')
 
-    def test_extract_keywords_programming(self):
-        """Test extraction of programming keywords"""
+    def skills_by_category(self, text):
+        """Skills found in text, grouped by taxonomy category"""
+        vocabulary = self.matcher.vocabulary
+        skills = {}
+        for skill_id in _iter_bits(vocabulary.extract_direct_bits(text.lower())):
+            skills.setdefault(vocabulary.categories[skill_id], set()).add(vocabulary.skills[skill_id])
+        return skills
+
+    def test_extract_skills_programming(self):
+        """Test extraction of programming skills"""
         text = "Experienced in Python, Java, and JavaScript development"
-        keywords = self.matcher._extract_keywords(text)
+        skills = self.skills_by_category(text)
         
-        assert 'python' in keywords['programming']
-        assert 'java' in keywords['programming']
-        assert 'javascript' in keywords['programming']
-        assert len(keywords['all_skills']) >= 3
+        assert 'python' in skills['programming']
+        assert 'java' in skills['programming']
+        assert 'javascript' in skills['programming']
+        assert sum(len(names) for names in skills.values()) >= 3
 
-    def test_extract_keywords_web_technologies(self):
-        """Test extraction of web technology keywords"""
+    def test_extract_skills_web_technologies(self):
+        """Test extraction of web technology skills"""
         text = "Proficient in React, Node.js, and Django frameworks"
-        keywords = self.matcher._extract_keywords(text)
+        skills = self.skills_by_category(text)
         
-        assert 'react' in keywords['web']
-        assert 'node.js' in keywords['web']
-        assert 'django' in keywords['web']
+        assert 'react' in skills['web']
+        assert 'node.js' in skills['web']
+        assert 'django' in skills['web']
 
     def test_extract_years_experience(self):
         """Test extraction of years of experience"""
@@ -214,3 +223,51 @@ class TestJDMatcher:
         
         assert result['skills_match'] >= 90.0
         assert len(result['matched_skills']) >= 5
+
+
+class TestCompiledJD:
+    """Test cases for compiled JD matching"""
+
+    def setup_method(self):
+        """Set up test fixtures"""
+        self.matcher = JDMatcher()
+        self.jd_text = """
+        Looking for a Python developer with 3 years of experience.
+        Bachelor's degree in Computer Science required.
+        Skills: Python, Django, PostgreSQL, AWS
+        """
+
+    def test_compile_jd_is_cached_by_hash(self):
+        """Test the same JD text returns the same compiled object"""
+        first = self.matcher.compile_jd(self.jd_text)
+        second = self.matcher.compile_jd(str(self.jd_text))
+
+        assert first is second
+        assert first.required_years == 3
+        assert first.skill_count == 4
+
+    def test_match_compiled_equals_match_resume_with_jd(self):
+        """Test compiled matching gives the same result as text matching"""
+        resume_text = "B.Tech with 4 years of experience in Python, Django and React"
+        compiled = self.matcher.compile_jd(self.jd_text)
+
+        expected = self.matcher.match_resume_with_jd(resume_text, self.jd_text)
+        assert self.matcher.match_compiled(resume_text, compiled) == expected
+
+        features = self.matcher.extract_resume_features(resume_text)
+        assert self.matcher.match_compiled(features, compiled) == expected
+
+    def test_compiled_skill_names(self):
+        """Test matched and missing skills come from the compiled bitmaps"""
+        compiled = self.matcher.compile_jd("Python, Java, React, AWS")
+        result = self.matcher.match_compiled("Python and React expert", compiled)
+
+        assert result['matched_skills'] == ['python', 'react']
+        assert result['missing_skills'] == ['aws', 'java']
+
+    def test_from_settings(self, monkeypatch):
+        """Test a matcher built from settings uses the configured semantic weight"""
+        from core.config import settings
+        monkeypatch.setattr(settings, 'semantic_match_weight', 0.25)
+
+        assert JDMatcher.from_settings().semantic_weight == 0.25
@@ -0,0 +1,50 @@
+import pytest
+from services.jd_matcher import JDMatcher
+from services.job_catalog import JobCatalog
+
+
+@pytest.fixture
+def catalog():
+    catalog = JobCatalog(JDMatcher())
+    catalog.add_job(1, "Backend Engineer", "Python, Django and PostgreSQL. 3 years of experience.")
+    catalog.add_job(2, "Frontend Engineer", "React, TypeScript and CSS")
+    catalog.add_job(3, "Data Scientist", "Python, pandas, machine learning")
+    return catalog
+
+
+class TestJobCatalog:
+    """Test cases for reverse matching of resumes against open jobs"""
+
+    def test_only_overlapping_jobs_are_candidates(self, catalog):
+        """Test the inverted index returns only jobs sharing a skill"""
+        skill_bits = catalog.jd_matcher.extract_resume_features("Python developer").skill_bits
+
+        assert catalog.candidate_jobs(skill_bits) == {1, 3}
+
+    def test_match_resume_sorted_by_score(self, catalog):
+        """Test matches are scored with the compiled JDs and sorted"""
+        resume = "Python, Django, PostgreSQL engineer with 4 years of experience"
+        matches = catalog.match_resume(resume)
+
+        assert [m['job_id'] for m in matches] == [1, 3]
+        assert matches[0]['overall_match'] == catalog.jd_matcher.match_resume_with_jd(
+            resume, "Python, Django and PostgreSQL. 3 years of experience."
+        )['overall_match']
+
+    def test_no_shared_skills_no_matches(self, catalog):
+        """Test a resume without shared skills touches no jobs"""
+        assert catalog.match_resume("Pastry chef") == []
+
+    def test_remove_job(self, catalog):
+        """Test removed jobs leave the inverted index"""
+        assert catalog.remove_job(3)
+        assert 3 not in catalog
+        assert [m['job_id'] for m in catalog.match_resume("machine learning")] == []
+
+    def test_replace_job_updates_postings(self, catalog):
+        """Test re-adding a job re-indexes its skills"""
+        catalog.add_job(2, "Frontend Engineer", "Vue and JavaScript")
+        skill_bits = catalog.jd_matcher.extract_resume_features("CSS").skill_bits
+
+        assert catalog.candidate_jobs(skill_bits) == set()
+        assert len(catalog) == 3
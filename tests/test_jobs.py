@@ -0,0 +1,101 @@
+import asyncio
+from core.jobs import JobStore
+
+
+class FakeRedis:
+    """In-memory stand-in for the Redis client"""
+
+    def __init__(self):
+        self.store = {}
+
+    def get(self, key):
+        return self.store.get(key)
+
+    def set(self, key, value, ex=None):
+        self.store[key] = value.encode() if isinstance(value, str) else value
+
+
+class TestJobStore:
+    """Test cases for background job status"""
+
+    def test_create_and_update(self):
+        """Test jobs start queued and updates bump their version"""
+        store = JobStore()
+        job = store.create(kind='scan', file_name='cv.pdf')
+
+        assert job['status'] == 'queued'
+        store.update(job['job_id'], status='completed', result={'id': 'r1'})
+
+        stored = store.get(job['job_id'])
+        assert stored['status'] == 'completed'
+        assert stored['result'] == {'id': 'r1'}
+        assert stored['version'] == 1
+        assert store.update('missing', status='failed') is None
+
+    def test_shared_between_processes(self):
+        """Test a store on another process sees updates through Redis"""
+        shared = FakeRedis()
+        api, worker = JobStore(shared), JobStore(shared)
+        api.create('42', kind='resume')
+
+        worker.update('42', status='processing', stage='Extracting text from document')
+
+        assert api.get('42')['stage'] == 'Extracting text from document'
+
+    def test_watch_yields_changes_until_done(self):
+        """Test watchers get each change once and stop when the job finishes"""
+        store = JobStore()
+        job_id = store.create()['job_id']
+
+        async def finish():
+            await asyncio.sleep(0.02)
+            store.update(job_id, status='processing')
+            await asyncio.sleep(0.02)
+            store.update(job_id, status='completed')
+
+        async def watch():
+            seen = []
+            async for job in store.watch(job_id, poll_interval=0.005):
+                seen.append(job['status'])
+            return seen
+
+        async def run():
+            seen, _ = await asyncio.gather(watch(), finish())
+            return seen
+
+        assert asyncio.run(run()) == ['queued', 'processing', 'completed']
+
+    def test_bounded(self):
+        """Test the oldest jobs are dropped beyond max_jobs"""
+        store = JobStore(max_jobs=2)
+        first = store.create()['job_id']
+        store.create()
+        store.create()
+
+        assert store.get(first) is None
+        assert store.get_stats()['jobs'] == 2
+
+    def test_async_access_runs_off_the_loop(self):
+        """Test coroutines reach Redis from worker threads"""
+        import threading
+
+        class RecordingRedis(FakeRedis):
+            threads = set()
+
+            def get(self, key):
+                self.threads.add(threading.current_thread())
+                return super().get(key)
+
+            def set(self, key, value, ex=None):
+                self.threads.add(threading.current_thread())
+                super().set(key, value, ex)
+
+        store = JobStore(RecordingRedis())
+
+        async def run():
+            job = await store.acreate(kind='scan')
+            await store.aupdate(job['job_id'], status='completed')
+            return [seen['status'] async for seen in store.watch(job['job_id'])]
+
+        assert asyncio.run(run()) == ['completed']
+        assert threading.main_thread() not in RecordingRedis.threads
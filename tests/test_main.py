@@ -1,4 +1,5 @@
 import pytest
+from datetime import datetime
 from fastapi.testclient import TestClient
 from main import app
 
@@ -29,3 +30,152 @@ def test_batch_scan_without_files():
     """Test batch scan endpoint without files"""
     response = client.post("/api/batch-scan")
     assert response.status_code == 422  # Validation error
+
+def test_export_csv_streams_filtered_rows(tmp_path, monkeypatch):
+    """Test CSV export applies filters and column selection"""
+    import gzip
+    import main
+    from services.result_storage import ResultStorage
+
+    storage = ResultStorage(str(tmp_path))
+    storage.save_result({'id': 'a', 'filename': 'a.pdf', 'authenticity_score': {'overall_score': 90}})
+    storage.save_result({'id': 'b', 'filename': 'b.pdf', 'authenticity_score': {'overall_score': 40}})
+    monkeypatch.setattr(main, 'result_storage', storage)
+
+    response = client.get("/api/export/csv", params={'min_score': 50, 'columns': 'id,authenticity_score'})
+    assert response.status_code == 200
+    assert response.text.splitlines() == ['id,authenticity_score', 'a,90']
+
+    response = client.get("/api/export/csv", params={'gzip': 'true'})
+    assert len(gzip.decompress(response.content).decode().splitlines()) == 3
+
+    assert client.get("/api/export/csv", params={'columns': 'bogus'}).status_code == 400
+    assert client.get("/api/export/csv", params={'min_score': 99}).status_code == 404
+
+def test_results_cursor_pages(tmp_path, monkeypatch):
+    """Test /api/results pages with cursors and projects fields"""
+    import main
+    from datetime import timedelta
+    from services.result_storage import ResultStorage
+
+    storage = ResultStorage(str(tmp_path))
+    for i in range(3):
+        uploaded = (datetime.utcnow() - timedelta(days=3 - i)).isoformat()
+        storage.save_result({'id': f'r{i}', 'filename': f'r{i}.pdf', 'upload_date': uploaded,
+                             'authenticity_score': {'overall_score': 70, 'diagnostics': {'x': 1}}})
+    monkeypatch.setattr(main, 'result_storage', storage)
+
+    first = client.get("/api/results", params={'limit': 2, 'fields': 'summary'}).json()
+    assert [r['id'] for r in first['results']] == ['r2', 'r1']
+    assert first['results'][0]['authenticity_score'] == {'overall_score': 70}
+
+    second = client.get("/api/results", params={'limit': 2, 'cursor': first['next_cursor']}).json()
+    assert [r['id'] for r in second['results']] == ['r0']
+    assert second['next_cursor'] is None
+
+    assert client.get("/api/results", params={'cursor': 'bogus'}).status_code == 400
+
+def test_batch_scan_streams_ndjson(monkeypatch):
+    """Test batch results stream per file with bounded concurrency and a summary line"""
+    import json
+    import asyncio
+    import main
+
+    running = []
+    peak = []
+
+    async def fake_scan(upload, file_id, job_description):
+        running.append(1)
+        peak.append(len(running))
+        await asyncio.sleep(0.01)
+        running.pop()
+        upload.discard()
+        return {'id': upload.filename, 'job_description': job_description}
+
+    monkeypatch.setattr(main, '_scan_ingested', fake_scan)
+    monkeypatch.setattr(main.settings, 'batch_scan_concurrency', 3)
+    files = [('files', (f'cv{i}.pdf', b'%PDF', 'application/pdf')) for i in range(20)]
+    files.append(('files', ('bad.txt', b'text', 'text/plain')))
+
+    response = client.post("/api/batch-scan", files=files, data={'stream': 'true', 'job_description': 'Python'})
+    lines = [json.loads(line) for line in response.text.splitlines()]
+
+    assert response.headers['content-type'].startswith('application/x-ndjson')
+    assert len(lines) == 22
+    assert sorted(line['index'] for line in lines[:-1]) == list(range(21))
+    assert lines[-1] == {'done': True, 'total_processed': 21, 'successful': 20, 'failed': 1}
+    assert max(peak) <= 3
+
+def test_scan_resume_background_job(monkeypatch):
+    """Test background mode answers 202 and the job carries the result"""
+    import main
+
+    async def fake_scan(upload, file_id, job_description):
+        upload.discard()
+        return {'id': file_id, 'filename': upload.filename}
+
+    monkeypatch.setattr(main, '_scan_ingested', fake_scan)
+
+    response = client.post("/api/scan-resume", files={'file': ('cv.pdf', b'%PDF-1.4', 'application/pdf')},
+                           data={'background': 'true'})
+    assert response.status_code == 202
+    job_id = response.json()['job_id']
+    assert response.headers['location'] == f"/api/jobs/{job_id}"
+
+    job = client.get(f"/api/jobs/{job_id}").json()
+    assert job['status'] == 'completed'
+    assert job['result']['filename'] == 'cv.pdf'
+
+    events = client.get(f"/api/jobs/{job_id}/events")
+    assert events.headers['content-type'].startswith('text/event-stream')
+    assert events.text.startswith('event: completed')
+    assert client.get("/api/jobs/unknown").status_code == 404
+
+def test_scan_resume_refused_when_saturated(monkeypatch):
+    """Test scans are refused with 429 and Retry-After once the scan queue is full"""
+    import main
+    from core.admission import AdmissionController
+
+    controller = AdmissionController(max_scans=1, scan_queue=0, stage_limits={}, stage_queues={})
+    controller.scans.running = 1
+    monkeypatch.setattr(main, 'admission', controller)
+
+    response = client.post("/api/scan-resume", files={'file': ('cv.pdf', b'%PDF-1.4', 'application/pdf')})
+    assert response.status_code == 429
+    assert int(response.headers['retry-after']) >= 1
+
+def test_batch_files_hold_scan_slots(monkeypatch):
+    """Test each file of a batch counts against the admission scan limit"""
+    import asyncio
+    import main
+    from fastapi import HTTPException
+    from core.admission import AdmissionController
+
+    controller = AdmissionController(max_scans=2, scan_queue=50, stage_limits={}, stage_queues={})
+    peak = []
+
+    async def fake_analyze(upload, file_id, job_description, cache_key):
+        peak.append(controller.scans.running)
+        await asyncio.sleep(0.01)
+        raise HTTPException(status_code=422, detail="not a resume")
+
+    monkeypatch.setattr(main, 'admission', controller)
+    monkeypatch.setattr(main, '_analyze_upload', fake_analyze)
+    monkeypatch.setattr(main.settings, 'batch_scan_concurrency', 8)
+    files = [('files', (f'cv{i}.pdf', f'%PDF-{i}'.encode(), 'application/pdf')) for i in range(8)]
+
+    response = client.post("/api/batch-scan", files=files)
+
+    assert response.json()['failed'] == 8
+    assert len(peak) == 8
+    assert min(peak) >= 1 and max(peak) == 2
+    assert controller.scans.running == 0
+
+def test_rank_limit_bounded():
+    """Test the rank page size is capped like the per-job ranking"""
+    response = client.post("/api/rank", data={'job_description': 'Python developer', 'limit': '501'})
+    assert response.status_code == 422
+
+    response = client.post("/api/rank", data={'job_description': 'Python developer', 'limit': '5'})
+    assert response.status_code == 200
+    assert response.json()['limit'] == 5
@@ -0,0 +1,89 @@
+import pytest
+from datetime import datetime, timedelta
+from services.result_statistics import ResultStatistics
+from services.result_storage import ResultStorage
+from services.sqlite_result_storage import SQLiteResultStorage
+
+
+def make_result(result_id, days_ago=0, score=75, match=None):
+    result = {
+        'id': result_id,
+        'upload_date': (datetime.utcnow() - timedelta(days=days_ago)).isoformat(),
+        'authenticity_score': {'overall_score': score},
+    }
+    if match is not None:
+        result['matching_score'] = {'overall_match': match}
+    return result
+
+
+class TestResultStatistics:
+    """Test cases for running result aggregates"""
+
+    def test_add_and_remove(self):
+        """Test removing a result undoes adding it"""
+        stats = ResultStatistics()
+        stats.add(make_result('a', score=90, match=55))
+        stats.add(make_result('b', score=40))
+        stats.remove(make_result('b', score=40))
+
+        summary = stats.summary()
+        assert summary['total_resumes'] == 1
+        assert summary['average_authenticity'] == 90
+        assert summary['average_jd_match'] == 55
+        assert summary['high_quality_count'] == 1
+        assert summary['low_quality_count'] == 0
+        assert summary['authenticity_histogram'][9] == 1
+        assert summary['match_histogram'][5] == 1
+
+    def test_recent_uploads(self):
+        """Test only the last week counts as recent"""
+        stats = ResultStatistics()
+        stats.add(make_result('a'))
+        stats.add(make_result('b', days_ago=3))
+        stats.add(make_result('c', days_ago=20))
+
+        summary = stats.summary()
+        assert summary['recent_uploads'] == 2
+        assert sum(summary['daily_uploads'].values()) == 2
+
+    def test_expired_days_leave_totals(self):
+        """Test days past retention drop out of the totals"""
+        stats = ResultStatistics(retention_days=30)
+        stats.add(make_result('a', score=90))
+        stats.days['2000-01-01'] = stats.days.pop(next(iter(stats.days)))
+
+        assert stats.summary()['total_resumes'] == 0
+
+    def test_round_trip(self):
+        """Test statistics survive serialization"""
+        stats = ResultStatistics()
+        stats.add(make_result('a', score=70, match=30))
+
+        assert ResultStatistics.from_dict(stats.to_dict()).summary() == stats.summary()
+
+
+@pytest.mark.parametrize('backend', [ResultStorage, SQLiteResultStorage])
+class TestStorageStatistics:
+    """Test both storage backends keep statistics up to date"""
+
+    def test_updated_on_save_and_delete(self, backend, tmp_path):
+        """Test replacing and deleting results adjust the statistics"""
+        storage = backend(str(tmp_path))
+        storage.save_result(make_result('a', score=50))
+        storage.save_result(make_result('a', score=90))
+        storage.save_result(make_result('b', score=70, match=80))
+        storage.delete_result('b')
+
+        summary = storage.get_statistics()
+        assert summary['total_resumes'] == 1
+        assert summary['average_authenticity'] == 90
+        assert summary['average_jd_match'] == 0
+
+    def test_persisted_with_store(self, backend, tmp_path):
+        """Test statistics reload with the store"""
+        storage = backend(str(tmp_path))
+        for i in range(5):
+            storage.save_result(make_result(f'r{i}', score=60 + i))
+        storage.close()
+
+        assert backend(str(tmp_path)).get_statistics() == storage.get_statistics()
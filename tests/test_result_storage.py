@@ -0,0 +1,237 @@
+import os
+import json
+import pytest
+from datetime import datetime, timedelta
+from services.result_storage import ResultStorage, iter_csv, parse_fields, project_result
+
+
+def make_result(result_id, days_ago=0, score=75):
+    return {
+        'id': result_id,
+        'filename': f'{result_id}.pdf',
+        'upload_date': (datetime.utcnow() - timedelta(days=days_ago)).isoformat(),
+        'authenticity_score': {'overall_score': score},
+    }
+
+
+@pytest.fixture
+def storage(tmp_path):
+    return ResultStorage(str(tmp_path))
+
+
+class TestResultLog:
+    """Test cases for the append-only result log"""
+
+    def test_save_and_get(self, storage):
+        """Test saved results are retrievable by ID"""
+        assert storage.save_result(make_result('a'))
+
+        assert storage.get_result_by_id('a')['filename'] == 'a.pdf'
+        assert storage.get_result_by_id('missing') is None
+
+    def test_no_hundred_record_cap(self, storage):
+        """Test history is not truncated to 100 records"""
+        for i in range(150):
+            storage.save_result(make_result(f'r{i}'))
+
+        assert len(storage.get_all_results()) == 150
+        assert storage.get_result_by_id('r0') is not None
+
+    def test_most_recent_first(self, storage):
+        """Test results are listed newest first with a limit"""
+        storage.save_result(make_result('old', days_ago=3))
+        storage.save_result(make_result('new', days_ago=0))
+        storage.save_result(make_result('mid', days_ago=1))
+
+        assert [r['id'] for r in storage.get_all_results(limit=2)] == ['new', 'mid']
+
+    def test_delete_writes_tombstone(self, storage, tmp_path):
+        """Test deletes survive a reopen"""
+        storage.save_result(make_result('a'))
+        storage.save_result(make_result('b'))
+
+        assert storage.delete_result('a')
+        assert not storage.delete_result('a')
+
+        reopened = ResultStorage(str(tmp_path))
+        assert reopened.get_result_by_id('a') is None
+        assert [r['id'] for r in reopened.get_all_results()] == ['b']
+
+    def test_resave_replaces(self, storage):
+        """Test saving the same ID again replaces the earlier version"""
+        storage.save_result(make_result('a', score=10))
+        storage.save_result(make_result('a', score=90))
+
+        assert storage.get_result_by_id('a')['authenticity_score']['overall_score'] == 90
+        assert len(storage.get_all_results()) == 1
+
+    def test_retention(self, tmp_path):
+        """Test results past the retention period are dropped"""
+        storage = ResultStorage(str(tmp_path), retention_days=30)
+        storage.save_result(make_result('expired', days_ago=45))
+        storage.save_result(make_result('kept', days_ago=5))
+
+        assert storage.get_result_by_id('expired') is None
+        assert [r['id'] for r in storage.get_all_results()] == ['kept']
+
+    def test_expired_records_compacted_with_batched_saves(self, tmp_path, monkeypatch):
+        """Test the retention check still runs when batches skip over the check interval"""
+        monkeypatch.setattr('services.result_storage.RETENTION_CHECK_INTERVAL', 10)
+        storage = ResultStorage(str(tmp_path), retention_days=30, compact_min_bytes=1)
+        for i in range(20):
+            storage.save_result(make_result(f'old{i}', days_ago=10))
+        storage.retention_days = 5
+
+        for batch in range(4):
+            storage.save_results([make_result(f'new{batch}-{i}') for i in range(3)])
+
+        assert len(storage._index) == 12
+
+    def test_rotation_and_compaction(self, tmp_path):
+        """Test segments rotate and compaction drops dead records"""
+        storage = ResultStorage(str(tmp_path), segment_max_bytes=1024, compact_min_bytes=10 ** 9)
+        for i in range(40):
+            storage.save_result(make_result(f'r{i % 10}'))
+        segments_before = len(os.listdir(storage.segments_dir))
+
+        reclaimed = storage.compact()
+
+        assert segments_before > 2
+        assert reclaimed > 0
+        assert sorted(r['id'] for r in storage.get_all_results()) == [f'r{i}' for i in range(10)]
+        assert len(ResultStorage(str(tmp_path)).get_all_results()) == 10
+
+    def test_torn_last_line_ignored(self, storage, tmp_path):
+        """Test a partially written entry does not break loading"""
+        storage.save_result(make_result('a'))
+        segment = storage._segment_path(storage._list_segments()[-1])
+        with open(segment, 'a', encoding='utf-8') as f:
+            f.write('{"id": "b", "data": {"fil')
+
+        assert [r['id'] for r in ResultStorage(str(tmp_path)).get_all_results()] == ['a']
+
+    def test_shared_directory_sees_other_writers(self, tmp_path):
+        """Test two instances on one directory see each other's saves"""
+        first = ResultStorage(str(tmp_path))
+        second = ResultStorage(str(tmp_path))
+        first.save_result(make_result('a'))
+        second.save_result(make_result('b'))
+
+        assert first.get_result_by_id('b') is not None
+        assert len(first.get_all_results()) == 2
+
+    def test_legacy_file_migrated(self, tmp_path):
+        """Test the old analysis_results.json is imported once"""
+        with open(tmp_path / 'analysis_results.json', 'w', encoding='utf-8') as f:
+            json.dump([make_result('legacy')], f)
+
+        storage = ResultStorage(str(tmp_path))
+
+        assert storage.get_result_by_id('legacy') is not None
+        assert not os.path.exists(tmp_path / 'analysis_results.json')
+
+
+class TestResultExport:
+    """Test cases for streaming result export"""
+
+    def test_iter_results_filters(self, storage):
+        """Test date, score and JD filters"""
+        storage.save_result(make_result('old', days_ago=10, score=90))
+        storage.save_result(make_result('low', score=30))
+        matched = make_result('matched', score=85)
+        matched['matching_score'] = {'overall_match': 70}
+        storage.save_result(matched)
+
+        recent = (datetime.utcnow() - timedelta(days=2)).date().isoformat()
+        assert [r['id'] for r in storage.iter_results(start_date=recent)] == ['low', 'matched']
+        assert [r['id'] for r in storage.iter_results(end_date=recent)] == ['old']
+        assert [r['id'] for r in storage.iter_results(min_score=80)] == ['old', 'matched']
+        assert [r['id'] for r in storage.iter_results(has_jd=True)] == ['matched']
+        assert [r['id'] for r in storage.iter_results(min_match=80)] == []
+
+    def test_export_survives_compaction(self, tmp_path):
+        """Test a streamed export started before a compaction reads every record"""
+        storage = ResultStorage(str(tmp_path), segment_max_bytes=512, compact_min_bytes=10 ** 9)
+        for i in range(30):
+            storage.save_result(make_result(f'r{i}', days_ago=30 - i))
+        storage.save_result(make_result('r0', days_ago=30))
+
+        export = storage.iter_results()
+        first = next(export)
+        assert storage.compact() > 0
+
+        assert [first['id']] + [r['id'] for r in export] == [f'r{i}' for i in range(30)]
+
+    def test_iter_csv_chunks(self):
+        """Test rows are encoded in batches after the header"""
+        results = (make_result(f'r{i}') for i in range(5))
+        chunks = list(iter_csv(results, ['id', 'filename'], batch_rows=2))
+
+        assert chunks[0] == b'id,filename\r\n'
+        assert len(chunks) == 4
+        assert b''.join(chunks).decode().splitlines()[1:] == [f'r{i},r{i}.pdf' for i in range(5)]
+
+
+class TestResultPages:
+    """Test cases for cursor pagination and field projection"""
+
+    def test_pages_cover_history(self, storage):
+        """Test cursors walk every result once, most recent first"""
+        for i in range(7):
+            storage.save_result(make_result(f'r{i}', days_ago=i % 3))
+
+        seen, cursor = [], None
+        while True:
+            page, cursor = storage.get_results_page(limit=3, cursor=cursor)
+            seen.extend(r['id'] for r in page)
+            if cursor is None:
+                break
+
+        assert sorted(seen) == [f'r{i}' for i in range(7)]
+        dates = [storage.get_result_by_id(i)['upload_date'] for i in seen]
+        assert dates == sorted(dates, reverse=True)
+
+    def test_pages_follow_changes(self, tmp_path):
+        """Test the sorted page order tracks re-saves, deletes, compaction and reloads"""
+        storage = ResultStorage(str(tmp_path), compact_min_bytes=10 ** 9)
+        for i in range(6):
+            storage.save_result(make_result(f'r{i}', days_ago=10 - i))
+        storage.save_result(make_result('r0'))  # Now the most recent
+        storage.delete_result('r3')
+
+        expected = ['r0', 'r5', 'r4', 'r2', 'r1']
+        assert [r['id'] for r in storage.get_results_page(limit=10)[0]] == expected
+
+        storage.compact()
+        page, cursor = storage.get_results_page(limit=2)
+        assert [r['id'] for r in page] == expected[:2]
+        reopened = ResultStorage(str(tmp_path))
+        assert [r['id'] for r in reopened.get_results_page(limit=10, cursor=cursor)[0]] == expected[2:]
+
+    def test_invalid_cursor(self, storage):
+        """Test malformed cursors are rejected"""
+        with pytest.raises(ValueError):
+            storage.get_results_page(cursor='not-a-cursor')
+
+    def test_datetime_upload_date_stored_as_iso(self, storage):
+        """Test datetimes from model dumps are stored as ISO text"""
+        result = make_result('a')
+        uploaded = datetime.utcnow().replace(microsecond=0)
+        result['upload_date'] = uploaded
+        storage.save_result(result)
+
+        assert storage.get_result_by_id('a')['upload_date'] == uploaded.isoformat()
+
+    def test_projection(self):
+        """Test dotted fields project nested values and skip missing ones"""
+        result = make_result('a')
+        result['matching_score'] = None
+
+        projected = project_result(result, parse_fields('summary'))
+
+        assert projected == {
+            'id': 'a', 'filename': 'a.pdf', 'upload_date': result['upload_date'],
+            'authenticity_score': {'overall_score': 75}
+        }
+        assert parse_fields(' id , filename ') == ['id', 'filename']
+        assert parse_fields(None) is None
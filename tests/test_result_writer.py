@@ -0,0 +1,92 @@
+import asyncio
+from services.result_storage import ResultStorage
+from services.result_writer import AsyncResultWriter
+
+
+class RecordingStorage:
+    """Storage double that records each group commit"""
+
+    def __init__(self, ok=True):
+        self.ok = ok
+        self.commits = []
+
+    def save_results(self, results):
+        self.commits.append([r['id'] for r in results])
+        return self.ok
+
+
+class TestAsyncResultWriter:
+    """Test cases for the batched background result writer"""
+
+    def test_concurrent_submits_share_commits(self):
+        """Test results submitted together are committed in one batch"""
+        storage = RecordingStorage()
+        writer = AsyncResultWriter(storage, max_batch=10, max_delay=0.05)
+
+        async def run():
+            await asyncio.gather(*(writer.submit({'id': f'r{i}'}) for i in range(10)))
+            await writer.close()
+
+        asyncio.run(run())
+
+        assert sorted(sum(storage.commits, [])) == sorted(f'r{i}' for i in range(10))
+        assert len(storage.commits) < 10
+
+    def test_batch_size_bounded(self):
+        """Test a commit never exceeds max_batch results"""
+        storage = RecordingStorage()
+        writer = AsyncResultWriter(storage, max_batch=3, max_delay=0.05)
+
+        async def run():
+            await asyncio.gather(*(writer.submit({'id': f'r{i}'}) for i in range(8)))
+            await writer.close()
+
+        asyncio.run(run())
+
+        assert max(len(commit) for commit in storage.commits) <= 3
+        assert sum(len(commit) for commit in storage.commits) == 8
+
+    def test_ack_reports_commit_outcome(self):
+        """Test waiting submits return whether the commit succeeded"""
+        async def run(storage):
+            writer = AsyncResultWriter(storage, wait_for_commit=True, max_delay=0)
+            ok = await writer.submit({'id': 'a'})
+            await writer.close()
+            return ok
+
+        assert asyncio.run(run(RecordingStorage(ok=True))) is True
+        assert asyncio.run(run(RecordingStorage(ok=False))) is False
+
+    def test_close_flushes_to_storage(self, tmp_path):
+        """Test queued results are on disk after close"""
+        storage = ResultStorage(str(tmp_path))
+        writer = AsyncResultWriter(storage, max_delay=0.2)
+
+        async def run():
+            for i in range(5):
+                await writer.submit({'id': f'r{i}', 'authenticity_score': {'overall_score': 50}})
+            await writer.close()
+
+        asyncio.run(run())
+
+        assert len(ResultStorage(str(tmp_path)).get_all_results()) == 5
+        assert writer.get_stats()['written'] == 5
+
+    def test_restarts_on_new_event_loop(self):
+        """Test the writer keeps working when the serving loop changes"""
+        storage = RecordingStorage()
+        writer = AsyncResultWriter(storage, wait_for_commit=True, max_delay=0)
+
+        assert asyncio.run(writer.submit({'id': 'a'}))
+        assert asyncio.run(writer.submit({'id': 'b'}))
+        assert sum(storage.commits, []) == ['a', 'b']
+
+    def test_flush_from_another_loop(self):
+        """Test a read on a new loop commits results queued on a finished one"""
+        storage = RecordingStorage()
+        writer = AsyncResultWriter(storage, max_delay=1.0)
+
+        asyncio.run(writer.submit({'id': 'a'}))
+        asyncio.run(writer.flush())
+
+        assert storage.commits == [['a']]
@@ -0,0 +1,85 @@
+import pytest
+from services.resume_annotator import ResumeAnnotator
+from services.resume_data_extractor import ResumeDataExtractor
+from services.jd_matcher import JDMatcher
+
+
+RESUME = """Jane Doe
+jane.doe@example.com | (415) 555-2671
+linkedin.com/in/janedoe
+
+SKILLS
+Python, k8s, Postgres
+
+EXPERIENCE
+Acme Corp Jan 2020 - Dec 2022
+Contact for references: ref@acme-corp.com
+"""
+
+
+@pytest.fixture
+def annotator():
+    return ResumeAnnotator(phone_region="US")
+
+
+class TestResumeAnnotator:
+    """Test cases for the shared annotation layer"""
+
+    def test_spans_have_offsets(self, annotator):
+        """Test every span's offsets point at its text"""
+        annotations = annotator.annotate(RESUME)
+
+        assert annotations.spans
+        for span in annotations.spans:
+            assert RESUME[span.start:span.end] == span.text
+
+    def test_contact_values_normalized(self, annotator):
+        """Test normalized values for contact entities"""
+        annotations = annotator.annotate(RESUME)
+
+        assert annotations.value('name') == "Jane Doe"
+        assert annotations.value('phone') == "+14155552671"
+        assert annotations.value('linkedin') == "https://linkedin.com/in/janedoe"
+
+    def test_header_email_ranked_first(self, annotator):
+        """Test emails in the header outrank emails in the body"""
+        emails = annotator.annotate(RESUME).all('email')
+
+        assert [e.value for e in emails] == ["jane.doe@example.com", "ref@acme-corp.com"]
+        assert emails[0].confidence > emails[1].confidence
+
+    def test_skill_spans_use_taxonomy(self, annotator):
+        """Test skill spans carry the canonical skill as value"""
+        spans = annotator.annotate(RESUME).skill_spans(JDMatcher().vocabulary)
+        values = {span.value: span.text for span in spans}
+
+        assert values['kubernetes'] == 'k8s'
+        assert values['postgresql'] == 'Postgres'
+
+    def test_heading_less_resume_header_capped(self, annotator):
+        """Test a resume without headings does not scan its whole body for possible phones"""
+        text = (
+            "John Smith\n"
+            "john@example.com | (555) 123-4567\n\n"
+            + "Worked on billing software and shipped releases every sprint.\n" * 8
+            + "Reference number 5550143217 for the background check.\n"
+        )
+        annotations = annotator.annotate(text)
+
+        assert annotator._header_end(text) < text.index("Reference")
+        assert [span.value for span in annotations.all('phone')] == ["+15551234567"]
+
+    def test_annotations_cached(self, annotator):
+        """Test the same document is annotated once"""
+        assert annotator.annotate(RESUME) is annotator.annotate(RESUME)
+
+    def test_extractor_and_analyzer_agree(self):
+        """Test the extractor and analyzer give the same contact answers"""
+        from services.resume_analyzer import ResumeAuthenticityAnalyzer
+
+        extractor = ResumeDataExtractor()
+        analyzer = ResumeAuthenticityAnalyzer(use_selenium=False)
+
+        assert analyzer._extract_candidate_name(RESUME) == extractor.extract_name(RESUME)
+        assert analyzer._extract_email(RESUME) == extractor.extract_email(RESUME)
+        assert analyzer._extract_phone(RESUME) == extractor.extract_phone(RESUME)
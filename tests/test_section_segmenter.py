@@ -0,0 +1,108 @@
+import pytest
+from services.section_segmenter import SectionSegmenter
+from services.resume_data_extractor import ResumeDataExtractor
+from services.jd_matcher import JDMatcher
+
+
+RESUME = """John Smith
+john.smith@example.com | +1-555-123-4567
+
+PROFESSIONAL SUMMARY
+Engineer with a Master's mindset.
+
+Skills: Python, Java, SQL
+
+EDUCATION
+Master of Science in Computer Science
+Stanford University
+2018 - 2020
+
+WORK EXPERIENCE
+Senior Software Engineer
+Google Inc.
+Jan 2020 - Dec 2022
+
+2. Projects
+Bachelor thesis tooling
+"""
+
+
+@pytest.fixture
+def segmenter():
+    return SectionSegmenter()
+
+
+class TestSectionSegmenter:
+    """Test cases for resume section detection"""
+
+    def test_detects_headings(self, segmenter):
+        """Test standalone, inline and numbered headings are detected"""
+        sections = segmenter.segment(RESUME)
+
+        assert sections.found == ['summary', 'skills', 'education', 'experience', 'projects']
+        assert sections.text('header').startswith('John Smith')
+
+    def test_inline_heading_keeps_content(self, segmenter):
+        """Test content on the heading line belongs to the section"""
+        assert 'Python, Java, SQL' in segmenter.segment(RESUME).text('skills')
+
+    def test_section_text(self, segmenter):
+        """Test a section's text stops at the next heading"""
+        education = segmenter.segment(RESUME).text('education')
+
+        assert 'Stanford University' in education
+        assert 'Google' not in education
+
+    def test_missing_section_falls_back(self, segmenter):
+        """Test missing sections return the whole text unless disabled"""
+        text = "Just a paragraph about Python"
+        sections = segmenter.segment(text)
+
+        assert sections.text('education') == text
+        assert sections.text('education', fallback=False) == ''
+
+    def test_repeated_section_spans(self, segmenter):
+        """Test a section appearing twice keeps both spans"""
+        sections = segmenter.segment("Experience\nA\nSkills\nB\nExperience\nC")
+
+        assert sections.line_ranges('experience') == [(1, 2), (5, 6)]
+        assert sections.text('experience') == "A\nC"
+
+    def test_inline_prose_is_not_a_heading(self, segmenter):
+        """Test "Heading: sentence" lines inside a job stay in Experience"""
+        sections = segmenter.segment(
+            "Experience\nAcme Corp\nTraining: onboarded 12 engineers to the platform\n"
+            "Research: published findings on caching at PyCon\nCertifications: AWS SAA, CKA"
+        )
+
+        assert sections.found == ['experience', 'certifications']
+        assert 'onboarded 12 engineers' in sections.text('experience')
+        assert 'PyCon' in sections.text('experience')
+        assert sections.text('certifications') == "Certifications: AWS SAA, CKA"
+
+    def test_cached_per_document(self, segmenter):
+        """Test the same text is segmented once"""
+        assert segmenter.segment(RESUME) is segmenter.segment(RESUME)
+
+
+class TestSectionAwareExtraction:
+    """Test extractors and matcher scan only their own section"""
+
+    def test_education_only_from_education_section(self):
+        """Test degrees mentioned elsewhere are not extracted as education"""
+        education = ResumeDataExtractor().extract_education(RESUME)
+
+        assert [e['degree'].strip() for e in education] == ['Master of Science']
+
+    def test_work_experience_only_from_experience_section(self):
+        """Test study periods are not extracted as jobs"""
+        experience = ResumeDataExtractor().extract_work_experience(RESUME)
+
+        assert [e['start_date'] for e in experience] == ['Jan 2020']
+
+    def test_matcher_education_from_education_section(self):
+        """Test degree keywords outside the Education section are ignored"""
+        matcher = JDMatcher()
+        text = "Summary\nBachelor-level tooling work\nEducation\nDiploma in IT"
+
+        assert matcher.extract_resume_features(text).degree_level == 1
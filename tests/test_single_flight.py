@@ -0,0 +1,169 @@
+import time
+import asyncio
+from core.cache import SimpleCache, TieredCache
+from core.single_flight import SingleFlight
+
+
+class FakeRedis:
+    """In-memory stand-in for the Redis client"""
+
+    def __init__(self):
+        self.store = {}
+        self.expires = {}
+
+    def _expire(self):
+        now = time.monotonic()
+        for key, at in list(self.expires.items()):
+            if at <= now:
+                self.store.pop(key, None)
+                del self.expires[key]
+
+    def get(self, key):
+        self._expire()
+        return self.store.get(key)
+
+    def set(self, key, value, ex=None, nx=False):
+        if nx and key in self.store:
+            return None
+        self.store[key] = value
+        if ex is not None:
+            self.expires[key] = time.monotonic() + ex
+        return True
+
+    def expire(self, key, seconds):
+        if key in self.store:
+            self.expires[key] = time.monotonic() + seconds
+
+    def delete(self, key):
+        self.store.pop(key, None)
+
+    def exists(self, key):
+        self._expire()
+        return int(key in self.store)
+
+
+class TestSingleFlight:
+    """Test cases for coalescing concurrent identical work"""
+
+    def test_concurrent_duplicates_run_once(self):
+        """Test duplicates in flight share the leader's result"""
+        flights = SingleFlight()
+        calls = []
+
+        async def work():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return {'id': 'same'}
+
+        async def run():
+            return await asyncio.gather(*(flights.run('key', work) for _ in range(5)))
+
+        results = asyncio.run(run())
+
+        assert len(calls) == 1
+        assert all(result == {'id': 'same'} for result in results)
+        assert flights.get_stats()['coalesced'] == 4
+
+    def test_different_keys_run_separately(self):
+        """Test different content or JD are not coalesced"""
+        flights = SingleFlight()
+        calls = []
+
+        async def work():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return len(calls)
+
+        async def run():
+            return await asyncio.gather(flights.run('a', work), flights.run('b', work))
+
+        asyncio.run(run())
+
+        assert len(calls) == 2
+
+    def test_errors_shared_and_not_cached(self):
+        """Test followers see the leader's error and later calls retry"""
+        flights = SingleFlight()
+
+        async def failing():
+            await asyncio.sleep(0.01)
+            raise ValueError("unreadable document")
+
+        async def run():
+            return await asyncio.gather(*(flights.run('key', failing) for _ in range(3)),
+                                        return_exceptions=True)
+
+        results = asyncio.run(run())
+
+        assert all(isinstance(result, ValueError) for result in results)
+        assert asyncio.run(flights.run('key', lambda: asyncio.sleep(0, result='ok'))) == 'ok'
+
+    def test_waits_for_other_worker(self):
+        """Test a worker that finds the shared lock held waits for the cached result"""
+        shared = FakeRedis()
+        cache = TieredCache(SimpleCache(), shared)
+        flights = SingleFlight(cache, poll_interval=0.01)
+        shared.set('flight:key', b'1')
+        calls = []
+
+        async def work():
+            calls.append(1)
+            return {'id': 'local'}
+
+        async def other_worker_finishes():
+            await asyncio.sleep(0.05)
+            TieredCache(SimpleCache(), shared).set_key('key', {'id': 'remote'})
+            shared.delete('flight:key')
+
+        async def run():
+            result, _ = await asyncio.gather(flights.run('key', work), other_worker_finishes())
+            return result
+
+        assert asyncio.run(run()) == {'id': 'remote'}
+        assert calls == []
+
+    def test_takes_over_when_other_worker_fails(self):
+        """Test the work runs locally if the lock is released without a result"""
+        shared = FakeRedis()
+        flights = SingleFlight(TieredCache(SimpleCache(), shared), poll_interval=0.01)
+        shared.set('flight:key', b'1')
+
+        async def release():
+            await asyncio.sleep(0.03)
+            shared.delete('flight:key')
+
+        async def run():
+            result, _ = await asyncio.gather(
+                flights.run('key', lambda: asyncio.sleep(0, result={'id': 'local'})), release()
+            )
+            return result
+
+        assert asyncio.run(run()) == {'id': 'local'}
+        assert 'flight:key' not in shared.store
+
+    def test_takes_over_when_leader_dies(self):
+        """Test a lock left by a dead worker lapses after the lease, not the full lock time"""
+        shared = FakeRedis()
+        flights = SingleFlight(TieredCache(SimpleCache(), shared), lock_seconds=60, lease_seconds=1,
+                               poll_interval=0.05)
+        shared.set('flight:key', b'1', ex=1)  # Never renewed
+
+        started = time.monotonic()
+        result = asyncio.run(flights.run('key', lambda: asyncio.sleep(0, result={'id': 'local'})))
+
+        assert result == {'id': 'local'}
+        assert time.monotonic() - started < 5
+
+    def test_leader_renews_lease(self):
+        """Test a live leader keeps its lock while the work outlasts the lease"""
+        shared = FakeRedis()
+        flights = SingleFlight(TieredCache(SimpleCache(), shared), lease_seconds=1)
+        held = []
+
+        async def work():
+            await asyncio.sleep(1.5)
+            held.append(shared.exists('flight:key'))
+            return {'id': 'a'}
+
+        assert asyncio.run(flights.run('key', work)) == {'id': 'a'}
+        assert held == [1]
@@ -0,0 +1,104 @@
+import os
+import json
+import pytest
+from services.jd_matcher import JDMatcher
+from services.candidate_ranker import CandidateRanker
+from services.skill_taxonomy import SkillTaxonomy
+
+
+class TestSkillTaxonomy:
+    """Test cases for synonym- and hierarchy-aware skill matching"""
+
+    def setup_method(self):
+        self.matcher = JDMatcher()
+
+    @pytest.mark.parametrize("resume, jd", [
+        ("Deployed services on k8s", "Kubernetes experience required"),
+        ("Worked with Postgres daily", "Strong PostgreSQL skills"),
+        ("Built ML pipelines", "Machine learning background"),
+        ("Golang microservices", "Go developer"),
+    ])
+    def test_synonyms_match(self, resume, jd):
+        """Test aliases resolve to the same canonical skill"""
+        result = self.matcher.match_resume_with_jd(resume, jd)
+
+        assert result['missing_skills'] == []
+        assert result['skills_match'] == 100
+
+    def test_child_skill_satisfies_parent(self):
+        """Test a resume listing a specific skill satisfies its broader parent"""
+        result = self.matcher.match_resume_with_jd("Trained models in PyTorch", "Deep learning experience")
+
+        assert 'deep learning' in result['matched_skills']
+        assert result['missing_skills'] == []
+
+    def test_parent_skill_does_not_satisfy_child(self):
+        """Test hierarchy expansion only goes upwards"""
+        result = self.matcher.match_resume_with_jd("SQL reporting", "PostgreSQL administrator")
+
+        assert result['missing_skills'] == ['postgresql']
+
+    def test_related_skills_reported(self):
+        """Test missing skills with related experience get a detail line"""
+        matcher = JDMatcher(taxonomy_path=None)
+        plain = matcher.match_resume_with_jd("MySQL DBA", "PostgreSQL DBA")
+        related = self.matcher.match_resume_with_jd("MySQL DBA", "PostgreSQL DBA")
+
+        assert related['missing_skills'] == ['postgresql']
+        assert "○ Related to missing postgresql: mysql" in related['details']
+        assert not any('Related to missing' in line for line in plain['details'])
+
+    def test_no_taxonomy_keeps_builtin_skills(self):
+        """Test the matcher works without a taxonomy file"""
+        matcher = JDMatcher(taxonomy_path=None)
+        result = matcher.match_resume_with_jd("Python and k8s", "Python and Kubernetes")
+
+        assert result['matched_skills'] == ['python']
+        assert result['missing_skills'] == ['kubernetes']
+
+
+class TestTaxonomyReload:
+    """Test cases for hot-reloading the taxonomy file"""
+
+    def write_taxonomy(self, path, skills, mtime):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'version': 1, 'skills': skills}, f)
+        os.utime(path, (mtime, mtime))
+
+    def test_reload_on_change(self, tmp_path):
+        """Test edits to the file are picked up without restarting"""
+        path = str(tmp_path / "taxonomy.json")
+        self.write_taxonomy(path, {'kubernetes': {'category': 'cloud'}}, 1000)
+        matcher = JDMatcher(taxonomy_path=path)
+        matcher.taxonomy.check_interval = 0
+
+        assert matcher.match_resume_with_jd("k8s", "kubernetes")['missing_skills'] == ['kubernetes']
+
+        self.write_taxonomy(path, {'kubernetes': {'category': 'cloud', 'aliases': ['k8s']}}, 2000)
+
+        assert matcher.match_resume_with_jd("k8s", "kubernetes")['missing_skills'] == []
+
+    def test_invalid_file_keeps_previous_taxonomy(self, tmp_path):
+        """Test a broken edit does not drop the loaded taxonomy"""
+        path = str(tmp_path / "taxonomy.json")
+        self.write_taxonomy(path, {'kubernetes': {'aliases': ['k8s']}}, 1000)
+        taxonomy = SkillTaxonomy(path, {'cloud': ['kubernetes']})
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write("{not json")
+
+        assert taxonomy.reload(force=True) is False
+        assert taxonomy.compiled.extract_direct_bits("k8s") != 0
+
+    def test_ranker_follows_reload(self, tmp_path):
+        """Test indexed candidates are remapped when the taxonomy changes"""
+        path = str(tmp_path / "taxonomy.json")
+        self.write_taxonomy(path, {}, 1000)
+        matcher = JDMatcher(taxonomy_path=path)
+        ranker = CandidateRanker(matcher)
+        ranker.add_candidate("a", text="pytorch research")
+
+        self.write_taxonomy(path, {'pytorch': {'parents': ['deep learning']}}, 2000)
+        matcher.taxonomy.reload()
+        result = ranker.rank(matcher.compile_jd("deep learning"))
+
+        assert result['results'][0]['matched_skills'] == ['deep learning']
@@ -0,0 +1,139 @@
+import sqlite3
+import pytest
+from datetime import datetime, timedelta
+from services.result_storage import ResultStorage, create_result_storage
+from services.sqlite_result_storage import SQLiteResultStorage
+
+
+def make_result(result_id, days_ago=0, score=75, match=None):
+    result = {
+        'id': result_id,
+        'filename': f'{result_id}.pdf',
+        'upload_date': (datetime.utcnow() - timedelta(days=days_ago)).isoformat(),
+        'authenticity_score': {'overall_score': score, 'diagnostics': {'fonts': ['Arial'] * 50}},
+    }
+    if match is not None:
+        result['matching_score'] = {'overall_match': match}
+    return result
+
+
+@pytest.fixture
+def storage(tmp_path):
+    return SQLiteResultStorage(str(tmp_path))
+
+
+class TestSQLiteResultStorage:
+    """Test cases for the SQLite result storage backend"""
+
+    def test_wal_mode(self, storage):
+        """Test the database runs in WAL mode"""
+        mode = sqlite3.connect(storage.db_path).execute("PRAGMA journal_mode").fetchone()[0]
+
+        assert mode == 'wal'
+
+    def test_save_get_delete(self, storage):
+        """Test the ResultStorage interface round-trips records"""
+        assert storage.save_result(make_result('a'))
+
+        result = storage.get_result_by_id('a')
+        assert result['filename'] == 'a.pdf'
+        assert result['authenticity_score']['diagnostics'] == {'fonts': ['Arial'] * 50}
+
+        assert storage.delete_result('a')
+        assert not storage.delete_result('a')
+        assert storage.get_result_by_id('a') is None
+
+    def test_diagnostics_compressed(self, storage):
+        """Test diagnostics are stored as a compressed blob"""
+        storage.save_result(make_result('a'))
+
+        record, blob = sqlite3.connect(storage.db_path).execute(
+            "SELECT record, diagnostics FROM results").fetchone()
+        assert 'diagnostics' not in record
+        assert isinstance(blob, bytes)
+
+    def test_limit_and_offset(self, storage):
+        """Test listings are most recent first"""
+        for i in range(5):
+            storage.save_result(make_result(f'r{i}', days_ago=i))
+
+        assert [r['id'] for r in storage.get_all_results(limit=2)] == ['r0', 'r1']
+        assert [r['id'] for r in storage.get_all_results(limit=2, offset=2)] == ['r2', 'r3']
+
+    def test_keyset_pages(self, storage):
+        """Test keyset pages cover every record once, most recent first"""
+        for i in range(7):
+            storage.save_result(make_result(f'r{i}', days_ago=i % 3))
+
+        seen, cursor = [], None
+        while True:
+            page, cursor = storage.get_results_page(limit=3, cursor=cursor)
+            seen.extend(r['id'] for r in page)
+            if cursor is None:
+                break
+
+        assert sorted(seen) == [f'r{i}' for i in range(7)]
+        assert len(seen) == 7
+
+    def test_summary_page_skips_diagnostics(self, storage):
+        """Test summary projections leave out the diagnostics"""
+        storage.save_result(make_result('a', match=60))
+
+        page, _ = storage.get_results_page(fields=['id', 'authenticity_score.overall_score'])
+
+        assert page == [{'id': 'a', 'authenticity_score': {'overall_score': 75}}]
+
+    def test_statistics_match_jsonl_backend(self, storage, tmp_path):
+        """Test aggregate SQL gives the same statistics as the log backend"""
+        log = ResultStorage(str(tmp_path / 'log'))
+        for result in [make_result('a', score=90, match=70), make_result('b', days_ago=10, score=50),
+                       make_result('c', score=70, match=40)]:
+            storage.save_result(dict(result))
+            log.save_result(dict(result))
+
+        assert storage.get_statistics() == log.get_statistics()
+
+    def test_retention(self, tmp_path):
+        """Test results past the retention period are dropped"""
+        storage = SQLiteResultStorage(str(tmp_path), retention_days=30)
+        storage.save_result(make_result('expired', days_ago=45))
+        storage.save_result(make_result('kept'))
+
+        assert storage.get_result_by_id('expired') is None
+        assert storage.get_statistics()['total_resumes'] == 1
+
+    def test_imports_existing_log(self, tmp_path):
+        """Test results in the JSONL log are imported into a new database"""
+        ResultStorage(str(tmp_path)).save_result(make_result('from-log'))
+
+        storage = create_result_storage('sqlite', str(tmp_path))
+
+        assert isinstance(storage, SQLiteResultStorage)
+        assert storage.get_result_by_id('from-log') is not None
+
+    def test_export_csv(self, storage, tmp_path):
+        """Test CSV export writes one row per result"""
+        output = str(tmp_path / 'out.csv')
+        assert not storage.export_to_csv(output)
+
+        storage.save_result(make_result('a', match=60))
+        assert storage.export_to_csv(output)
+        with open(output, encoding='utf-8') as f:
+            assert len(f.read().strip().splitlines()) == 2
+
+    def test_factory_defaults_to_log(self, tmp_path):
+        """Test unknown backends fall back to the JSONL log"""
+        assert isinstance(create_result_storage('bogus', str(tmp_path)), ResultStorage)
+
+    def test_iter_results_filters(self, storage):
+        """Test export filters are applied in SQL"""
+        storage.save_result(make_result('old', days_ago=10, score=90))
+        storage.save_result(make_result('low', score=30))
+        storage.save_result(make_result('matched', score=85, match=70))
+
+        recent = (datetime.utcnow() - timedelta(days=2)).date().isoformat()
+        assert [r['id'] for r in storage.iter_results(start_date=recent)] == ['low', 'matched']
+        assert [r['id'] for r in storage.iter_results(end_date=recent)] == ['old']
+        assert [r['id'] for r in storage.iter_results(min_score=80)] == ['old', 'matched']
+        assert [r['id'] for r in storage.iter_results(has_jd=True)] == ['matched']
+        assert [r['id'] for r in storage.iter_results(min_match=80)] == []
@@ -0,0 +1,65 @@
+import io
+import os
+import asyncio
+import hashlib
+import pytest
+from fastapi import UploadFile
+from core.cache import SimpleCache
+from core.uploads import ingest_upload, ingest_stream, UploadTooLargeError
+
+
+@pytest.fixture
+def spool_dir(tmp_path):
+    return str(tmp_path / "uploads")
+
+
+class TestUploadIngestion:
+    """Test cases for streaming uploads to disk"""
+
+    def test_hash_and_size_match_content(self, spool_dir):
+        """Test the incremental digest equals a one-shot SHA-256"""
+        content = os.urandom(5000)
+        upload = UploadFile(file=io.BytesIO(content), filename="resume.pdf")
+
+        ingested = asyncio.run(ingest_upload(upload, spool_dir, max_bytes=10000, chunk_size=1024))
+
+        assert ingested.size == 5000
+        assert ingested.sha256 == hashlib.sha256(content).hexdigest()
+        assert ingested.filename == "resume.pdf"
+        assert ingested.read_bytes() == content
+
+    def test_oversized_upload_rejected_without_leftovers(self, spool_dir):
+        """Test reading stops at the limit and nothing is kept"""
+        upload = UploadFile(file=io.BytesIO(b'x' * 5000), filename="big.pdf")
+
+        with pytest.raises(UploadTooLargeError):
+            asyncio.run(ingest_upload(upload, spool_dir, max_bytes=2000, chunk_size=1024))
+
+        assert os.listdir(spool_dir) == []
+
+    def test_stream_ingestion_and_move(self, spool_dir, tmp_path):
+        """Test the blocking variant and moving the spooled file"""
+        ingested = ingest_stream(io.BytesIO(b'resume text'), spool_dir, max_bytes=100, filename="cv.docx")
+        target = str(tmp_path / "final.docx")
+        ingested.move_to(target)
+
+        assert ingested.sha256 == hashlib.sha256(b'resume text').hexdigest()
+        assert open(target, 'rb').read() == b'resume text'
+        assert os.listdir(spool_dir) == []
+
+    def test_cache_key_from_digest(self):
+        """Test keys built from the ingestion digest match keys built from content"""
+        cache = SimpleCache()
+        cache.set(b'resume', {'id': '1'}, 'jd')
+        digest = hashlib.sha256(b'resume').hexdigest()
+
+        assert cache.get_key(cache.key_for_digest(digest, 'jd')) == {'id': '1'}
+        assert cache.key_for_digest(digest) != cache.key_for_digest(digest, 'jd')
+
+    def test_cache_key_includes_matcher_version(self):
+        """Test matches scored under another taxonomy version get a different key"""
+        cache = SimpleCache()
+        digest = hashlib.sha256(b'resume').hexdigest()
+
+        assert cache.key_for_digest(digest, 'jd', 'v1:taxonomy-1') != cache.key_for_digest(digest, 'jd', 'v1:taxonomy-2')
+        assert cache.key_for_digest(digest, None, 'v1:taxonomy-1') == digest
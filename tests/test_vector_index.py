@@ -0,0 +1,99 @@
+import pytest
+from services.vector_index import ResumeVectorIndex
+from services.jd_matcher import JDMatcher
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = ResumeVectorIndex(str(tmp_path / "vectors"), n_features=2 ** 12)
+    index.add("backend", "Backend engineer: Python, Django, PostgreSQL, Celery and Redis queues")
+    index.add("frontend", "Frontend developer building React and TypeScript single page apps")
+    index.add("data", "Data scientist with pandas, scikit-learn and Airflow pipelines")
+    return index
+
+
+class TestResumeVectorIndex:
+    """Test cases for the incremental TF-IDF index"""
+
+    def test_search_ranks_relevant_document_first(self, index):
+        """Test cosine search returns the most relevant resume first"""
+        results = index.search("Django and Celery backend role", top_k=2)
+
+        assert results[0]['id'] == "backend"
+        assert 0 < results[0]['score'] <= 1
+
+    def test_terms_outside_skill_list_are_searchable(self, index):
+        """Test terms the keyword matcher does not know still match"""
+        results = index.search("Airflow")
+
+        assert [r['id'] for r in results] == ["data"]
+
+    def test_append_without_refit(self, index):
+        """Test new documents are searchable immediately"""
+        index.add("mobile", "iOS engineer shipping SwiftUI apps")
+
+        assert len(index) == 4
+        assert index.search("SwiftUI")[0]['id'] == "mobile"
+
+    def test_readding_replaces_document(self, index):
+        """Test re-adding an ID replaces the old text"""
+        index.add("frontend", "Embedded C firmware for microcontrollers")
+
+        assert len(index) == 3
+        assert index.search("React TypeScript") == []
+
+    def test_remove(self, index):
+        """Test removed documents no longer match"""
+        assert index.remove("data")
+        assert index.search("pandas") == []
+
+    def test_reopen_from_disk(self, index):
+        """Test a reopened index returns the same results"""
+        reopened = ResumeVectorIndex(index.index_dir)
+
+        assert len(reopened) == len(index)
+        assert reopened.search("Django Celery") == index.search("Django Celery")
+
+    def test_similarity(self, index):
+        """Test pairwise similarity is bounded and symmetric"""
+        a = "Python Django developer"
+        b = "Django developer with Python"
+
+        assert index.similarity(a, b) == pytest.approx(index.similarity(b, a))
+        assert 0 < index.similarity(a, b) <= 1
+        assert index.similarity(a, "unrelated gardening text") == 0.0
+
+    def test_removal_survives_reopen(self, index):
+        """Test removed documents stay removed after a restart"""
+        index.remove("data")
+        reopened = ResumeVectorIndex(index.index_dir)
+
+        assert "data" not in reopened
+        assert reopened.search("pandas") == []
+        assert len(reopened) == 2
+
+    def test_shared_directory(self, index):
+        """Test two instances on one directory (as in two workers) see each other's documents"""
+        other = ResumeVectorIndex(index.index_dir)
+        other.add("mobile", "iOS engineer shipping SwiftUI apps")
+        index.add("devops", "Kubernetes and Terraform platform engineer")
+        other.remove("frontend")
+
+        for instance in (index, other, ResumeVectorIndex(index.index_dir)):
+            assert len(instance) == 4
+            assert instance.search("SwiftUI")[0]['id'] == "mobile"
+            assert instance.search("Terraform")[0]['id'] == "devops"
+            assert instance.search("React TypeScript") == []
+
+def test_semantic_component_in_match_score():
+    """Test a semantic score is blended into the overall match when weighted"""
+    jd = "Python developer with 3 years of experience"
+    resume = "Python developer with 3 years of experience"
+
+    plain = JDMatcher().match_compiled(resume, JDMatcher().compile_jd(jd))
+    matcher = JDMatcher(semantic_weight=0.5)
+    blended = matcher.match_compiled(resume, matcher.compile_jd(jd), semantic_score=0.0)
+
+    assert 'semantic_match' not in plain
+    assert blended['semantic_match'] == 0.0
+    assert blended['overall_match'] == pytest.approx(plain['overall_match'] * 0.5, abs=0.1)